@@ -0,0 +1,108 @@
+"""
+Argon2 CPU spent on login attacks, with and without the auth rate limiter.
+
+Each attack sends login attempts at a fixed rate for a simulated period.
+Attempts go through the real limiter (utils/rate_limit.py, in-memory
+backend, RATE_LIMITS from settings) on a simulated clock, and only admitted
+attempts pay for a password verify. CPU is the admitted verifies times the
+measured Argon2 verify cost, plus the measured limiter cost for every
+attempt, expressed as CPU cores kept busy.
+
+    python3 -m benchmarks.auth_rate_limit
+    python3 -m benchmarks.auth_rate_limit --rates 10,100,1000 --duration 600
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from fastapi import HTTPException
+
+from config import settings
+from utils.rate_limit import MemoryBackend, RateLimit, RateLimiter
+from utils.security import hash_password, verify_password
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# Attack shapes: (client IP, email) for attempt number i
+ATTACKS = {
+    "targeted (1 IP, 1 account)": lambda i: ("198.51.100.7", "parent@example.com"),
+    "stuffing (1 IP, new account each try)": lambda i: ("198.51.100.7", f"user{i}@example.com"),
+    "spray (new IP each try, 1 account)": lambda i: (f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                                                   "parent@example.com"),
+    "botnet stuffing (50 IPs, new account each try)": lambda i: (f"203.0.113.{i % 50}", f"user{i}@example.com"),
+}
+
+
+def measure_verify_cost(runs: int = 5) -> float:
+    """Median seconds for one Argon2 verify of a wrong password."""
+    password_hash = hash_password("correct horse battery staple")
+    timings = []
+    for _ in range(runs):
+        start = time.process_time()
+        verify_password("wrong password", password_hash)
+        timings.append(time.process_time() - start)
+    return statistics.median(timings)
+
+
+async def simulate(attack, rate: float, duration: float, limits: dict[str, RateLimit]) -> tuple[int, int, float]:
+    """Returns (attempts, attempts admitted, CPU seconds spent in the limiter)."""
+    clock = SimulatedClock()
+    limiter = RateLimiter(MemoryBackend(clock=clock), limits)
+    attempts = int(rate * duration)
+    admitted = 0
+
+    start = time.process_time()
+    for i in range(attempts):
+        clock.now = i / rate
+        ip, email = attack(i)
+        try:
+            await limiter.check("login", {"ip": ip, "email": email})
+            admitted += 1
+        except HTTPException:
+            pass
+    return attempts, admitted, time.process_time() - start
+
+
+async def run(args) -> int:
+    limits = {name: RateLimit.parse(value) for name, value in settings.rate_limits_map.items()}
+    print(f"Limits: {', '.join(f'{name}={limit!r}' for name, limit in limits.items() if name.startswith('login.'))}")
+    verify_cost = measure_verify_cost()
+    print(f"Argon2 verify: {verify_cost * 1000:.1f} ms CPU\n")
+
+    print(f"{'attack':<48} {'rate/s':>7} {'admitted':>9} {'cores off':>10} {'cores on':>9} {'limiter µs':>11}")
+    print("-" * 98)
+    for name, attack in ATTACKS.items():
+        if args.filter not in name:
+            continue
+        for rate in args.rates:
+            attempts, admitted, limiter_cpu = await simulate(attack, rate, args.duration, limits)
+            cores_off = rate * verify_cost
+            cores_on = (admitted * verify_cost + limiter_cpu) / args.duration
+            print(f"{name:<48} {rate:>7g} {admitted / attempts:>8.1%} {cores_off:>10.2f} {cores_on:>9.2f} "
+                  f"{limiter_cpu / attempts * 1e6:>11.1f}")
+    print(f"\nSimulated {args.duration:g}s per row. 'cores' is the average number of CPU cores kept busy.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default="10,100,1000",
+                        type=lambda value: [float(rate) for rate in value.split(",")],
+                        help="Comma-separated attack rates in attempts per second")
+    parser.add_argument("--duration", type=float, default=300.0, help="Simulated seconds per attack")
+    parser.add_argument("--filter", default="", help="Only run attacks whose name contains this string")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
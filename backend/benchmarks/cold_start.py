@@ -0,0 +1,183 @@
+"""
+Cold-start benchmarks: import time of the app module and first-request latency.
+
+    # Import time of `main`, from `python -X importtime`, against the stored budget
+    python3 -m benchmarks.cold_start imports
+    python3 -m benchmarks.cold_start imports --check
+    python3 -m benchmarks.cold_start imports --save-baseline
+
+    # Process start -> first response, against a local seeded mongod
+    MONGODB_URI=mongodb://localhost:27017/pathways_bench python3 -m benchmarks.cold_start first-request
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.harness import BASELINE_DIR
+
+
+BACKEND_DIR = Path(__file__).parent.parent
+BUDGET_PATH = BASELINE_DIR / "import_time.json"
+
+# Settings are required at import time; the import benchmark never connects
+BENCH_ENV = {
+    "MONGODB_URI": "mongodb://localhost:27017/pathways_bench",
+    "JWT_SECRET": "import-time-benchmark",
+}
+
+
+def measure_imports(runs: int) -> tuple[float, dict[str, float]]:
+    """
+    Import `main` in fresh interpreters under -X importtime.
+
+    Returns the median cumulative import time of `main` in milliseconds and
+    the median cumulative time of each top-level package it pulled in.
+    """
+    totals = []
+    per_package: dict[str, list[float]] = {}
+    env = {**os.environ, **BENCH_ENV}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        packages: dict[str, float] = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            _, cumulative, name = line.split(":", 1)[1].split("|")
+            depth = (len(name) - len(name.lstrip())) // 2
+            name = name.strip()
+            if name == "main":
+                totals.append(int(cumulative) / 1000)
+            elif depth <= 1:
+                top = name.split(".")[0]
+                packages[top] = packages.get(top, 0.0) + int(cumulative) / 1000
+        for package, ms in packages.items():
+            per_package.setdefault(package, []).append(ms)
+    return statistics.median(totals), {
+        package: round(statistics.median(values), 1)
+        for package, values in per_package.items()
+    }
+
+
+def run_imports(args) -> int:
+    total, packages = measure_imports(args.runs)
+    budget = json.loads(BUDGET_PATH.read_text()) if BUDGET_PATH.exists() else None
+
+    print(f"{'package':<32} {'ms':>8}")
+    print("-" * 41)
+    for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32} {ms:>8.1f}")
+    print("-" * 41)
+    print(f"{'import main (median of ' + str(args.runs) + ')':<32} {total:>8.1f}")
+
+    if args.save_baseline:
+        BUDGET_PATH.write_text(json.dumps({
+            "budget_ms": round(total * (1 + args.headroom), 1),
+            "measured_ms": round(total, 1),
+            "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        }, indent=2) + "\n")
+        print(f"\n✓ Budget written to {BUDGET_PATH}")
+    elif budget:
+        print(f"Budget: {budget['budget_ms']:.1f} ms (baseline {budget['measured_ms']:.1f} ms)")
+        if total > budget["budget_ms"]:
+            print(f"⚠ Import time {total:.1f} ms exceeds the budget of {budget['budget_ms']:.1f} ms")
+            if args.check:
+                return 1
+    return 0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(path: str, timeout: float) -> tuple[float, float, float]:
+    """
+    Start uvicorn and request `path` until it answers.
+
+    Returns (seconds to first response, first request latency, warm request latency).
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        with httpx.Client() as client:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"Server did not answer {url} within {timeout}s")
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {server.returncode}")
+                request_start = time.perf_counter()
+                try:
+                    response = client.get(url)
+                except httpx.TransportError:
+                    time.sleep(0.005)
+                    continue
+                first_latency = time.perf_counter() - request_start
+                time_to_first = time.perf_counter() - start
+                response.raise_for_status()
+                break
+
+            request_start = time.perf_counter()
+            client.get(url).raise_for_status()
+            warm_latency = time.perf_counter() - request_start
+    finally:
+        server.terminate()
+        server.wait()
+    return time_to_first, first_latency, warm_latency
+
+
+def run_first_request(args) -> int:
+    if "MONGODB_URI" not in os.environ:
+        print("✗ Set MONGODB_URI to a local, seeded mongod to measure first-request latency")
+        return 2
+
+    results = [measure_first_request(args.path, args.timeout) for _ in range(args.runs)]
+    time_to_first, first, warm = (statistics.median(values) for values in zip(*results))
+    print(f"GET {args.path} (median of {args.runs} process starts)")
+    print(f"  process start -> first response: {time_to_first * 1000:8.1f} ms")
+    print(f"  first request latency:           {first * 1000:8.1f} ms")
+    print(f"  warm request latency:            {warm * 1000:8.1f} ms")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    imports = subparsers.add_parser("imports", help="Measure `import main` with -X importtime")
+    imports.add_argument("--runs", type=int, default=5)
+    imports.add_argument("--top", type=int, default=15, help="Number of packages to list")
+    imports.add_argument("--check", action="store_true", help="Exit non-zero if over budget")
+    imports.add_argument("--save-baseline", action="store_true", help="Store the measurement as the new budget")
+    imports.add_argument("--headroom", type=float, default=0.2, help="Budget headroom over the measurement")
+    imports.set_defaults(func=run_imports)
+
+    first_request = subparsers.add_parser("first-request", help="Measure process start to first response")
+    first_request.add_argument("--path", default="/api/v1/stages")
+    first_request.add_argument("--runs", type=int, default=5)
+    first_request.add_argument("--timeout", type=float, default=30.0)
+    first_request.set_defaults(func=run_first_request)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
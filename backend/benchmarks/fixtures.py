@@ -0,0 +1,108 @@
+"""
+Realistic MongoDB documents for model benchmarks, shaped as Motor returns them
+(ObjectId `_id`, timezone-aware datetimes) and sized like production data.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+# A parent part-way through the journey: ~15 of ~30 milestones checked off
+COMPLETED_MILESTONES = [str(ObjectId()) for _ in range(15)]
+
+STAGE_PROGRESS = {
+    f"S{order}": {"total_milestones": 6, "completed_milestones": done, "percentage": round(done / 6 * 100, 1)}
+    for order, done in zip(range(1, 6), (6, 5, 3, 1, 0))
+}
+
+
+def user_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "email": "parent.example@example.com",
+        "password_hash": "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHRzYWx0$" + "h" * 43,
+        "name": "Jordan Parent",
+        "recommended_stage_id": "s2",
+        "completed_milestones": list(COMPLETED_MILESTONES),
+        "created_at": NOW - timedelta(days=90),
+        "updated_at": NOW,
+    }
+
+
+def milestone_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "stage_id": "S1",
+        "title": "I've written down questions for our pediatrician",
+        "behavior": "You've made a list of specific behaviors or concerns to discuss at your next doctor's visit.",
+        "why_it_matters": (
+            "Writing things down helps you remember what you want to ask and shows your doctor you're "
+            "observing carefully. It's the first step toward getting answers."
+        ),
+        "if_not_yet": (
+            "Start simple: jot down 2-3 things you've noticed that feel different. You don't need "
+            "medical terms—just describe what you see."
+        ),
+        "reassurance": "Asking questions doesn't mean you're overreacting. It means you're being a thoughtful, attentive parent.",
+        "created_at": NOW,
+    }
+
+
+def stage_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": "Diagnosis",
+        "description": "Navigating evaluations and understanding what a diagnosis means for your family.",
+        "age_range": "18 months - 5 years",
+        "color": "#E6F2EC",
+        "icon": "clipboard",
+        "order": 2,
+        "next_step_prompt": "When you're ready, you might explore connecting with early intervention services in your area.",
+        "created_at": NOW,
+    }
+
+
+def resource_doc() -> dict:
+    return {
+        "_id": "r1",
+        "title": "Autism Speaks: 100 Day Kit",
+        "description": (
+            "A comprehensive guide for the first 100 days after an autism diagnosis, including practical "
+            "advice, checklists, and resources for families."
+        ),
+        "url": "https://www.autismspeaks.org/tool-kit/100-day-kit-young-children",
+        "category": "Diagnosis",
+        "tags": ["guide", "newly diagnosed", "comprehensive", "family support"],
+        "created_at": NOW,
+    }
+
+
+def onboarding_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "child_age_range": "3-5y",
+        "diagnosis_status": "waiting",
+        "primary_concern": "speech",
+        "recommended_stage_id": "s2",
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def journey_snapshot_doc() -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "milestone_id": COMPLETED_MILESTONES[-1],
+        "stage_id": "S3",
+        "milestone_title": "I've contacted our early intervention program",
+        "action": "completed",
+        "completed_milestones": list(COMPLETED_MILESTONES),
+        "total_milestones_completed": len(COMPLETED_MILESTONES),
+        "stage_progress": {stage: dict(progress) for stage, progress in STAGE_PROGRESS.items()},
+        "timestamp": NOW,
+    }
@@ -0,0 +1,142 @@
+"""
+Shared micro-benchmark harness: timing, allocation measurement and stored baselines.
+
+Baselines live in benchmarks/baselines/<suite>.json. They are machine
+dependent, so regenerate them with --save-baseline on the machine you
+compare on before judging a change.
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable
+
+import pydantic
+
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+@dataclass
+class BenchResult:
+    """Result of one benchmark case."""
+
+    name: str
+    ops_per_sec: float
+    alloc_bytes: int  # Peak bytes allocated while running a single operation
+    alloc_blocks: int  # Memory blocks still allocated by the operation when it returns
+
+
+def bench(name: str, fn: Callable[[], object], min_time: float = 0.2, repeats: int = 5) -> BenchResult:
+    """
+    Time `fn` and measure its allocations.
+
+    The iteration count is calibrated so one repeat takes at least `min_time`
+    seconds; the best of `repeats` runs is reported, as in timeit.
+    """
+    fn()  # Warm up caches and lazily built validators
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        snapshot_before = tracemalloc.take_snapshot()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+        blocks = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        ops_per_sec=round(iterations / best, 1),
+        alloc_bytes=max(0, peak - baseline_current),
+        alloc_blocks=max(0, blocks),
+    )
+
+
+def load_baseline(suite: str) -> dict[str, dict]:
+    path = BASELINE_DIR / f"{suite}.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baseline(suite: str, results: list[BenchResult]) -> Path:
+    BASELINE_DIR.mkdir(exist_ok=True)
+    path = BASELINE_DIR / f"{suite}.json"
+    path.write_text(json.dumps({
+        "environment": {
+            "python": platform.python_version(),
+            "pydantic": pydantic.VERSION,
+            "machine": platform.machine(),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }, indent=2) + "\n")
+    return path
+
+
+def report(results: list[BenchResult], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Print results next to the baseline and return the names of cases whose
+    throughput regressed by more than `tolerance` (a fraction, e.g. 0.15).
+    """
+    regressions = []
+    print(f"{'case':<44} {'ops/sec':>12} {'Δ ops':>8} {'alloc B':>10} {'blocks':>7}")
+    print("-" * 85)
+    for result in results:
+        previous = baseline.get(result.name)
+        delta = "new"
+        if previous:
+            change = (result.ops_per_sec - previous["ops_per_sec"]) / previous["ops_per_sec"]
+            delta = f"{change * 100:+.1f}%"
+            if change < -tolerance:
+                regressions.append(result.name)
+        print(f"{result.name:<44} {result.ops_per_sec:>12,.0f} {delta:>8} "
+              f"{result.alloc_bytes:>10,} {result.alloc_blocks:>7}")
+    return regressions
+
+
+def run_suite(suite: str, cases: dict[str, Callable[[], object]], description: str) -> int:
+    """Command-line entry point shared by the benchmark suites."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on throughput regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed fractional slowdown for --check")
+    args = parser.parse_args()
+
+    results = [bench(name, fn) for name, fn in cases.items() if args.filter in name]
+    regressions = report(results, load_baseline(suite), args.tolerance)
+
+    if args.save_baseline:
+        print(f"\n✓ Baseline written to {save_baseline(suite, results)}")
+    if regressions:
+        print(f"\n⚠ {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressions))
+        if args.check:
+            return 1
+    return 0
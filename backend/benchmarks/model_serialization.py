@@ -0,0 +1,65 @@
+"""
+Model serialization micro-benchmarks.
+
+Covers each step of the read path (Mongo dict -> from_mongo -> model_dump ->
+FastAPI re-encoding) and the write path (to_dict) for every model.
+
+    python3 -m benchmarks.model_serialization
+    python3 -m benchmarks.model_serialization --filter Milestone
+    python3 -m benchmarks.model_serialization --save-baseline
+"""
+
+import json
+import sys
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks import fixtures
+from benchmarks.harness import run_suite
+from models.journey_history import JourneySnapshot
+from models.milestone import Milestone
+from models.onboarding import OnboardingResponse
+from models.resource import Resource
+from models.stage import Stage
+from models.user import User
+
+
+MODELS = {
+    "User": (User, fixtures.user_doc),
+    "Milestone": (Milestone, fixtures.milestone_doc),
+    "Stage": (Stage, fixtures.stage_doc),
+    "Resource": (Resource, fixtures.resource_doc),
+    "OnboardingResponse": (OnboardingResponse, fixtures.onboarding_doc),
+    "JourneySnapshot": (JourneySnapshot, fixtures.journey_snapshot_doc),
+}
+
+
+def build_cases() -> dict:
+    cases = {}
+    for name, (model, make_doc) in MODELS.items():
+        doc = make_doc()
+        instance = model.from_mongo(dict(doc))
+
+        def from_mongo(model=model, doc=doc):
+            return model.from_mongo(dict(doc))
+
+        def model_dump(instance=instance):
+            return instance.model_dump(by_alias=True)
+
+        def to_dict(instance=instance):
+            return instance.to_dict()
+
+        def read_path(model=model, doc=doc):
+            data = model.from_mongo(dict(doc)).model_dump(by_alias=True)
+            return json.dumps(jsonable_encoder(data, custom_encoder={ObjectId: str}))
+
+        cases[f"{name}.from_mongo"] = from_mongo
+        cases[f"{name}.model_dump"] = model_dump
+        cases[f"{name}.to_dict"] = to_dict
+        cases[f"{name}.read_path"] = read_path
+    return cases
+
+
+if __name__ == "__main__":
+    sys.exit(run_suite("model_serialization", build_cases(), __doc__))
@@ -0,0 +1,73 @@
+"""
+Per-document ObjectId conversion cost: the old copy-pasted PyObjectId (which
+required from_mongo to stringify `_id` so validation could parse it back)
+against the shared annotated type in models/object_id.py.
+
+    python3 -m benchmarks.object_id
+"""
+
+import sys
+from typing import Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+from benchmarks import fixtures
+from benchmarks.harness import run_suite
+from models.object_id import PyObjectId
+
+
+class LegacyPyObjectId(ObjectId):
+    """The Pydantic v1-style type previously duplicated across the models."""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v, _):
+        if not ObjectId.is_valid(v):
+            raise ValueError("Invalid ObjectId")
+        return ObjectId(v)
+
+
+class LegacyOnboarding(BaseModel):
+    id: Optional[LegacyPyObjectId] = Field(default=None, alias="_id")
+    user_id: LegacyPyObjectId
+    recommended_stage_id: str
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_mongo(cls, data: dict) -> "LegacyOnboarding":
+        data["_id"] = str(data["_id"])
+        data["user_id"] = str(data["user_id"])
+        return cls(**data)
+
+
+class AnnotatedOnboarding(BaseModel):
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    user_id: PyObjectId
+    recommended_stage_id: str
+
+    class Config:
+        populate_by_name = True
+
+    @classmethod
+    def from_mongo(cls, data: dict) -> "AnnotatedOnboarding":
+        return cls(**data)
+
+
+def build_cases() -> dict:
+    doc = fixtures.onboarding_doc()
+    doc = {key: doc[key] for key in ("_id", "user_id", "recommended_stage_id")}
+    return {
+        "legacy.from_mongo": lambda: LegacyOnboarding.from_mongo(dict(doc)),
+        "annotated.from_mongo": lambda: AnnotatedOnboarding.from_mongo(dict(doc)),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(run_suite("object_id", build_cases(), __doc__))
@@ -17,6 +17,12 @@ class Settings(BaseSettings):
     app_env: str = "development"
     port: int = 8000
     
+    # Server settings (server.py pre-fork launcher)
+    web_concurrency: int = 0  # Worker processes; 0 sizes to the available CPUs
+    worker_max_requests: int = 0  # Recycle a worker after this many requests; 0 disables
+    worker_max_requests_jitter: int = 0  # Random extra requests so workers don't recycle together
+    worker_graceful_timeout: int = 30  # Seconds a stopping worker may spend finishing requests
+    
     # Database settings
     mongodb_uri: str
     
@@ -31,10 +37,89 @@ class Settings(BaseSettings):
     sendgrid_api_key: str = ""
     sendgrid_from_email: str = ""
     
+    # Rate limiting settings (login and signup)
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" (per worker) or "mongo" (shared by all workers)
+    rate_limits: str = "login.ip=30/minute,login.email=10/minute,signup.ip=20/hour,signup.email=5/hour,export.user=6/hour"
+    rate_limit_trusted_proxies: int = 0  # Proxies in front of the app that append to X-Forwarded-For
+    
+    # Idempotency-Key settings
+    idempotency_ttl_seconds: int = 86400  # How long responses are kept for replay
+    
+    # Admin and analytics settings
+    admin_api_key: str = ""  # X-Admin-Key for operator endpoints; empty disables them
+    analytics_refresh_seconds: int = 900  # Cohort analytics refresh interval; 0 disables
+    analytics_cache_seconds: int = 60  # How long analytics responses are cached per worker
+    activity_rollup_seconds: int = 300  # Daily activity rollup interval; 0 disables
+    
+    # Personal data export settings
+    export_batch_size: int = 200  # Documents fetched per cursor batch
+    export_batch_pause_ms: int = 10  # Pause between batches so exports yield to interactive requests
+    export_max_concurrent: int = 2  # Exports streamed at once per worker
+    
+    # Progress stream (Server-Sent Events) settings
+    pubsub_backend: str = "memory"  # "memory" (single worker) or "mongo" (shared by all workers)
+    pubsub_capped_bytes: int = 16 * 1024 * 1024  # Size of the capped pubsub_events collection
+    progress_stream_heartbeat_seconds: float = 15  # Idle time before a heartbeat comment is sent
+    progress_stream_max_connections: int = 5  # Open streams per user per worker
+    
+    # Cache invalidation settings
+    invalidation_mode: str = "auto"  # "auto" (change streams, else polling), "change_stream", "poll" or "off"
+    invalidation_poll_seconds: float = 1.0  # Polling interval when change streams are unavailable
+    user_cache_seconds: float = 0  # Per-worker cache of authenticated users' documents; 0 disables
+    
+    # Account deletion settings
+    account_purge_seconds: int = 60  # How often deleted accounts are purged; 0 disables
+    account_purge_batch_size: int = 500  # Documents deleted per batch
+    account_purge_pause_ms: int = 50  # Pause between batches
+    
+    # Journey history archival settings
+    history_archive_after_days: int = 180  # Snapshots older than this (from the start of that month) are archived
+    history_archive_seconds: int = 3600  # Archival job interval; 0 disables
+    history_archive_batch_size: int = 1000  # Snapshots moved per batch
+    
+    # Catalog settings
+    catalog_bundle_path: str = "catalog_bundle.json"
+    
+    # Response compression settings
+    compression_enabled: bool = True  # brotli or gzip, as negotiated with Accept-Encoding
+    compression_min_bytes: int = 1024  # Smaller responses are sent uncompressed
+    compression_gzip_level: int = 6  # 1 (fastest) to 9 (smallest), for per-request compression
+    compression_brotli_quality: int = 4  # 0 (fastest) to 11 (smallest), for per-request compression
+    
+    # Profiling settings
+    profiling_enabled: bool = False  # Enables per-route sampled profiling
+    profiling_secret: str = ""  # X-Profile header value that forces profiling
+    profiling_sample_rates: str = ""  # e.g. "/api/v1/progress=0.01,*=0.001"
+    profiling_interval_ms: float = 1.0
+    profiling_output_dir: str = "profiles"
+    
     @property
     def cors_origins_list(self) -> list[str]:
         """Convert comma-separated CORS origins to list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
+    
+    @property
+    def profiling_sample_rates_map(self) -> dict[str, float]:
+        """Convert comma-separated route=rate pairs to a dict."""
+        rates = {}
+        for pair in self.profiling_sample_rates.split(","):
+            if "=" not in pair:
+                continue
+            route, rate = pair.rsplit("=", 1)
+            rates[route.strip()] = float(rate)
+        return rates
+    
+    @property
+    def rate_limits_map(self) -> dict[str, str]:
+        """Convert comma-separated route.key=count/period pairs to a dict."""
+        limits = {}
+        for pair in self.rate_limits.split(","):
+            if "=" not in pair:
+                continue
+            name, limit = pair.split("=", 1)
+            limits[name.strip()] = limit.strip()
+        return limits
 
 
 # Global settings instance
@@ -1,11 +1,15 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import ConnectionFailure, OperationFailure
 from config import settings
 import certifi
 
 # Global MongoDB client instance
 mongodb_client: AsyncIOMotorClient | None = None
 
+# Case-insensitive comparison for user emails. Queries on users.email must pass
+# this collation to match (and use) the unique email index.
+EMAIL_COLLATION = {"locale": "en", "strength": 2}
+
 
 async def connect_to_mongodb() -> None:
     """
@@ -41,6 +45,54 @@ async def connect_to_mongodb() -> None:
         raise
 
 
+async def ensure_indexes() -> None:
+    """
+    Create the indexes the application relies on for correctness.
+    Called on application startup; creating an existing index is a no-op.
+    Startup fails if the unique email index cannot be created.
+    """
+    db = get_database()
+    try:
+        await db["users"].create_index(
+            "email",
+            name="email_unique_ci",
+            unique=True,
+            collation=EMAIL_COLLATION
+        )
+    except OperationFailure as e:
+        # Signup and profile updates rely on this index alone to reject duplicate emails,
+        # so the app must not serve without it. Usually caused by existing accounts whose
+        # emails differ only by case; merge or rename those, then restart.
+        print(f"✗ Could not create unique email index: {e}")
+        raise
+    
+    # Per-user reads and account purges
+    await db["onboarding_responses"].create_index([("user_id", 1), ("created_at", -1)])
+    await db["journey_history"].create_index([("user_id", 1), ("timestamp", -1)])
+    await db["analytics_milestone_completions"].create_index("_id.user_id")
+    
+    # Deleted accounts waiting to be purged
+    await db["users"].create_index(
+        "deleted_at",
+        partialFilterExpression={"deleted_at": {"$type": "date"}}
+    )
+    
+    # High-water mark scans of the analytics refresh
+    await db["journey_history"].create_index("timestamp")
+    
+    # Activity charts read a range of days for one user (or null for all users)
+    await db["analytics_daily_activity"].create_index([("user_id", 1), ("day", 1)])
+    
+    # Archived history is read per user, newest month first
+    await db["journey_history_archive"].create_index([("user_id", 1), ("last_timestamp", -1)])
+    
+    # Polled cache invalidations (when change streams are unavailable)
+    await db["cache_versions"].create_index("updated_at")
+    
+    # Stored responses for Idempotency-Key replays
+    await db["idempotency_keys"].create_index("expires_at", expireAfterSeconds=0)
+
+
 async def close_mongodb_connection() -> None:
     """
     Close MongoDB connection.
@@ -1,61 +1,139 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError
 from bson import ObjectId
 
 from utils.jwt import decode_access_token
 from models.user import User
+from utils import user_cache
 from database import get_database
+from config import settings
 
 
 # HTTP Bearer token scheme for extracting JWT from Authorization header
 security = HTTPBearer()
+# Same, for endpoints that also accept the token as a query parameter
+optional_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def user_id_from_token(token: str) -> ObjectId:
+    """
+    Validate an access token and return the user id it was issued to.
+    
+    Raises:
+        HTTPException: 401 if token is invalid
+    """
+    from jose import JWTError
+    
+    try:
+        # Decode JWT token and extract user_id from its payload
+        payload = decode_access_token(token)
+        user_id: str = payload.get("sub")
+    except JWTError:
+        raise credentials_exception()
+    
+    if user_id is None or not ObjectId.is_valid(user_id):
+        raise credentials_exception()
+    return ObjectId(user_id)
+
+
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
+) -> ObjectId:
     """
-    Dependency to get the current authenticated user from JWT token.
+    Dependency to get the authenticated user's id from the JWT token alone.
+    
+    For endpoints that read only a few fields of the user document: they
+    fetch those fields themselves (and must treat a missing or deleted
+    document as 401, see active_user_filter) instead of loading the whole user.
     
     Args:
         credentials: HTTP Bearer credentials containing the JWT token
         
     Returns:
-        User object for the authenticated user
+        The user's ObjectId
         
     Raises:
-        HTTPException: 401 if token is invalid or user not found
+        HTTPException: 401 if token is invalid
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return user_id_from_token(credentials.credentials)
+
+
+async def get_current_user_id_from_header_or_query(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers")
+) -> ObjectId:
+    """
+    Like get_current_user_id, but also accepts the token as a `token` query
+    parameter, since browsers' EventSource cannot send an Authorization header.
     
-    try:
-        # Extract token from credentials
-        token = credentials.credentials
+    Raises:
+        HTTPException: 401 if neither carries a valid token
+    """
+    if credentials is not None:
+        return user_id_from_token(credentials.credentials)
+    if token:
+        return user_id_from_token(token)
+    raise credentials_exception()
+
+
+def active_user_filter(user_id: ObjectId) -> dict:
+    """Query for the user's document, excluding accounts that have been deleted."""
+    return {"_id": user_id, "deleted_at": None}
+
+
+async def get_current_user(
+    user_id: ObjectId = Depends(get_current_user_id)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    
+    Served from the per-worker user cache when USER_CACHE_SECONDS is set.
+    
+    Args:
+        user_id: The user id from the validated JWT token
         
-        # Decode JWT token
-        payload = decode_access_token(token)
+    Returns:
+        User object for the authenticated user
         
-        # Extract user_id from token payload
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
+    Raises:
+        HTTPException: 401 if token is invalid or user not found or deleted
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
     
     # Fetch user from database
     db = get_database()
-    user_data = await db.users.find_one({"_id": ObjectId(user_id)})
+    user_data = await db.users.find_one(active_user_filter(user_id))
     
     if user_data is None:
-        raise credentials_exception
+        raise credentials_exception()
     
     # Convert MongoDB document to User model
     user = User.from_mongo(user_data)
+    user_cache.put(user)
     
-    return user
\ No newline at end of file
+    return user
+
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None, alias="X-Admin-Key")) -> None:
+    """
+    Dependency guarding operator endpoints with the ADMIN_API_KEY shared secret.
+    
+    Raises:
+        HTTPException: 404 if no admin key is configured, 403 if the header doesn't match
+    """
+    if not settings.admin_api_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.admin_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
\ No newline at end of file
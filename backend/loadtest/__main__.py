@@ -0,0 +1,95 @@
+"""
+Scenario-based load test for the Pathways for Parents API.
+
+Run against a server backed by a local, seeded mongod - every session
+creates a new user account and journey history. All signups come from one
+address, so disable rate limiting or they are rejected after signup.ip:
+
+    RATE_LIMIT_ENABLED=false MONGODB_URI=mongodb://localhost:27017/pathways_loadtest python3 -m uvicorn main:app
+    python3 -m loadtest --sessions 200 --concurrency 20 --output results.json
+    python3 -m loadtest --sessions 200 --concurrency 20 --compare results.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+
+from loadtest.scenario import ParentSession
+from loadtest.stats import RunStats, format_table
+
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+
+async def run_load_test(base_url: str, sessions: int, concurrency: int, toggles: int, seed: int) -> dict:
+    """Run `sessions` parent sessions with at most `concurrency` in flight and summarize."""
+    stats = RunStats()
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def one_session():
+            async with semaphore:
+                await ParentSession(client, stats, toggles, random.Random(rng.random())).run()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_session() for _ in range(sessions)))
+        duration = time.perf_counter() - start
+
+    summary = stats.summary(duration)
+    summary["config"] = {
+        "base_url": base_url,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "toggles": toggles,
+        "seed": seed,
+    }
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python3 -m loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--sessions", type=int, default=50, help="Total parent sessions to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions in flight at once")
+    parser.add_argument("--toggles", type=int, default=8, help="Milestone toggles per session")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for reproducible sessions")
+    parser.add_argument("--output", type=Path, help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare p95 latency against")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Allow a non-local base URL (creates real accounts there)")
+    args = parser.parse_args()
+
+    if urlparse(args.base_url).hostname not in LOCAL_HOSTS and not args.allow_remote:
+        print(f"✗ Refusing to load-test non-local host {args.base_url} without --allow-remote")
+        return 2
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    print(f"Running {args.sessions} sessions at concurrency {args.concurrency} against {args.base_url}...")
+    summary = asyncio.run(
+        run_load_test(args.base_url, args.sessions, args.concurrency, args.toggles, args.seed)
+    )
+    print(format_table(summary, baseline))
+    if summary["rate_limited"]:
+        print(f"⚠ {summary['rate_limited']} requests were rate limited (429) - "
+              "restart the server with RATE_LIMIT_ENABLED=false")
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+        print(f"✓ Results written to {args.output}")
+
+    return 1 if summary["total_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
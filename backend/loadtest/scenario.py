@@ -0,0 +1,109 @@
+"""
+Parent-session scenario for the load-test harness.
+
+Each session walks the same path a real parent takes through the app:
+signup, login, onboarding, browsing stages and milestones, checking off a
+series of milestones, then reading progress and journey history.
+"""
+
+import random
+import time
+import uuid
+
+import httpx
+
+from loadtest.stats import RunStats
+
+
+AGE_RANGES = ["0-18m", "18-36m", "3-5y", "5-8y"]
+DIAGNOSIS_STATUSES = ["none", "waiting", "recent", "established"]
+PRIMARY_CONCERNS = ["speech", "behavior", "social", "school", "general"]
+
+PASSWORD = "LoadTestPassword123!"
+
+
+class ParentSession:
+    """
+    One simulated parent. Requests are recorded in RunStats under their
+    route template (e.g. "GET /api/v1/stages/{stage_id}") so that samples
+    from different ids aggregate into a single row.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, stats: RunStats, toggles: int, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.toggles = toggles
+        self.rng = rng
+        self.email = f"loadtest_{uuid.uuid4().hex}@example.com"
+        self.headers: dict[str, str] = {}
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - start, ok=response.is_success,
+                          status=response.status_code)
+        return response
+
+    async def run(self) -> None:
+        response = await self.request(
+            "POST /api/v1/auth/signup", "POST", "/api/v1/auth/signup",
+            json={"email": self.email, "password": PASSWORD, "name": "Load Test Parent"}
+        )
+        if response is None or response.status_code != 201:
+            return
+
+        response = await self.request(
+            "POST /api/v1/auth/login", "POST", "/api/v1/auth/login",
+            json={"email": self.email, "password": PASSWORD}
+        )
+        if response is None or response.status_code != 200:
+            return
+        self.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+        await self.request(
+            "POST /api/v1/onboarding", "POST", "/api/v1/onboarding",
+            json={
+                "childAgeRange": self.rng.choice(AGE_RANGES),
+                "diagnosisStatus": self.rng.choice(DIAGNOSIS_STATUSES),
+                "primaryConcern": self.rng.choice(PRIMARY_CONCERNS),
+            }
+        )
+
+        response = await self.request("GET /api/v1/stages", "GET", "/api/v1/stages")
+        stages = response.json() if response is not None and response.is_success else []
+        for stage in stages[:2]:
+            await self.request(
+                "GET /api/v1/stages/{stage_id}", "GET", f"/api/v1/stages/S{stage['order']}"
+            )
+
+        response = await self.request("GET /api/v1/milestones", "GET", "/api/v1/milestones")
+        milestones = response.json() if response is not None and response.is_success else []
+        if not milestones:
+            return
+
+        await self.request(
+            "GET /api/v1/milestones/{milestone_id}", "GET",
+            f"/api/v1/milestones/{self.rng.choice(milestones)['id']}"
+        )
+
+        # Check off a handful of milestones; a repeated pick un-checks it again
+        toggled = [self.rng.choice(milestones)["id"] for _ in range(self.toggles)]
+        for milestone_id in toggled:
+            await self.request(
+                "POST /api/v1/progress/milestones/{milestone_id}/toggle", "POST",
+                f"/api/v1/progress/milestones/{milestone_id}/toggle"
+            )
+            if self.rng.random() < 0.3:
+                await self.request("GET /api/v1/progress", "GET", "/api/v1/progress")
+
+        await self.request("GET /api/v1/progress", "GET", "/api/v1/progress")
+        await self.request("GET /api/v1/progress/history", "GET", "/api/v1/progress/history")
+        if toggled:
+            await self.request(
+                "GET /api/v1/progress/history/milestone/{milestone_id}", "GET",
+                f"/api/v1/progress/history/milestone/{toggled[0]}"
+            )
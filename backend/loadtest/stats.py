@@ -0,0 +1,88 @@
+"""
+Latency and throughput aggregation for load-test runs.
+"""
+
+import math
+from collections import defaultdict
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunStats:
+    """Collects per-endpoint request latencies and error counts for one run."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.rate_limited = 0
+
+    def record(self, endpoint: str, latency: float, ok: bool, status: int | None = None) -> None:
+        self.latencies[endpoint].append(latency)
+        if not ok:
+            self.errors[endpoint] += 1
+        if status == 429:
+            self.rate_limited += 1
+
+    def summary(self, duration: float) -> dict:
+        """
+        Summarize the run as a JSON-serializable dict.
+
+        Latencies are reported in milliseconds, throughput in requests/second
+        over the wall-clock duration of the whole run.
+        """
+        endpoints = {}
+        total_requests = 0
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            total_requests += len(values)
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput_rps": round(len(values) / duration, 2) if duration else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return {
+            "duration_s": round(duration, 3),
+            "total_requests": total_requests,
+            "total_errors": sum(self.errors.values()),
+            "rate_limited": self.rate_limited,
+            "throughput_rps": round(total_requests / duration, 2) if duration else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def format_table(summary: dict, baseline: dict | None = None) -> str:
+    """Render a run summary as a text table, with p95 deltas against a baseline."""
+    header = f"{'endpoint':<52} {'reqs':>6} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    if baseline:
+        header += f" {'Δp95':>8}"
+    lines = [header, "-" * len(header)]
+    base_endpoints = (baseline or {}).get("endpoints", {})
+    for endpoint, row in summary["endpoints"].items():
+        line = (
+            f"{endpoint:<52} {row['requests']:>6} {row['errors']:>5} {row['throughput_rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+        if baseline:
+            previous = base_endpoints.get(endpoint)
+            if previous and previous["p95_ms"]:
+                change = (row["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+                line += f" {change:>+7.1f}%"
+            else:
+                line += f" {'n/a':>8}"
+        lines.append(line)
+    lines.append("-" * len(header))
+    lines.append(
+        f"{summary['total_requests']} requests, {summary['total_errors']} errors, "
+        f"{summary['throughput_rps']:.1f} req/s over {summary['duration_s']:.1f}s"
+    )
+    return "\n".join(lines)
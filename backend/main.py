@@ -1,23 +1,58 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from datetime import datetime, timezone
 
 from config import settings
-from database import connect_to_mongodb, close_mongodb_connection, ping_database
-from routers import auth, onboarding, stages, milestones, progress, resources, users
+from database import connect_to_mongodb, close_mongodb_connection, ping_database, get_database, ensure_indexes
+from middleware.compression import CompressionMiddleware
+from middleware.profiling import ProfilingMiddleware
+from routers import auth, onboarding, stages, milestones, progress, resources, users, journey, analytics
+from utils.account_deletion import JOB_NAME as PURGE_JOB, purge_deleted_accounts
+from utils.activity import JOB_NAME as ACTIVITY_JOB, refresh_daily_activity
+from utils.analytics import JOB_NAME as ANALYTICS_JOB, refresh_milestone_cohorts
+from utils.archive import JOB_NAME as ARCHIVE_JOB, archive_history
+from utils.background import BackgroundJobs
+from utils.catalog import init_catalog
+from utils.invalidation import start_invalidation_listener, stop_invalidation_listener
+from utils.pubsub import start_pubsub, stop_pubsub
+from utils.warmup import warm_up
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for startup and shutdown events.
-    Handles MongoDB connection lifecycle.
+    Handles MongoDB connection lifecycle, loads the in-memory catalog and
+    runs the periodic background jobs.
     """
     # Startup: Connect to MongoDB
     await connect_to_mongodb()
+    await ensure_indexes()
+    
+    # Load the catalog from the bundle (or MongoDB); routers query MongoDB per request if this fails
+    try:
+        await init_catalog(get_database())
+    except Exception as e:
+        print(f"✗ Failed to load catalog, serving catalog reads from MongoDB: {e}")
+    
+    # Load the lazily imported JWT/Argon2 backends off the event loop while requests are served
+    app.state.warm_up = asyncio.get_running_loop().run_in_executor(None, warm_up)
+    
+    await start_pubsub()
+    start_invalidation_listener()
+    
+    app.state.jobs = BackgroundJobs()
+    app.state.jobs.schedule(ANALYTICS_JOB, settings.analytics_refresh_seconds, refresh_milestone_cohorts)
+    app.state.jobs.schedule(ACTIVITY_JOB, settings.activity_rollup_seconds, refresh_daily_activity)
+    app.state.jobs.schedule(ARCHIVE_JOB, settings.history_archive_seconds, archive_history)
+    app.state.jobs.schedule(PURGE_JOB, settings.account_purge_seconds, purge_deleted_accounts)
     yield
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Stop background jobs, pub/sub and invalidations, then close MongoDB connection
+    await app.state.jobs.stop()
+    await stop_pubsub()
+    await stop_invalidation_listener()
     await close_mongodb_connection()
 
 
@@ -40,6 +75,12 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Compress responses for clients that accept gzip or brotli (inside profiling, so its cost is sampled)
+app.add_middleware(CompressionMiddleware)
+
+# Profile requests carrying the X-Profile secret or selected by per-route sampling
+app.add_middleware(ProfilingMiddleware)
+
 # Register routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router)
@@ -48,6 +89,8 @@ app.include_router(stages.router)
 app.include_router(milestones.router)
 app.include_router(progress.router)
 app.include_router(resources.router)
+app.include_router(journey.router)
+app.include_router(analytics.router)
 
 
 @app.get("/")
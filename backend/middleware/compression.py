@@ -0,0 +1,62 @@
+"""
+Compression middleware - gzip/brotli for responses above a size threshold.
+
+The encoding is negotiated from the request's Accept-Encoding header (see
+utils/compression.py). Only responses sent as a single body are compressed:
+streamed responses (progress events, data exports) are passed through as
+they are produced, and so are responses that already carry a
+Content-Encoding, such as precompressed catalog responses.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import settings
+from utils.compression import compress, negotiate
+
+
+# Content types worth compressing; images, zips and the like are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses whole response bodies of at least COMPRESSION_MIN_BYTES."""
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = settings.compression_enabled
+        self.min_bytes = settings.compression_min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held until the first body message shows whether the response is streamed
+                start = message
+                return
+            if message["type"] == "http.response.body" and start is not None:
+                headers = MutableHeaders(scope=start)
+                if _compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                    body = message.get("body", b"")
+                    if encoding and not message.get("more_body", False) and len(body) >= self.min_bytes:
+                        body = compress(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                await send(start)
+                start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
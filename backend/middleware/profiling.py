@@ -0,0 +1,176 @@
+"""
+Profiling middleware - on-demand and sampled per-request CPU profiling.
+
+A request is profiled when it carries an ``X-Profile`` header matching
+``PROFILING_SECRET``, or when ``PROFILING_ENABLED`` is set and the request's
+route wins its configured sampling rate. While the request runs, a background
+thread samples the event loop thread's stack and the result is written in the
+folded-stack format understood by flamegraph.pl, speedscope and inferno.
+
+The loop interleaves every in-flight request, so a sample is only kept when
+the profiled request's task is the one running. Work the request hands to
+other tasks or to the threadpool is not captured.
+"""
+
+import asyncio
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+from config import settings
+
+
+PROFILE_HEADER = b"x-profile"
+
+
+class StackSampler:
+    """
+    Samples the stack of a single thread at a fixed interval.
+
+    Stacks are aggregated into a Counter keyed by the folded stack string
+    ("outer;inner;innermost"), which is the input format for flame graphs.
+    When `root_frame` is given, only stacks running inside it are counted.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root_frame=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_frame = root_frame
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or not _runs_in(frame, self.root_frame):
+                continue
+            self.samples[_fold(frame)] += 1
+
+
+def _runs_in(frame, root_frame) -> bool:
+    """Whether `root_frame` is on the stack ending at `frame` (always true without one)."""
+    if root_frame is None:
+        return True
+    while frame is not None:
+        if frame is root_frame:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def _fold(frame) -> str:
+    """Render a frame chain as a root-first, semicolon-separated stack."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _route_path(scope) -> str:
+    """Resolve the route template (e.g. "/api/v1/stages/{stage_id}") for a request."""
+    app = scope.get("app")
+    if app is not None:
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+    return scope["path"]
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected requests and stores a folded-stack report.
+
+    The report file name is returned to the caller in the ``X-Profile-Id``
+    response header. Only one request is profiled at a time; a request that
+    would overlap an in-flight profile is served unprofiled. Profiling stops
+    at the first response body message, so a streamed response (progress
+    events, data exports) is profiled until it starts streaming rather than
+    holding the profiler for the life of the stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.secret = settings.profiling_secret.encode()
+        self.enabled = settings.profiling_enabled
+        self.sample_rates = settings.profiling_sample_rates_map
+        self.interval = settings.profiling_interval_ms / 1000
+        self.output_dir = Path(settings.profiling_output_dir)
+        self._busy = threading.Lock()
+
+    def _should_profile(self, scope) -> tuple[bool, str]:
+        if self.secret:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and hmac.compare_digest(value, self.secret):
+                    return True, _route_path(scope)
+        if self.enabled and self.sample_rates:
+            route = _route_path(scope)
+            rate = self.sample_rates.get(route, self.sample_rates.get("*", 0.0))
+            return random.random() < rate, route
+        return False, ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, route = self._should_profile(scope)
+        if not profile or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        route_slug = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+        report_id = f"{time.time_ns()}-{scope['method']}-{route_slug}.folded"
+
+        # The frame of the coroutine driving this request's task; samples outside it belong to other requests
+        root_frame = getattr(asyncio.current_task().get_coro(), "cr_frame", None)
+        sampler = StackSampler(threading.get_ident(), self.interval, root_frame)
+        stopped = False
+
+        async def stop_profiling():
+            nonlocal stopped
+            if stopped:
+                return
+            stopped = True
+            samples = sampler.stop()
+            self._busy.release()
+            await asyncio.to_thread(self._write_report, report_id, samples)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Profile-Id", report_id)
+            await send(message)
+            if message["type"] == "http.response.body":
+                await stop_profiling()
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await stop_profiling()
+
+    def _write_report(self, report_id: str, samples: Counter) -> None:
+        """Write samples as "stack count" lines, one per unique stack."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}\n" for stack, count in samples.most_common()]
+        (self.output_dir / report_id).write_text("".join(lines))
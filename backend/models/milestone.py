@@ -1,25 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, Field
-from bson import ObjectId
-
-
-class PyObjectId(ObjectId):
-    """Custom type for MongoDB ObjectId that works with Pydantic."""
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-    
-    @classmethod
-    def validate(cls, v, _):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-    
-    @classmethod
-    def __get_pydantic_json_schema__(cls, _schema_generator, _handler):
-        return {"type": "string"}
+from .object_id import PyObjectId
 
 
 class Milestone(BaseModel):
@@ -27,6 +9,7 @@ class Milestone(BaseModel):
     
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
     stage_id: str
+    slug: Optional[str] = None  # Stable human-readable key; the seed derives _id from it
     title: str
     behavior: str
     why_it_matters: str
@@ -36,9 +19,7 @@ class Milestone(BaseModel):
     
     class Config:
         populate_by_name = True
-        arbitrary_types_allowed = True
         json_encoders = {
-            ObjectId: str,
             datetime: lambda v: v.isoformat()
         }
     
@@ -54,6 +35,4 @@ class Milestone(BaseModel):
         """Create Milestone instance from MongoDB document."""
         if not data:
             return None
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
         return cls(**data)
\ No newline at end of file
@@ -0,0 +1,47 @@
+from typing import Annotated, Any
+
+from bson import ObjectId
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+
+def _parse_object_id(value: Any) -> ObjectId:
+    """Parse a 24-character hex string (or bytes) into an ObjectId."""
+    if isinstance(value, ObjectId):
+        return value
+    if ObjectId.is_valid(value):
+        return ObjectId(value)
+    raise ValueError("Invalid ObjectId")
+
+
+class _ObjectIdAnnotation:
+    """
+    Pydantic v2 schema for MongoDB ObjectIds.
+
+    ObjectId instances coming from Motor are accepted as-is with a single
+    isinstance check; strings are parsed only when they arrive as strings
+    (request bodies, JSON). Values stay ObjectIds in Python and in
+    model_dump(), so to_dict() hands Mongo real ObjectIds, and are rendered
+    as hex strings only when serializing to JSON.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type: Any, _handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        from_str = core_schema.no_info_plain_validator_function(_parse_object_id)
+        return core_schema.json_or_python_schema(
+            json_schema=from_str,
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(ObjectId),
+                from_str,
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(str, when_used="json"),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, _core_schema: core_schema.CoreSchema, _handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {"type": "string", "pattern": "^[0-9a-f]{24}$"}
+
+
+# ObjectId field type shared by all models
+PyObjectId = Annotated[ObjectId, _ObjectIdAnnotation]
@@ -2,8 +2,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from enum import Enum
 from pydantic import BaseModel, Field
-from bson import ObjectId
-from .user import PyObjectId
+from .object_id import PyObjectId
 
 
 class ChildAgeRange(str, Enum):
@@ -45,9 +44,7 @@ class OnboardingResponse(BaseModel):
     
     class Config:
         populate_by_name = True
-        arbitrary_types_allowed = True
         json_encoders = {
-            ObjectId: str,
             datetime: lambda v: v.isoformat()
         }
     
@@ -63,8 +60,4 @@ class OnboardingResponse(BaseModel):
         """Create OnboardingResponse instance from MongoDB document."""
         if not data:
             return None
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
-        if "user_id" in data:
-            data["user_id"] = str(data["user_id"])
         return cls(**data)
\ No newline at end of file
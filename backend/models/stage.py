@@ -1,25 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, Field
-from bson import ObjectId
-
-
-class PyObjectId(ObjectId):
-    """Custom type for MongoDB ObjectId that works with Pydantic."""
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-    
-    @classmethod
-    def validate(cls, v, _):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-    
-    @classmethod
-    def __get_pydantic_json_schema__(cls, _schema_generator, _handler):
-        return {"type": "string"}
+from .object_id import PyObjectId
 
 
 class Stage(BaseModel):
@@ -37,9 +19,7 @@ class Stage(BaseModel):
     
     class Config:
         populate_by_name = True
-        arbitrary_types_allowed = True
         json_encoders = {
-            ObjectId: str,
             datetime: lambda v: v.isoformat()
         }
     
@@ -55,6 +35,4 @@ class Stage(BaseModel):
         """Create Stage instance from MongoDB document."""
         if not data:
             return None
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
         return cls(**data)
\ No newline at end of file
@@ -1,25 +1,12 @@
 from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, Field, EmailStr
-from bson import ObjectId
+from .object_id import PyObjectId
 
 
-class PyObjectId(ObjectId):
-    """Custom type for MongoDB ObjectId that works with Pydantic."""
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-    
-    @classmethod
-    def validate(cls, v, _):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-    
-    @classmethod
-    def __get_pydantic_json_schema__(cls, _schema_generator, _handler):
-        return {"type": "string"}
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address, used for lookups and rate limit keys."""
+    return email.strip().lower()
 
 
 class User(BaseModel):
@@ -31,14 +18,14 @@ class User(BaseModel):
     name: Optional[str] = None
     recommended_stage_id: Optional[str] = None
     completed_milestones: list[str] = Field(default_factory=list)
+    stage_completed_counts: Optional[dict[str, int]] = None  # Completed milestones per stage; None on older documents
+    deleted_at: Optional[datetime] = None  # Set when the account is deleted, until it is purged
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     class Config:
         populate_by_name = True
-        arbitrary_types_allowed = True
         json_encoders = {
-            ObjectId: str,
             datetime: lambda v: v.isoformat()
         }
     
@@ -54,6 +41,4 @@ class User(BaseModel):
         """Create User instance from MongoDB document."""
         if not data:
             return None
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
         return cls(**data)
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Analytics router - operator views of materialized analytics.
+
+Requires the X-Admin-Key header to match ADMIN_API_KEY.
+"""
+
+import asyncio
+import time
+from fastapi import APIRouter, Depends, Query
+from database import get_database
+from config import settings
+from dependencies.auth import require_admin_key
+from utils.activity import MAX_DAYS, get_daily_activity, refresh_daily_activity
+from utils.analytics import COHORT_MILESTONES, COHORTS, JOB_NAME, refresh_milestone_cohorts
+from utils.catalog import get_catalog
+from utils.invalidation import metrics as invalidation_metrics
+
+router = APIRouter(
+    prefix="/api/v1/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(require_admin_key)]
+)
+
+# Response cache: (expiry on the monotonic clock, response)
+_cohorts_cache: tuple[float, dict] | None = None
+
+
+async def build_milestone_cohorts(db) -> dict:
+    """Assemble the cohort report from the materialized collections."""
+    meta, cohorts, rows = await asyncio.gather(
+        db["analytics_meta"].find_one({"_id": JOB_NAME}),
+        db[COHORTS].find({}).sort("_id", 1).to_list(length=None),
+        db[COHORT_MILESTONES].find({}).to_list(length=None)
+    )
+
+    catalog = get_catalog()
+    milestones_by_id = catalog.milestones_by_id if catalog is not None else {}
+
+    rows_by_cohort: dict[str, list[dict]] = {}
+    for row in rows:
+        rows_by_cohort.setdefault(row["_id"]["stage_id"], []).append(row)
+
+    report = []
+    for cohort in cohorts:
+        users = cohort["users"]
+        milestones = []
+        for row in rows_by_cohort.get(cohort["_id"], []):
+            milestone_id = row["_id"]["milestone_id"]
+            milestone = milestones_by_id.get(milestone_id, {})
+            milestones.append({
+                "milestone_id": milestone_id,
+                "title": milestone.get("title"),
+                "stage_id": milestone.get("stage_id"),
+                "completed_users": row["completed_users"],
+                "currently_completed_users": row["currently_completed_users"],
+                "completion_rate": round(row["completed_users"] / users, 3) if users else 0,
+                "median_days_to_complete": row["median_days_to_complete"]
+            })
+        milestones.sort(key=lambda milestone: -milestone["completion_rate"])
+        # Cohorts are recorded under recommended stage ids ("s1"); report them by stage key ("S1")
+        stage_id = (catalog.canonical_stage_key(cohort["_id"]) if catalog is not None else None) or cohort["_id"]
+        report.append({"stage_id": stage_id, "users": users, "milestones": milestones})
+
+    return {
+        "refreshed_at": meta["refreshed_at"].isoformat() if meta else None,
+        "high_water_mark": meta["high_water_mark"].isoformat() if meta else None,
+        "cohorts": report
+    }
+
+
+@router.get("/milestone-cohorts", response_model=dict)
+async def get_milestone_cohorts(refresh_cache: bool = Query(False, description="Bypass the response cache")):
+    """
+    Milestone completion by onboarding cohort (users grouped by recommended stage).
+
+    For each cohort and milestone: users who have completed it, the share of
+    the cohort that has, and the median days from signup to first completion.
+    Served from the materialized collections refreshed in the background.
+
+    Returns:
+        Cohort report with refresh timestamps
+    """
+    global _cohorts_cache
+
+    if _cohorts_cache is None or _cohorts_cache[0] < time.monotonic() or refresh_cache:
+        report = await build_milestone_cohorts(get_database())
+        _cohorts_cache = (time.monotonic() + settings.analytics_cache_seconds, report)
+    return _cohorts_cache[1]
+
+
+@router.post("/milestone-cohorts/refresh", response_model=dict)
+async def refresh_milestone_cohorts_now(full: bool = Query(False, description="Rebuild from all history")):
+    """
+    Refresh the cohort analytics immediately instead of waiting for the next scheduled run.
+
+    Returns:
+        The refresh summary
+    """
+    global _cohorts_cache
+
+    meta = await refresh_milestone_cohorts(get_database(), full=full)
+    _cohorts_cache = None
+    return {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in meta.items()}
+
+
+@router.get("/activity", response_model=dict)
+async def get_activity(days: int = Query(30, ge=1, le=MAX_DAYS, description="Days up to and including today")):
+    """
+    Milestone completions and uncompletions per UTC day for all users, by stage.
+
+    Served from the daily activity rollups, which lag journey history by up
+    to ACTIVITY_ROLLUP_SECONDS.
+
+    Returns:
+        One entry per day, oldest first
+    """
+    return {"days": await get_daily_activity(get_database(), None, days)}
+
+
+@router.post("/activity/refresh", response_model=dict)
+async def refresh_activity_now(full: bool = Query(False, description="Rebuild from all history")):
+    """
+    Bring the daily activity rollups up to date immediately.
+
+    Returns:
+        The refresh summary
+    """
+    meta = await refresh_daily_activity(get_database(), full=full)
+    return {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in meta.items()}
+
+
+@router.get("/cache-invalidation", response_model=dict)
+async def get_cache_invalidation_metrics():
+    """
+    Cache invalidation metrics of the worker that serves the request.
+
+    Includes how invalidations arrive (change stream or polling), how many
+    this worker published and received, and the propagation delay of the
+    received ones (p50, p95, max over the last 1000).
+    """
+    return invalidation_metrics()
@@ -1,39 +1,71 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request, status, Depends
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from schemas.auth import SignupRequest, LoginRequest, AuthResponse, UserResponse
-from models.user import User
+from models.user import User, normalize_email
 from utils.security import hash_password, verify_password
 from utils.jwt import create_access_token
+from utils.rate_limit import check_auth_rate_limit
+from utils import known_emails
+from utils.idempotency import idempotent
 from dependencies.auth import get_current_user
-from database import get_database
+from database import get_database, EMAIL_COLLATION
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/signup", response_model=AuthResponse, response_model_by_alias=True, status_code=status.HTTP_201_CREATED)
-async def signup(request: SignupRequest):
+async def signup(
+    request: SignupRequest,
+    http_request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
     """
     Register a new user account.
     
     - Validates email format and password length
-    - Checks email uniqueness
+    - Rate limits attempts per client IP and email (429)
     - Hashes password with Argon2
-    - Creates user in MongoDB
+    - Creates user in MongoDB; the unique email index rejects duplicates
     - Generates JWT token (30-day expiry)
     - Returns user data and token
+    - A retry with the same Idempotency-Key returns the created user with a fresh token
     """
+    # Throttle before the key is claimed or replayed, so replays can't probe passwords unthrottled
+    await check_auth_rate_limit("signup", http_request, normalize_email(request.email))
+    
+    async with idempotent(idempotency_key, "signup", request) as idempotency:
+        if idempotency.replayed:
+            # The token isn't stored with the response; issue a new one for the same user
+            user_id = idempotency.body["user"]["id"]
+            idempotency.body = {**idempotency.body, "token": create_access_token(data={"sub": user_id})}
+            return idempotency.replay_response()
+        
+        user_response, token = await create_user(request)
+        await idempotency.save({"user": user_response}, status_code=status.HTTP_201_CREATED)
+    
+    return AuthResponse(user=user_response, token=token)
+
+
+async def create_user(request: SignupRequest) -> tuple[UserResponse, str]:
+    """Create the account for a signup request and return its profile and a token."""
+    email = normalize_email(request.email)
+    
     db = get_database()
+    already_registered = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered"
+    )
     
-    # Check if email already exists
-    existing_user = await db.users.find_one({"email": request.email})
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
+    # Reject emails this worker has seen registered without paying for a hash
+    if known_emails.is_known(email):
+        if await db.users.find_one({"email": email}, {"_id": 1}, collation=EMAIL_COLLATION):
+            raise already_registered
+        known_emails.forget(email)
     
     # Hash password
     password_hash = hash_password(request.password)
@@ -41,16 +73,22 @@ async def signup(request: SignupRequest):
     # Create user document
     now = datetime.now(timezone.utc)
     user = User(
-        email=request.email,
+        email=email,
         password_hash=password_hash,
         name=request.name,
+        stage_completed_counts={},
         created_at=now,
         updated_at=now
     )
     
     # Insert into database
-    result = await db.users.insert_one(user.to_dict())
+    try:
+        result = await db.users.insert_one(user.to_dict())
+    except DuplicateKeyError:
+        known_emails.remember(email)
+        raise already_registered
     user_id = str(result.inserted_id)
+    known_emails.remember(email)
     
     # Generate JWT token
     token = create_access_token(data={"sub": user_id})
@@ -65,23 +103,27 @@ async def signup(request: SignupRequest):
         created_at=user.created_at
     )
     
-    return AuthResponse(user=user_response, token=token)
+    return user_response, token
 
 
 @router.post("/login", response_model=AuthResponse, response_model_by_alias=True)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
     """
     Authenticate user and issue JWT token.
     
     - Validates email format
+    - Rate limits attempts per client IP and email (429)
     - Verifies credentials
     - Generates JWT token (30-day expiry)
     - Returns user data and token
     """
+    email = normalize_email(request.email)
+    await check_auth_rate_limit("login", http_request, email)
+    
     db = get_database()
     
     # Find user by email
-    user_data = await db.users.find_one({"email": request.email})
+    user_data = await db.users.find_one({"email": email}, collation=EMAIL_COLLATION)
     if not user_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,6 +137,8 @@ async def login(request: LoginRequest):
             detail="Invalid email or password"
         )
     
+    known_emails.remember(email)
+    
     # Convert to User model
     user = User.from_mongo(user_data)
     user_id = str(user_data["_id"])
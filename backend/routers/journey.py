@@ -0,0 +1,80 @@
+"""
+Journey router - everything the journey pages need for first paint in one request.
+"""
+
+import asyncio
+from fastapi import APIRouter, Depends
+from database import get_database
+from models.user import User
+from models.onboarding import OnboardingResponse
+from schemas.onboarding import OnboardingResponseSchema
+from dependencies.auth import get_current_user
+from utils.catalog import get_catalog
+from utils.progress import calculate_progress
+from utils.projections import MILESTONE_RESPONSE, STAGE_RESPONSE
+
+router = APIRouter(prefix="/api/v1/journey", tags=["journey"])
+
+
+async def load_catalog(db) -> tuple[list[dict], list[dict]]:
+    """Stages and milestones in response shape, from memory when the catalog is loaded."""
+    catalog = get_catalog()
+    if catalog is not None:
+        return catalog.stages, catalog.milestones
+
+    stages, milestones = await asyncio.gather(
+        db["stages"].aggregate([{"$sort": {"order": 1}}, STAGE_RESPONSE]).to_list(length=None),
+        db["milestones"].aggregate([MILESTONE_RESPONSE]).to_list(length=None)
+    )
+    return stages, milestones
+
+
+async def load_latest_onboarding(db, user: User) -> OnboardingResponseSchema | None:
+    """The user's most recent onboarding response, or None if they haven't onboarded."""
+    onboarding_data = await db.onboarding_responses.find_one(
+        {"user_id": user.id},
+        sort=[("created_at", -1)]
+    )
+    if not onboarding_data:
+        return None
+    return OnboardingResponseSchema.from_model(OnboardingResponse.from_mongo(onboarding_data))
+
+
+@router.get("/bootstrap", response_model=dict)
+async def get_journey_bootstrap(current_user: User = Depends(get_current_user)):
+    """
+    Get stages, milestones, progress and the latest onboarding response in one call.
+
+    Replaces separate calls to /stages, /milestones, /progress and /onboarding
+    on the journey pages: the user is authenticated once and the catalog and
+    onboarding lookups run concurrently.
+
+    Args:
+        current_user: The authenticated user
+
+    Returns:
+        stages, milestones, progress (as GET /progress) and onboarding (null if none)
+    """
+    db = get_database()
+
+    (stages, milestones), onboarding = await asyncio.gather(
+        load_catalog(db),
+        load_latest_onboarding(db, current_user)
+    )
+
+    catalog = get_catalog()
+    if catalog is not None:
+        milestone_ids_by_stage = catalog.milestone_ids_by_stage
+    else:
+        milestone_ids_by_stage = {}
+        for milestone in milestones:
+            milestone_ids_by_stage.setdefault(milestone["stage_id"], []).append(milestone["id"])
+
+    return {
+        "stages": stages,
+        "milestones": milestones,
+        "progress": calculate_progress(
+            current_user.completed_milestones, milestone_ids_by_stage, current_user.stage_completed_counts
+        ),
+        "onboarding": onboarding.model_dump(mode="json") if onboarding else None
+    }
@@ -2,56 +2,61 @@
 Milestones router - handles milestone endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
+from bson import ObjectId
 from database import get_database
-from models.milestone import Milestone
+from utils.catalog import get_catalog, parse_stage_key, stage_key
+from utils.progress import resolve_milestones
+from utils.projections import MILESTONE_RESPONSE
 
 router = APIRouter(prefix="/api/v1/milestones", tags=["milestones"])
 
 
 @router.get("", response_model=list[dict])
-async def list_milestones(stageId: Optional[str] = Query(None, description="Filter by stage ID")):
+async def list_milestones(request: Request, stageId: Optional[str] = Query(None, description="Filter by stage ID")):
     """
     Get all milestones, optionally filtered by stage.
     
     Args:
-        stageId: Optional stage ID to filter milestones (e.g., "S1", "S2")
+        stageId: Optional stage to filter milestones by: a stage key (e.g., "S1" or "s1") or stage ID
     
     Returns:
         List of milestones
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        if stageId:
+            key = catalog.canonical_stage_key(stageId)
+            if key not in catalog.milestones_by_stage:
+                return []
+            return catalog.response(request, f"milestones:{key}", catalog.milestones_by_stage[key])
+        return catalog.response(request, "milestones", catalog.milestones)
+    
     db = get_database()
     milestones_collection = db["milestones"]
     
     # Build query filter
     query = {}
     if stageId:
-        query["stage_id"] = stageId
-    
-    # Fetch milestones
-    cursor = milestones_collection.find(query)
-    milestones = await cursor.to_list(length=None)
-    
-    # Convert to response format
-    result = []
-    for milestone in milestones:
-        milestone_dict = Milestone.from_mongo(milestone).model_dump(by_alias=True)
-        # Convert _id to id for frontend
-        if "_id" in milestone_dict:
-            milestone_dict["id"] = milestone_dict.pop("_id")
-        result.append(milestone_dict)
-    
-    return result
+        match = parse_stage_key(stageId)
+        stage = await db["stages"].find_one(match, {"order": 1}) if match is not None else None
+        if stage is None:
+            return []
+        query["stage_id"] = stage_key(stage["order"])
+    
+    # Fetch milestones already shaped for the response (string id, exposed fields only)
+    cursor = milestones_collection.aggregate([{"$match": query}, MILESTONE_RESPONSE])
+    return await cursor.to_list(length=None)
 
 
 @router.get("/{milestone_id}", response_model=dict)
-async def get_milestone(milestone_id: str):
+async def get_milestone(milestone_id: str, request: Request):
     """
     Get details of a specific milestone.
     
     Args:
-        milestone_id: The milestone's MongoDB ObjectId
+        milestone_id: The milestone's id, slug or frontend id (e.g., "m1-3"), in any case
     
     Returns:
         Milestone details
@@ -59,26 +64,29 @@ async def get_milestone(milestone_id: str):
     Raises:
         HTTPException: 404 if milestone not found
     """
-    db = get_database()
-    milestones_collection = db["milestones"]
+    catalog = get_catalog()
+    if catalog is not None:
+        milestone = catalog.resolve_milestone(milestone_id)
+        if milestone is None:
+            raise HTTPException(status_code=404, detail="Milestone not found")
+        return catalog.response(request, f"milestone:{milestone['id']}", milestone)
     
-    # Try to find by ObjectId
-    from bson import ObjectId
+    db = get_database()
+    milestone = (await resolve_milestones(db, [milestone_id])).get(milestone_id)
+    if milestone is None:
+        raise HTTPException(status_code=404, detail="Milestone not found")
     
-    if not ObjectId.is_valid(milestone_id):
-        raise HTTPException(status_code=400, detail="Invalid milestone ID format")
+    # Frontend milestones have no document; everything known about them was resolved
+    if not ObjectId.is_valid(milestone["id"]):
+        return milestone
     
-    milestone = await milestones_collection.find_one({"_id": ObjectId(milestone_id)})
+    cursor = db["milestones"].aggregate([
+        {"$match": {"_id": ObjectId(milestone["id"])}},
+        MILESTONE_RESPONSE
+    ])
+    milestones = await cursor.to_list(length=1)
     
-    if not milestone:
+    if not milestones:
         raise HTTPException(status_code=404, detail="Milestone not found")
     
-    # Convert to Milestone model and then to dict
-    milestone_obj = Milestone.from_mongo(milestone)
-    milestone_dict = milestone_obj.model_dump(by_alias=True)
-    
-    # Convert _id to id for frontend
-    if "_id" in milestone_dict:
-        milestone_dict["id"] = milestone_dict.pop("_id")
-    
-    return milestone_dict
\ No newline at end of file
+    return milestones[0]
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from datetime import datetime, timezone
 from bson import ObjectId
 
 from models.user import User
 from models.onboarding import OnboardingResponse
 from schemas.onboarding import OnboardingRequest, OnboardingResponseSchema
-from dependencies.auth import get_current_user
+from dependencies.auth import get_current_user, active_user_filter
 from database import get_database
 from utils.recommendation import calculate_recommended_stage
+from utils import invalidation
+from utils.idempotency import idempotent
+from utils.user_cache import user_key
 
 
 router = APIRouter(prefix="/api/v1/onboarding", tags=["onboarding"])
@@ -16,7 +20,8 @@ router = APIRouter(prefix="/api/v1/onboarding", tags=["onboarding"])
 @router.post("", response_model=OnboardingResponseSchema, status_code=status.HTTP_201_CREATED)
 async def submit_onboarding(
     request: OnboardingRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ) -> OnboardingResponseSchema:
     """
     Submit onboarding questionnaire responses.
@@ -27,6 +32,8 @@ async def submit_onboarding(
     - Primary concern
     
     Saves the response and updates the user's recommended_stage_id.
+    A retry with the same Idempotency-Key returns the original response
+    without saving again.
     
     Args:
         request: Onboarding questionnaire responses
@@ -36,61 +43,64 @@ async def submit_onboarding(
         OnboardingResponseSchema with calculated recommendation
         
     Raises:
-        HTTPException: 500 if database operation fails
+        HTTPException: 404 if the account has been deleted, 500 if database operation fails
     """
-    db = get_database()
-    
-    # Calculate recommended stage using the deterministic algorithm
-    recommended_stage_id = calculate_recommended_stage(
-        age_range=request.childAgeRange,
-        diagnosis_status=request.diagnosisStatus,
-        primary_concern=request.primaryConcern
-    )
-    
-    # Create onboarding response document
-    onboarding_response = OnboardingResponse(
-        user_id=current_user.id,
-        child_age_range=request.childAgeRange,
-        diagnosis_status=request.diagnosisStatus,
-        primary_concern=request.primaryConcern,
-        recommended_stage_id=recommended_stage_id
-    )
-    
-    try:
-        # Save onboarding response to database
-        result = await db.onboarding_responses.insert_one(
-            onboarding_response.to_dict()
+    async with idempotent(idempotency_key, f"{current_user.id}:onboarding", request) as idempotency:
+        if idempotency.replayed:
+            return idempotency.replay_response()
+        
+        db = get_database()
+        
+        # Calculate recommended stage using the deterministic algorithm
+        recommended_stage_id = calculate_recommended_stage(
+            age_range=request.childAgeRange,
+            diagnosis_status=request.diagnosisStatus,
+            primary_concern=request.primaryConcern
         )
-        onboarding_response.id = result.inserted_id
         
-        # Update user's recommended_stage_id
-        await db.users.update_one(
-            {"_id": current_user.id},
-            {
-                "$set": {
-                    "recommended_stage_id": recommended_stage_id,
-                    "updated_at": datetime.now(timezone.utc)
-                }
-            }
+        # Create onboarding response document
+        onboarding_response = OnboardingResponse(
+            user_id=current_user.id,
+            child_age_range=request.childAgeRange,
+            diagnosis_status=request.diagnosisStatus,
+            primary_concern=request.primaryConcern,
+            recommended_stage_id=recommended_stage_id
         )
         
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save onboarding response: {str(e)}"
+        try:
+            # Update user's recommended_stage_id; a deleted account matches nothing
+            user_result = await db.users.update_one(
+                active_user_filter(current_user.id),
+                {
+                    "$set": {
+                        "recommended_stage_id": recommended_stage_id,
+                        "updated_at": datetime.now(timezone.utc)
+                    }
+                }
+            )
+            
+            # Save onboarding response to database
+            if user_result.matched_count:
+                result = await db.onboarding_responses.insert_one(
+                    onboarding_response.to_dict()
+                )
+                onboarding_response.id = result.inserted_id
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save onboarding response: {str(e)}"
+            )
+        if user_result.matched_count == 0:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        
+        await invalidation.publish(user_key(current_user.id))
+        
+        # Return response in camelCase format
+        return await idempotency.save(
+            OnboardingResponseSchema.from_model(onboarding_response),
+            status_code=status.HTTP_201_CREATED
         )
-    
-    # Return response in camelCase format
-    return OnboardingResponseSchema(
-        id=str(onboarding_response.id),
-        userId=str(onboarding_response.user_id),
-        childAgeRange=onboarding_response.child_age_range,
-        diagnosisStatus=onboarding_response.diagnosis_status,
-        primaryConcern=onboarding_response.primary_concern,
-        recommendedStageId=onboarding_response.recommended_stage_id,
-        createdAt=onboarding_response.created_at,
-        updatedAt=onboarding_response.updated_at
-    )
 
 
 @router.get("", response_model=OnboardingResponseSchema)
@@ -127,13 +137,4 @@ async def get_onboarding(
     onboarding_response = OnboardingResponse.from_mongo(onboarding_data)
     
     # Return response in camelCase format
-    return OnboardingResponseSchema(
-        id=str(onboarding_response.id),
-        userId=str(onboarding_response.user_id),
-        childAgeRange=onboarding_response.child_age_range,
-        diagnosisStatus=onboarding_response.diagnosis_status,
-        primaryConcern=onboarding_response.primary_concern,
-        recommendedStageId=onboarding_response.recommended_stage_id,
-        createdAt=onboarding_response.created_at,
-        updatedAt=onboarding_response.updated_at
-    )
\ No newline at end of file
+    return OnboardingResponseSchema.from_model(onboarding_response)
\ No newline at end of file
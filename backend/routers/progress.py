@@ -2,13 +2,32 @@
 Progress router - handles user progress tracking for milestones.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
 from database import get_database
 from models.user import User
 from models.journey_history import JourneySnapshot
-from dependencies.auth import get_current_user
+from schemas.progress import BatchProgressRequest
+from dependencies.auth import (
+    get_current_user, get_current_user_id, get_current_user_id_from_header_or_query,
+    credentials_exception, active_user_filter
+)
+from config import settings
+from utils.activity import MAX_DAYS, get_daily_activity
+from utils.archive import read_history
+from utils import invalidation
+from utils.idempotency import idempotent
+from utils.progress_stream import progress_channel, progress_events, publish_progress_event
+from utils.pubsub import get_pubsub
+from utils.user_cache import user_key
+from utils.progress import (
+    get_milestone_ids_by_stage, resolve_milestones, calculate_progress, calculate_stage_progress,
+    stage_counts_expression, backfill_stage_counters
+)
 
 router = APIRouter(prefix="/api/v1/progress", tags=["progress"])
 
@@ -16,112 +35,113 @@ router = APIRouter(prefix="/api/v1/progress", tags=["progress"])
 @router.post("/milestones/{milestone_id}/toggle", response_model=dict)
 async def toggle_milestone_completion(
     milestone_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Toggle completion status for a milestone.
     Adds milestone to completed_milestones if not present, removes if present.
     Also saves a journey snapshot to track the user's progress history.
     
+    A retry with the same Idempotency-Key returns the original response
+    instead of toggling the milestone back.
+    
     Args:
-        milestone_id: The milestone ID (can be ObjectId or string identifier)
+        milestone_id: The milestone ID, slug or frontend milestone ID (e.g. "m1-3")
         current_user: The authenticated user
+        idempotency_key: Optional Idempotency-Key header
     
     Returns:
-        Updated completion status and message
+        Updated completion status (under the milestone's canonical ID) and message
     
     Raises:
         HTTPException: 404 if milestone not found
     """
+    milestone = (await resolve_milestones(get_database(), [milestone_id])).get(milestone_id)
+    if milestone is None:
+        raise HTTPException(status_code=404, detail="Milestone not found")
+    
+    scope = f"{current_user.id}:toggle:{milestone['id']}"
+    async with idempotent(idempotency_key, scope) as idempotency:
+        if idempotency.replayed:
+            return idempotency.replay_response()
+        return await idempotency.save(await toggle_milestone(milestone, current_user))
+
+
+async def toggle_milestone(milestone: dict, current_user: User) -> dict:
+    """Toggle the resolved milestone for the user, save a journey snapshot and return the toggle response."""
     db = get_database()
-    milestones_collection = db["milestones"]
     users_collection = db["users"]
     journey_history_collection = db["journey_history"]
     
-    # Try to find milestone by ObjectId first, then by any field containing the ID
-    milestone = None
-    milestone_title = "Unknown Milestone"
-    stage_id = "unknown"
-    
-    if ObjectId.is_valid(milestone_id):
-        milestone = await milestones_collection.find_one({"_id": ObjectId(milestone_id)})
-        if milestone:
-            milestone_title = milestone.get("title", "Unknown Milestone")
-            stage_id = milestone.get("stage_id", "unknown")
-    
-    # If not found by ObjectId, this might be a frontend string ID
-    # For now, we'll just accept any string ID and track it
-    # In a production system, you'd want to validate against known milestone IDs
-    
-    # Get user's current completed milestones
-    user_doc = await users_collection.find_one({"_id": ObjectId(current_user.id)})
-    completed_milestones = user_doc.get("completed_milestones", [])
-    
-    # Toggle completion
-    is_completed = False
-    action = "uncompleted"
-    if milestone_id in completed_milestones:
-        # Remove from completed
-        completed_milestones.remove(milestone_id)
-        message = "Milestone marked as incomplete"
-    else:
-        # Add to completed
-        completed_milestones.append(milestone_id)
-        is_completed = True
-        action = "completed"
-        message = "Milestone marked as complete"
-    
-    # Calculate stage progress for the snapshot
-    all_milestones = await milestones_collection.find({}).to_list(length=None)
-    stage_progress = {}
-    stage_milestones = {}
-    
-    # Group milestones by stage
-    for ms in all_milestones:
-        ms_stage_id = ms["stage_id"]
-        ms_id_str = str(ms["_id"])
-        
-        if ms_stage_id not in stage_milestones:
-            stage_milestones[ms_stage_id] = []
-        stage_milestones[ms_stage_id].append(ms_id_str)
-    
-    # Calculate completion percentage for each stage
-    for s_id, ms_ids in stage_milestones.items():
-        total = len(ms_ids)
-        completed = sum(1 for mid in ms_ids if mid in completed_milestones)
-        percentage = round((completed / total * 100) if total > 0 else 0, 1)
+    milestone_id = milestone["id"]
+    stage_id = milestone["stage_id"]
+    
+    milestone_ids_by_stage = await get_milestone_ids_by_stage(db)
+    if current_user.stage_completed_counts is None:
+        await backfill_stage_counters(db, current_user.id, milestone_ids_by_stage)
+    
+    # Add or remove the milestone and adjust its stage counter in one conditional update.
+    # Try the change implied by the user as just loaded first; if a concurrent request
+    # got there first the filter won't match and the opposite change applies instead.
+    # Only catalog milestones count towards stage progress; frontend milestones are just recorded
+    counter = f"stage_completed_counts.{stage_id}" if milestone_id in milestone_ids_by_stage.get(stage_id, ()) else None
+    user_doc = None
+    completing_first = milestone_id not in current_user.completed_milestones
+    for completing in (completing_first, not completing_first):
+        if completing:
+            query = {**active_user_filter(current_user.id), "completed_milestones": {"$ne": milestone_id}}
+            update = {"$push": {"completed_milestones": milestone_id}}
+        else:
+            query = {**active_user_filter(current_user.id), "completed_milestones": milestone_id}
+            update = {"$pull": {"completed_milestones": milestone_id}}
+        update["$set"] = {"updated_at": datetime.now(timezone.utc)}
+        if counter:
+            update["$inc"] = {counter: 1 if completing else -1}
         
-        stage_progress[s_id] = {
-            "total_milestones": total,
-            "completed_milestones": completed,
-            "percentage": percentage
-        }
+        user_doc = await users_collection.find_one_and_update(
+            query,
+            update,
+            projection={"completed_milestones": 1, "stage_completed_counts": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if user_doc is not None:
+            break
+    
+    if user_doc is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await invalidation.publish(user_key(current_user.id))
+    
+    completed_milestones = user_doc["completed_milestones"]
+    is_completed = completing
+    action = "completed" if completing else "uncompleted"
+    message = "Milestone marked as complete" if completing else "Milestone marked as incomplete"
     
     # Create journey snapshot
     snapshot = JourneySnapshot(
         user_id=str(current_user.id),
         milestone_id=milestone_id,
         stage_id=stage_id,
-        milestone_title=milestone_title,
+        milestone_title=milestone["title"],
         action=action,
-        completed_milestones=completed_milestones.copy(),
+        completed_milestones=completed_milestones,
         total_milestones_completed=len(completed_milestones),
-        stage_progress=stage_progress
+        stage_progress=calculate_stage_progress(
+            completed_milestones, milestone_ids_by_stage, user_doc.get("stage_completed_counts")
+        )
     )
     
     # Save snapshot to journey history
     await journey_history_collection.insert_one(snapshot.to_dict())
     
-    # Update user document
-    await users_collection.update_one(
-        {"_id": ObjectId(current_user.id)},
-        {
-            "$set": {
-                "completed_milestones": completed_milestones,
-                "updated_at": datetime.now(timezone.utc)
-            }
-        }
-    )
+    await publish_progress_event(current_user.id, {
+        "type": "toggle",
+        "milestone_id": milestone_id,
+        "isComplete": is_completed,
+        "progress": calculate_progress(
+            completed_milestones, milestone_ids_by_stage, user_doc.get("stage_completed_counts")
+        )
+    })
     
     return {
         "milestone_id": milestone_id,
@@ -130,59 +150,191 @@ async def toggle_milestone_completion(
     }
 
 
+@router.post("/milestones/batch", response_model=dict)
+async def update_milestones_batch(
+    request: BatchProgressRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Mark several milestones complete or incomplete in one request.
+    
+    All operations are applied to completed_milestones in a single atomic
+    update, and a journey snapshot is saved (in one insert) for each
+    operation that changed a milestone's status.
+    
+    Args:
+        request: Operations to apply, in order
+        current_user: The authenticated user
+    
+    Returns:
+        Milestones that changed (by canonical ID) and the new progress summary (as GET /progress)
+    
+    Raises:
+        HTTPException: 404 if any milestone is not found; nothing is changed then
+    """
+    db = get_database()
+    
+    milestones = await resolve_milestones(db, [operation.milestone_id for operation in request.operations])
+    unknown = [operation.milestone_id for operation in request.operations if operation.milestone_id not in milestones]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Milestone not found: {', '.join(unknown)}")
+    
+    # Final desired state per milestone (by canonical ID); the last operation wins
+    desired = {}
+    for operation in request.operations:
+        milestone_id = milestones[operation.milestone_id]["id"]
+        desired.pop(milestone_id, None)
+        desired[milestone_id] = operation.completed
+    to_add = [milestone_id for milestone_id, completed in desired.items() if completed]
+    to_remove = [milestone_id for milestone_id, completed in desired.items() if not completed]
+    
+    # Remove, then append milestones not already present, keeping completion order,
+    # and recount the per-stage counters from the resulting list
+    now = datetime.now(timezone.utc)
+    milestone_ids_by_stage = await get_milestone_ids_by_stage(db)
+    user_doc = await db["users"].find_one_and_update(
+        active_user_filter(current_user.id),
+        [{"$set": {
+            "completed_milestones": {"$let": {
+                "vars": {"kept": {"$filter": {
+                    "input": {"$ifNull": ["$completed_milestones", []]},
+                    "cond": {"$not": [{"$in": ["$$this", to_remove]}]}
+                }}},
+                "in": {"$concatArrays": ["$$kept", {"$filter": {
+                    "input": to_add,
+                    "cond": {"$not": [{"$in": ["$$this", "$$kept"]}]}
+                }}]}
+            }},
+            "updated_at": now
+        }}, {"$set": {
+            "stage_completed_counts": stage_counts_expression(milestone_ids_by_stage)
+        }}],
+        projection={"completed_milestones": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if user_doc is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await invalidation.publish(user_key(current_user.id))
+    
+    # Replay the changes against the previous state to build one snapshot per change
+    completed_milestones = list(user_doc.get("completed_milestones", []))
+    changed = [
+        milestone_id for milestone_id, completed in desired.items()
+        if completed != (milestone_id in completed_milestones)
+    ]
+    milestones_by_id = {milestone["id"]: milestone for milestone in milestones.values()}
+    
+    snapshots = []
+    for index, milestone_id in enumerate(changed):
+        if desired[milestone_id]:
+            completed_milestones.append(milestone_id)
+        else:
+            completed_milestones.remove(milestone_id)
+        snapshots.append(JourneySnapshot(
+            user_id=str(current_user.id),
+            milestone_id=milestone_id,
+            stage_id=milestones_by_id[milestone_id]["stage_id"],
+            milestone_title=milestones_by_id[milestone_id]["title"],
+            action="completed" if desired[milestone_id] else "uncompleted",
+            completed_milestones=completed_milestones.copy(),
+            total_milestones_completed=len(completed_milestones),
+            stage_progress=calculate_stage_progress(completed_milestones, milestone_ids_by_stage),
+            # History is ordered by timestamp, which MongoDB stores to the millisecond
+            timestamp=now + timedelta(milliseconds=index)
+        ).to_dict())
+    
+    if snapshots:
+        await db["journey_history"].insert_many(snapshots, ordered=False)
+    
+    response = {
+        "changed": [{"milestone_id": milestone_id, "isComplete": desired[milestone_id]} for milestone_id in changed],
+        "progress": calculate_progress(completed_milestones, milestone_ids_by_stage)
+    }
+    if changed:
+        await publish_progress_event(current_user.id, {"type": "batch", **response})
+    return response
+
+
 @router.get("", response_model=dict)
-async def get_user_progress(current_user: User = Depends(get_current_user)):
+async def get_user_progress(user_id: ObjectId = Depends(get_current_user_id)):
     """
     Get current user's progress including completed milestone IDs and percentage per stage.
     
+    Reads only the progress fields of the user document; per-stage counts
+    are stored on it and totals come from the catalog.
+    
     Args:
-        current_user: The authenticated user
+        user_id: The authenticated user's id
     
     Returns:
         Progress data with completed milestones and stage completion percentages
     """
     db = get_database()
-    users_collection = db["users"]
-    milestones_collection = db["milestones"]
     
-    # Get user's completed milestones
-    user_doc = await users_collection.find_one({"_id": ObjectId(current_user.id)})
-    completed_milestone_ids = user_doc.get("completed_milestones", [])
+    user_doc = await db["users"].find_one(
+        active_user_filter(user_id),
+        {"_id": 0, "completed_milestones": 1, "stage_completed_counts": 1}
+    )
+    if user_doc is None:
+        raise credentials_exception()
+    
+    milestone_ids_by_stage = await get_milestone_ids_by_stage(db)
+    return calculate_progress(
+        user_doc.get("completed_milestones", []),
+        milestone_ids_by_stage,
+        user_doc.get("stage_completed_counts")
+    )
+
+
+@router.get("/stream")
+async def stream_progress(user_id: ObjectId = Depends(get_current_user_id_from_header_or_query)):
+    """
+    Push progress changes to the client as Server-Sent Events.
     
-    # Get all milestones grouped by stage
-    all_milestones = await milestones_collection.find({}).to_list(length=None)
+    Sends the current progress as soon as the stream opens, then a `progress`
+    event whenever a toggle, batch update or reset (from any device) changes
+    it, and a heartbeat comment while idle. Browsers' EventSource cannot send
+    headers, so the token may be passed as `?token=`.
     
-    # Calculate progress per stage
-    stage_progress = {}
-    stage_milestones = {}
+    Args:
+        user_id: The authenticated user's id
     
-    # Group milestones by stage
-    for milestone in all_milestones:
-        stage_id = milestone["stage_id"]
-        milestone_id_str = str(milestone["_id"])
-        
-        if stage_id not in stage_milestones:
-            stage_milestones[stage_id] = []
-        stage_milestones[stage_id].append(milestone_id_str)
-    
-    # Calculate completion percentage for each stage
-    for stage_id, milestone_ids in stage_milestones.items():
-        total = len(milestone_ids)
-        completed = sum(1 for mid in milestone_ids if mid in completed_milestone_ids)
-        percentage = round((completed / total * 100) if total > 0 else 0, 1)
-        
-        stage_progress[stage_id] = {
-            "total_milestones": total,
-            "completed_milestones": completed,
-            "percentage": percentage
-        }
+    Returns:
+        text/event-stream response
     
-    return {
-        "completed_milestone_ids": completed_milestone_ids,
-        "stage_progress": stage_progress,
-        "total_completed": len(completed_milestone_ids),
-        "total_milestones": len(all_milestones)
-    }
+    Raises:
+        HTTPException: 429 if the user already has too many streams open
+    """
+    db = get_database()
+    pubsub = get_pubsub()
+    channel = progress_channel(user_id)
+    if pubsub.subscriber_count(channel) >= settings.progress_stream_max_connections:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many open progress streams",
+            headers={"Retry-After": "30"}
+        )
+    
+    # Subscribe before reading the current progress so no change falls between the two
+    subscription = pubsub.subscribe(channel)
+    user_doc = await db["users"].find_one(
+        active_user_filter(user_id),
+        {"_id": 0, "completed_milestones": 1, "stage_completed_counts": 1}
+    )
+    if user_doc is None:
+        pubsub.unsubscribe(subscription)
+        raise credentials_exception()
+    
+    progress = calculate_progress(
+        user_doc.get("completed_milestones", []),
+        await get_milestone_ids_by_stage(db),
+        user_doc.get("stage_completed_counts")
+    )
+    return StreamingResponse(
+        progress_events(subscription, progress),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.delete("", response_model=dict)
@@ -196,20 +348,33 @@ async def reset_progress(current_user: User = Depends(get_current_user)):
     
     Returns:
         Success message
+    
+    Raises:
+        HTTPException: 404 if the account has been deleted
     """
     db = get_database()
     users_collection = db["users"]
     
     # Clear completed milestones
-    await users_collection.update_one(
-        {"_id": ObjectId(current_user.id)},
+    result = await users_collection.update_one(
+        active_user_filter(current_user.id),
         {
             "$set": {
                 "completed_milestones": [],
+                "stage_completed_counts": {},
                 "updated_at": datetime.now(timezone.utc)
             }
         }
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    await invalidation.publish(user_key(current_user.id))
+    
+    await publish_progress_event(current_user.id, {
+        "type": "reset",
+        "progress": calculate_progress([], await get_milestone_ids_by_stage(db), {})
+    })
     
     return {
         "message": "All progress has been reset",
@@ -220,6 +385,8 @@ async def reset_progress(current_user: User = Depends(get_current_user)):
 @router.get("/history", response_model=dict)
 async def get_journey_history(
     limit: int = 50,
+    since: Optional[datetime] = Query(None, description="Only entries at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only entries at or before this time"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -227,20 +394,17 @@ async def get_journey_history(
     
     Args:
         limit: Maximum number of history entries to return (default: 50)
+        since: Optional start of the time range (ISO 8601)
+        until: Optional end of the time range (ISO 8601)
         current_user: The authenticated user
     
     Returns:
         List of journey snapshots ordered by most recent first
     """
-    db = get_database()
-    journey_history_collection = db["journey_history"]
-    
-    # Get user's journey history, sorted by most recent first
-    history_cursor = journey_history_collection.find(
-        {"user_id": str(current_user.id)}
-    ).sort("timestamp", -1).limit(limit)
-    
-    history = await history_cursor.to_list(length=limit)
+    # Get user's journey history, sorted by most recent first; older entries come from the archive
+    history = await read_history(
+        get_database(), {"user_id": str(current_user.id)}, limit=limit, since=since, until=until
+    )
     
     # Convert ObjectIds to strings for JSON serialization
     for entry in history:
@@ -253,9 +417,32 @@ async def get_journey_history(
     }
 
 
+@router.get("/activity", response_model=dict)
+async def get_activity(
+    days: int = Query(30, ge=1, le=MAX_DAYS),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the user's milestone activity per UTC day, for charting progress over time.
+    
+    Read from the daily activity rollups, so the most recent changes can take
+    up to ACTIVITY_ROLLUP_SECONDS to appear.
+    
+    Args:
+        days: Number of days up to and including today (default: 30)
+        current_user: The authenticated user
+    
+    Returns:
+        One entry per day, oldest first, with completed/uncompleted counts in total and by stage
+    """
+    return {"days": await get_daily_activity(get_database(), str(current_user.id), days)}
+
+
 @router.get("/history/milestone/{milestone_id}", response_model=dict)
 async def get_milestone_history(
     milestone_id: str,
+    since: Optional[datetime] = Query(None, description="Only entries at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only entries at or before this time"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -264,23 +451,23 @@ async def get_milestone_history(
     
     Args:
         milestone_id: The milestone ID to get history for
+        since: Optional start of the time range (ISO 8601)
+        until: Optional end of the time range (ISO 8601)
         current_user: The authenticated user
     
     Returns:
         List of journey snapshots for this specific milestone
     """
-    db = get_database()
-    journey_history_collection = db["journey_history"]
-    
-    # Get history for this specific milestone
-    history_cursor = journey_history_collection.find(
+    # Get history for this specific milestone, including archived entries
+    history = await read_history(
+        get_database(),
         {
             "user_id": str(current_user.id),
             "milestone_id": milestone_id
-        }
-    ).sort("timestamp", -1)
-    
-    history = await history_cursor.to_list(length=None)
+        },
+        since=since,
+        until=until
+    )
     
     # Convert ObjectIds to strings for JSON serialization
     for entry in history:
@@ -1,13 +1,39 @@
-from fastapi import APIRouter, HTTPException, Query
+import re
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
 from database import get_database
 from models.resource import Resource
+from utils.catalog import get_catalog
 
 router = APIRouter(prefix="/api/v1/resources", tags=["resources"])
 
 
+def filter_resources(resources: list[dict], category: Optional[str], search: Optional[str]) -> list[dict]:
+    """
+    Apply the category and search filters to in-memory catalog resources.
+    
+    Mirrors the MongoDB query used when the catalog is not loaded: exact
+    category match and a case-insensitive substring search over title,
+    description and tags. The search is matched literally, never as a regex.
+    """
+    if category:
+        resources = [resource for resource in resources if resource["category"] == category]
+    
+    if search:
+        needle = search.lower()
+        resources = [
+            resource for resource in resources
+            if needle in resource["title"].lower()
+            or needle in resource["description"].lower()
+            or any(needle in tag.lower() for tag in resource["tags"])
+        ]
+    
+    return resources
+
+
 @router.get("")
 async def get_resources(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search in title, description, and tags")
 ):
@@ -18,6 +44,17 @@ async def get_resources(
     - category: Filter by exact category match (e.g., "Diagnosis", "IEP")
     - search: Case-insensitive keyword search across title, description, and tags
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        # Searches are open-ended, so only the full list and each category are precompressed
+        if search:
+            return filter_resources(catalog.resources, category, search)
+        if category:
+            if category not in catalog.resources_by_category:
+                return []
+            return catalog.response(request, f"resources:{category}", catalog.resources_by_category[category])
+        return catalog.response(request, "resources:", catalog.resources)
+    
     db = get_database()
     resources_collection = db["resources"]
     
@@ -30,8 +67,8 @@ async def get_resources(
     
     # Add search filter if provided
     if search:
-        # Case-insensitive regex search across title, description, and tags
-        search_regex = {"$regex": search, "$options": "i"}
+        # Case-insensitive substring search across title, description, and tags
+        search_regex = {"$regex": re.escape(search), "$options": "i"}
         query_filter["$or"] = [
             {"title": search_regex},
             {"description": search_regex},
@@ -49,13 +86,20 @@ async def get_resources(
 
 
 @router.get("/{resource_id}")
-async def get_resource(resource_id: str):
+async def get_resource(resource_id: str, request: Request):
     """
     Get a specific resource by ID.
     
     Path Parameters:
     - resource_id: The unique identifier of the resource
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        resource = catalog.resources_by_id.get(resource_id)
+        if resource is None:
+            raise HTTPException(status_code=404, detail=f"Resource with id '{resource_id}' not found")
+        return catalog.response(request, f"resource:{resource_id}", resource)
+    
     db = get_database()
     resources_collection = db["resources"]
     
@@ -2,47 +2,41 @@
 Stages router - handles journey stage endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from database import get_database
-from models.stage import Stage
+from utils.catalog import get_catalog, parse_stage_key
+from utils.projections import STAGE_RESPONSE
 
 router = APIRouter(prefix="/api/v1/stages", tags=["stages"])
 
 
 @router.get("", response_model=list[dict])
-async def list_stages():
+async def list_stages(request: Request):
     """
     Get all journey stages, sorted by order.
     
     Returns:
         List of all stages with their details
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        return catalog.response(request, "stages", catalog.stages)
+    
     db = get_database()
     stages_collection = db["stages"]
     
-    # Fetch all stages sorted by order
-    cursor = stages_collection.find({}).sort("order", 1)
-    stages = await cursor.to_list(length=None)
-    
-    # Convert ObjectId to string for JSON serialization
-    result = []
-    for stage in stages:
-        stage_dict = Stage.from_mongo(stage).model_dump(by_alias=True)
-        # Convert _id to id for frontend
-        if "_id" in stage_dict:
-            stage_dict["id"] = stage_dict.pop("_id")
-        result.append(stage_dict)
-    
-    return result
+    # Fetch all stages sorted by order, already shaped for the response
+    cursor = stages_collection.aggregate([{"$sort": {"order": 1}}, STAGE_RESPONSE])
+    return await cursor.to_list(length=None)
 
 
 @router.get("/{stage_id}", response_model=dict)
-async def get_stage(stage_id: str):
+async def get_stage(stage_id: str, request: Request):
     """
     Get details of a specific stage.
     
     Args:
-        stage_id: The stage identifier (e.g., "S1", "S2")
+        stage_id: The stage key (e.g., "S1" or "s1") or the stage's MongoDB ObjectId
     
     Returns:
         Stage details
@@ -50,38 +44,23 @@ async def get_stage(stage_id: str):
     Raises:
         HTTPException: 404 if stage not found
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        key = catalog.canonical_stage_key(stage_id)
+        if key is None:
+            raise HTTPException(status_code=404, detail="Stage not found")
+        return catalog.response(request, f"stage:{key}", catalog.stages_by_key[key])
+    
     db = get_database()
     stages_collection = db["stages"]
     
-    # Find stage by title matching the stage_id pattern
-    # Stage IDs in seed data are like "S1", "S2", etc.
-    # We need to find by order or by a custom field
-    # For now, let's search by order (S1 = order 1, S2 = order 2, etc.)
+    stages = []
+    match = parse_stage_key(stage_id)
+    if match is not None:
+        cursor = stages_collection.aggregate([{"$match": match}, {"$limit": 1}, STAGE_RESPONSE])
+        stages = await cursor.to_list(length=1)
     
-    # Try to extract order from stage_id (e.g., "S1" -> 1)
-    try:
-        if stage_id.startswith("S"):
-            order = int(stage_id[1:])
-            stage = await stages_collection.find_one({"order": order})
-        else:
-            # If not in S# format, try to find by _id
-            from bson import ObjectId
-            if ObjectId.is_valid(stage_id):
-                stage = await stages_collection.find_one({"_id": ObjectId(stage_id)})
-            else:
-                stage = None
-    except (ValueError, IndexError):
-        stage = None
-    
-    if not stage:
+    if not stages:
         raise HTTPException(status_code=404, detail="Stage not found")
     
-    # Convert to Stage model and then to dict
-    stage_obj = Stage.from_mongo(stage)
-    stage_dict = stage_obj.model_dump(by_alias=True)
-    
-    # Convert _id to id for frontend
-    if "_id" in stage_dict:
-        stage_dict["id"] = stage_dict.pop("_id")
-    
-    return stage_dict
\ No newline at end of file
+    return stages[0]
\ No newline at end of file
@@ -2,20 +2,43 @@
 Users router - handles user profile management.
 """
 
+import asyncio
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Literal
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from schemas.user import UpdateProfileRequest, ChangePasswordRequest, MessageResponse
 from schemas.auth import UserResponse
-from models.user import User
+from models.user import User, normalize_email
 from utils.security import hash_password, verify_password
 from dependencies.auth import get_current_user
+from utils import invalidation, known_emails
+from utils.account_deletion import mark_deleted
+from utils.progress_stream import publish_progress_event
+from utils.export import export_records, stream_ndjson, stream_zip
+from utils.rate_limit import get_rate_limiter
+from utils.user_cache import user_key
+from config import settings
 from database import get_database
 
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 
+# Exports this worker is streaming; a slot is held from the first chunk until the body ends
+_export_slots = asyncio.Semaphore(settings.export_max_concurrent)
+
+
+async def _holding_export_slot(body):
+    """Stream `body` while holding an export slot; requests that raced past the check wait for one."""
+    async with _export_slots:
+        async for chunk in body:
+            yield chunk
+
 
 @router.get("/me", response_model=UserResponse, response_model_by_alias=True)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
@@ -46,7 +69,7 @@ async def update_user_profile(
     Update user profile (name and/or email).
     
     - Updates user's name and/or email
-    - Validates email format and uniqueness (if changed)
+    - Validates email format; the unique email index enforces uniqueness
     - Returns updated user object
     
     Args:
@@ -75,32 +98,34 @@ async def update_user_profile(
     if request.name is not None:
         update_data["name"] = request.name
     
-    # Update email if provided and validate uniqueness
+    # Update email if provided and different from current
+    new_email = None
     if request.email is not None:
-        # Check if email is different from current
-        if request.email != current_user.email:
-            # Check if new email already exists (excluding current user)
-            existing_user = await users_collection.find_one({
-                "email": request.email,
-                "_id": {"$ne": ObjectId(current_user.id)}
-            })
-            
-            if existing_user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered"
-                )
-            
-            update_data["email"] = request.email
-    
-    # Update user document
-    await users_collection.update_one(
-        {"_id": ObjectId(current_user.id)},
-        {"$set": update_data}
-    )
+        new_email = normalize_email(request.email)
+        if new_email != normalize_email(current_user.email):
+            update_data["email"] = new_email
+    
+    # Update user document and return it in one round trip
+    try:
+        updated_user_data = await users_collection.find_one_and_update(
+            {"_id": ObjectId(current_user.id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        known_emails.remember(new_email)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    if "email" in update_data:
+        known_emails.forget(current_user.email)
+        known_emails.remember(new_email)
+        await invalidation.publish(user_key(current_user.id), f"email:{normalize_email(current_user.email)}")
+    else:
+        await invalidation.publish(user_key(current_user.id))
     
-    # Fetch updated user
-    updated_user_data = await users_collection.find_one({"_id": ObjectId(current_user.id)})
     updated_user = User.from_mongo(updated_user_data)
     
     return UserResponse(
@@ -162,5 +187,82 @@ async def change_user_password(
             }
         }
     )
+    await invalidation.publish(user_key(current_user.id))
+    
+    return MessageResponse(message="Password changed successfully")
+
+
+@router.get("/me/export")
+async def export_user_data(
+    format: Literal["ndjson", "zip"] = Query("ndjson", description="ndjson or zip of JSON files"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download everything stored about the current user.
+    
+    Includes the profile (without the password hash), all onboarding responses
+    and the full journey history, including archived months. The body is
+    streamed as it is read, so exports of any size use constant memory.
+    
+    - ndjson: one {"type": "<section>", "data": {...}} object per line
+    - zip: user.json, onboarding_responses.json and journey_history.json
+    
+    Args:
+        format: Output format
+        current_user: The authenticated user
+    
+    Returns:
+        Streaming attachment
+    
+    Raises:
+        HTTPException: 429 if the user exports too often or the server is busy with other exports
+    """
+    user_id = ObjectId(current_user.id)
+    if settings.rate_limit_enabled:
+        await get_rate_limiter().check("export", {"user": str(user_id)})
+    if _export_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many exports in progress. Please try again shortly.",
+            headers={"Retry-After": "30"}
+        )
+    
+    records = export_records(get_database(), user_id)
+    if format == "zip":
+        body, media_type = stream_zip(records), "application/zip"
+    else:
+        body, media_type = stream_ndjson(records), "application/x-ndjson"
+    
+    body = _holding_export_slot(body)
+    filename = f"pathways-export-{datetime.now(timezone.utc):%Y%m%d}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        # Runs after the body ends or the client disconnects; closing the body releases its slot
+        background=BackgroundTask(body.aclose)
+    )
+
+
+@router.delete("/me", response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED)
+async def delete_user_account(current_user: User = Depends(get_current_user)):
+    """
+    Delete the current user's account.
+    
+    The account is marked deleted immediately: its tokens stop working and
+    its email address can be used to sign up again. Onboarding responses,
+    journey history and the user document are purged in the background.
+    
+    Args:
+        current_user: The authenticated user
+    
+    Returns:
+        Confirmation message
+    """
+    if await mark_deleted(get_database(), ObjectId(current_user.id)) is not None:
+        known_emails.forget(current_user.email)
+        await invalidation.publish(user_key(current_user.id), f"email:{normalize_email(current_user.email)}")
+        # Close the account's open progress streams
+        await publish_progress_event(current_user.id, {"type": "account_deleted"})
     
-    return MessageResponse(message="Password changed successfully")
\ No newline at end of file
+    return MessageResponse(message="Account deleted. Your data will be removed shortly.")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from models.onboarding import ChildAgeRange, DiagnosisStatus, PrimaryConcern
+from models.onboarding import ChildAgeRange, DiagnosisStatus, PrimaryConcern, OnboardingResponse
 
 
 class OnboardingRequest(BaseModel):
@@ -56,4 +56,18 @@ class OnboardingResponseSchema(BaseModel):
                 "createdAt": "2024-01-01T00:00:00Z",
                 "updatedAt": "2024-01-01T00:00:00Z"
             }
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def from_model(cls, onboarding_response: OnboardingResponse) -> "OnboardingResponseSchema":
+        """Build the camelCase response from a stored onboarding response."""
+        return cls(
+            id=str(onboarding_response.id),
+            userId=str(onboarding_response.user_id),
+            childAgeRange=onboarding_response.child_age_range,
+            diagnosisStatus=onboarding_response.diagnosis_status,
+            primaryConcern=onboarding_response.primary_concern,
+            recommendedStageId=onboarding_response.recommended_stage_id,
+            createdAt=onboarding_response.created_at,
+            updatedAt=onboarding_response.updated_at
+        )
\ No newline at end of file
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+
+
+class MilestoneProgressOperation(BaseModel):
+    """Set one milestone's completion status."""
+    
+    milestone_id: str = Field(..., description="Milestone ID")
+    completed: bool = Field(..., description="True to mark complete, False to mark incomplete")
+
+
+class BatchProgressRequest(BaseModel):
+    """Request schema for updating several milestones at once."""
+    
+    operations: list[MilestoneProgressOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Operations applied in order; the last one wins for a repeated milestone"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "operations": [
+                    {"milestone_id": "64b7f0c2a1e4d3b2c1a09f87", "completed": True},
+                    {"milestone_id": "64b7f0c2a1e4d3b2c1a09f88", "completed": False}
+                ]
+            }
+        }
@@ -0,0 +1,219 @@
+"""
+Production launcher - runs N uvicorn workers under a pre-fork master.
+
+The master binds the listening socket, imports the app, reads the catalog
+bundle and loads the JWT/Argon2 backends once, then forks the workers so
+they share that state copy-on-write. Each worker runs its own event loop and
+MongoDB client (created in the app lifespan, after fork).
+
+    python3 server.py
+
+Signals to the master:
+- SIGTERM / SIGINT: stop workers gracefully, then exit
+- SIGHUP: replace every worker (new workers start before old ones stop)
+
+Workers that exit (crash, or WORKER_MAX_REQUESTS reached) are replaced.
+"""
+
+import gc
+import importlib.util
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import uvicorn
+
+from config import settings
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY if set, otherwise one worker per CPU available to this process."""
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def create_socket(host: str, port: int) -> socket.socket:
+    """Bind the listening socket shared by all workers."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload():
+    """Import the app and load read-only state in the master, before fork."""
+    from main import app
+    from utils.catalog import load_bundle
+    from utils.warmup import warm_up
+
+    if load_bundle() is None:
+        print("⚠ No catalog bundle to preload; workers will load the catalog from MongoDB")
+    warm_up()
+
+    # Move everything allocated so far out of the collector's reach, so that
+    # garbage collection in the workers doesn't write to (and copy) shared pages
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+class Master:
+    """Forks and supervises uvicorn worker processes."""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.num_workers = workers
+        self.workers: dict[int, int] = {}  # pid -> worker number
+        self.draining: dict[int, int] = {}  # pid -> worker number, for workers replaced by a reload
+        self.started: dict[int, float] = {}  # worker number -> spawn time
+        self.stopping = False
+        self.reload_requested = False
+        self.loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+        self.http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    def spawn(self, number: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = number
+            self.started[number] = time.monotonic()
+            return
+
+        # Worker process: restore default signal handling and let uvicorn install its own
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        max_requests = None
+        if settings.worker_max_requests > 0:
+            max_requests = settings.worker_max_requests + random.randint(0, settings.worker_max_requests_jitter)
+        config = uvicorn.Config(
+            self.app,
+            loop=self.loop,
+            http=self.http,
+            lifespan="on",
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=settings.worker_graceful_timeout,
+        )
+        server = uvicorn.Server(config)
+        exit_code = 1
+        try:
+            server.run(sockets=[self.sock])
+            # uvicorn returns normally when lifespan startup fails, without having started
+            exit_code = 0 if server.started else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            # Non-zero so reap() reports the failure
+            os._exit(exit_code)
+
+    def handle_stop(self, signum, _frame) -> None:
+        self.stopping = True
+
+    def handle_reload(self, _signum, _frame) -> None:
+        self.reload_requested = True
+
+    def reap(self) -> list[int]:
+        """
+        Collect exited workers and return the numbers of those to replace.
+        Draining workers are collected too, but not returned.
+        """
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            exit_code = os.waitstatus_to_exitcode(status)
+            number = self.workers.pop(pid, None)
+            if number is not None:
+                exited.append(number)
+                if not self.stopping and exit_code != 0:
+                    print(f"⚠ Worker {number} (pid {pid}) exited with status {exit_code}")
+                continue
+            number = self.draining.pop(pid, None)
+            # uvicorn re-raises the SIGTERM it drained on, so that is a clean exit here
+            if number is not None and exit_code not in (0, -signal.SIGTERM):
+                print(f"⚠ Replaced worker {number} (pid {pid}) exited with status {exit_code}")
+        return exited
+
+    def reload(self) -> None:
+        """Start a fresh set of workers, then gracefully stop the old ones."""
+        old_workers = list(self.workers)
+        for number in range(self.num_workers):
+            self.spawn(number)
+        for pid in old_workers:
+            self.kill(pid, signal.SIGTERM)
+            self.draining[pid] = self.workers.pop(pid)
+        print(f"✓ Replaced {len(old_workers)} workers")
+
+    def kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def stop(self) -> None:
+        """
+        Ask workers to finish in-flight requests, killing any still running after the timeout.
+        Workers draining after a reload already have their SIGTERM (a second one makes uvicorn
+        skip the graceful shutdown) and are waited for and killed with the rest.
+        """
+        for pid in self.workers:
+            self.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + settings.worker_graceful_timeout
+        while (self.workers or self.draining) and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in [*self.workers, *self.draining]:
+            self.kill(pid, signal.SIGKILL)
+        while self.workers or self.draining:
+            self.reap()
+            time.sleep(0.05)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+
+        print(f"✓ Starting {self.num_workers} workers (loop={self.loop}, http={self.http}) "
+              f"on {self.sock.getsockname()[0]}:{self.sock.getsockname()[1]}")
+        for number in range(self.num_workers):
+            self.spawn(number)
+
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload_requested = False
+                self.reload()
+            for number in self.reap():
+                if self.stopping:
+                    break
+                # Back off when a worker dies right after starting (e.g. MongoDB unreachable)
+                if time.monotonic() - self.started[number] < 1:
+                    time.sleep(1)
+                self.spawn(number)
+            time.sleep(0.2)
+
+        print("Stopping workers...")
+        self.stop()
+        print("✓ All workers stopped")
+
+
+def main() -> None:
+    sock = create_socket("0.0.0.0", settings.port)
+    app = preload()
+    Master(app, sock, worker_count()).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Test script for account data export and account deletion.
+
+This script tests:
+1. GET /api/v1/users/me/export in ndjson and zip format
+2. DELETE /api/v1/users/me (tokens revoked, email freed, progress writes rejected)
+
+Run this script after starting the backend server and seeding the database:
+    python test_account.py
+"""
+
+import io
+import json
+import zipfile
+from datetime import datetime
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000"
+API_BASE = f"{BASE_URL}/api/v1"
+
+TEST_PASSWORD = "TestPassword123!"
+
+
+def print_section(title: str):
+    """Print a formatted section header."""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_test(test_name: str, passed: bool, details: str = ""):
+    """Print test result."""
+    status = "✓ PASS" if passed else "✗ FAIL"
+    print(f"{status}: {test_name}")
+    if details:
+        print(f"  → {details}")
+
+
+def register(email: str) -> str:
+    """Register a test user and return its token."""
+    response = requests.post(f"{API_BASE}/auth/signup", json={"email": email, "password": TEST_PASSWORD})
+    if response.status_code == 201:
+        print(f"✓ User registered: {email}")
+        return response.json()["token"]
+
+    print(f"✗ Registration failed: {response.status_code} - {response.text}")
+    return None
+
+
+def create_activity(token: str) -> list[str]:
+    """Submit onboarding and complete two milestones. Returns the milestone ids."""
+    headers = {"Authorization": f"Bearer {token}"}
+    requests.post(
+        f"{API_BASE}/onboarding",
+        headers=headers,
+        json={"childAgeRange": "3-5y", "diagnosisStatus": "recent", "primaryConcern": "behavior"}
+    )
+    milestone_ids = [milestone["id"] for milestone in requests.get(f"{API_BASE}/milestones").json()[:2]]
+    for milestone_id in milestone_ids:
+        requests.post(f"{API_BASE}/progress/milestones/{milestone_id}/toggle", headers=headers)
+    return milestone_ids
+
+
+def test_export(token: str, email: str, milestone_ids: list[str]) -> bool:
+    """Both export formats hold the profile, onboarding responses and journey history."""
+    print_section("Data Export")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+
+    response = requests.get(f"{API_BASE}/users/me/export", headers=headers)
+    passed = (
+        response.status_code == 200
+        and response.headers["content-type"].startswith("application/x-ndjson")
+        and "attachment" in response.headers.get("content-disposition", "")
+    )
+    print_test("ndjson export is a download", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+    if response.status_code != 200:
+        print(f"  Response: {response.text}")
+        return False
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    sections = [record["type"] for record in records]
+    user = next((record["data"] for record in records if record["type"] == "user"), {})
+    history = [record["data"]["milestone_id"] for record in records if record["type"] == "journey_history"]
+    passed = (
+        sections[0] == "user"
+        and user.get("email") == email
+        and "password_hash" not in user
+        and sections.count("onboarding_responses") == 1
+        and history == milestone_ids
+    )
+    print_test(
+        "ndjson holds the profile (no password hash), onboarding and history, in order", passed,
+        f"Sections: {sorted(set(sections))}, history entries: {len(history)}"
+    )
+    all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/users/me/export", params={"format": "zip"}, headers=headers)
+    passed = response.status_code == 200 and response.headers["content-type"].startswith("application/zip")
+    print_test("zip export is a download", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+    if passed:
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        names = sorted(archive.namelist())
+        history = json.loads(archive.read("journey_history.json"))
+        passed = (
+            names == ["journey_history.json", "onboarding_responses.json", "user.json"]
+            and json.loads(archive.read("user.json"))["email"] == email
+            and [snapshot["milestone_id"] for snapshot in history] == milestone_ids
+        )
+        print_test("zip holds user.json, onboarding_responses.json and journey_history.json", passed, f"Files: {names}")
+        all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/users/me/export", params={"format": "xml"}, headers=headers)
+    passed = response.status_code == 422
+    print_test("Unknown format is rejected", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/users/me/export")
+    passed = response.status_code in (401, 403)
+    print_test("Export requires authentication", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    return all_passed
+
+
+def test_delete_account(token: str, email: str, milestone_ids: list[str]) -> bool:
+    """Deleting the account revokes its tokens, frees the email and blocks further writes."""
+    print_section("Account Deletion")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+
+    response = requests.delete(f"{API_BASE}/users/me", headers=headers)
+    passed = response.status_code == 202
+    print_test("Delete request is accepted", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/auth/me", headers=headers)
+    passed = response.status_code == 401
+    print_test("The account's token is rejected afterwards", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    response = requests.post(f"{API_BASE}/progress/milestones/{milestone_ids[0]}/toggle", headers=headers)
+    passed = response.status_code in (401, 404)
+    print_test("Progress writes are rejected afterwards", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    response = requests.post(f"{API_BASE}/auth/login", json={"email": email, "password": TEST_PASSWORD})
+    passed = response.status_code == 401
+    print_test("Login with the deleted account fails", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    new_token = register(email)
+    passed = new_token is not None
+    print_test("The email address can sign up again", passed)
+    all_passed &= passed
+    if new_token:
+        progress = requests.get(f"{API_BASE}/progress", headers={"Authorization": f"Bearer {new_token}"}).json()
+        passed = progress["total_completed"] == 0
+        print_test("The new account starts without the old progress", passed)
+        all_passed &= passed
+        requests.delete(f"{API_BASE}/users/me", headers={"Authorization": f"Bearer {new_token}"})
+
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 80)
+    print("  DATA EXPORT & ACCOUNT DELETION TEST SUITE")
+    print("=" * 80)
+
+    print_section("Authentication Setup")
+    email = f"account_test_{datetime.now().timestamp()}@example.com"
+    token = register(email)
+    if not token:
+        print("\n✗ Cannot run tests without authentication")
+        return
+    milestone_ids = create_activity(token)
+
+    results = {
+        "Data export": test_export(token, email, milestone_ids),
+        "Account deletion": test_delete_account(token, email, milestone_ids),
+    }
+
+    # Summary
+    print_section("Test Summary")
+    for name, passed in results.items():
+        print(f"{'✓' if passed else '✗'} {name}")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Direct checks for helper logic that needs no running server.
+
+This script tests:
+1. Rate limit parsing and the in-memory token bucket
+2. Accept-Encoding negotiation
+3. Deterministic seed ids and the detection of non-canonical stored milestone ids
+4. The median aggregation expression used by the cohort analytics
+
+Checks 3 and 4 run against MongoDB (MONGODB_URI) in a scratch database that
+is dropped afterwards:
+    MONGODB_URI=mongodb://localhost:27017/pathways_test python test_helpers.py
+"""
+
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config import settings
+from utils.analytics import median_expression
+from utils.compression import negotiate
+from utils.rate_limit import MemoryBackend, RateLimit
+from utils.seed_data import find_noncanonical_milestone_ids, stable_object_id
+
+SCRATCH_DATABASE = "pathways_helper_test"
+
+
+def print_section(title: str):
+    """Print a formatted section header."""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_test(test_name: str, passed: bool, details: str = ""):
+    """Print test result."""
+    status = "✓ PASS" if passed else "✗ FAIL"
+    print(f"{status}: {test_name}")
+    if details:
+        print(f"  → {details}")
+
+
+class FakeClock:
+    """A monotonic clock the test advances by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_rate_limits() -> bool:
+    print_section("Rate Limits")
+    all_passed = True
+
+    limit = RateLimit.parse("5/minute")
+    passed = limit.capacity == 5 and limit.period == 60 and abs(limit.refill_rate - 5 / 60) < 1e-9
+    print_test('RateLimit.parse("5/minute")', passed, repr(limit))
+    all_passed &= passed
+
+    passed = RateLimit.parse(" 20/hour ").period == 3600
+    print_test("Surrounding whitespace is ignored", passed)
+    all_passed &= passed
+
+    for value in ("5/fortnight", "5", "five/minute"):
+        try:
+            RateLimit.parse(value)
+            passed = False
+        except ValueError:
+            passed = True
+        print_test(f"RateLimit.parse({value!r}) is rejected", passed)
+        all_passed &= passed
+
+    clock = FakeClock()
+    backend = MemoryBackend(clock=clock)
+    limit = RateLimit.parse("3/minute")
+    waits = [await backend.take("login:ip:a", limit) for _ in range(4)]
+    passed = waits[:3] == [0, 0, 0] and abs(waits[3] - 20) < 1e-6
+    print_test("A full bucket allows `capacity` takes, then reports the wait", passed, f"Waits: {waits}")
+    all_passed &= passed
+
+    passed = await backend.take("login:ip:b", limit) == 0
+    print_test("Buckets are separate per key", passed)
+    all_passed &= passed
+
+    clock.now += 20
+    passed = await backend.take("login:ip:a", limit) == 0
+    print_test("A token is refilled after period / capacity", passed)
+    all_passed &= passed
+
+    clock.now += 3600
+    waits = [await backend.take("login:ip:a", limit) for _ in range(4)]
+    passed = waits[:3] == [0, 0, 0] and waits[3] > 0
+    print_test("Refill is capped at capacity", passed, f"Waits: {waits}")
+    all_passed &= passed
+
+    small = MemoryBackend(max_keys=2, clock=clock)
+    for key in ("a", "b", "c"):
+        await small.take(key, limit)
+    passed = list(small.buckets) == ["b", "c"]
+    print_test("Least recently used keys are evicted beyond max_keys", passed, f"Keys: {list(small.buckets)}")
+    all_passed &= passed
+
+    return all_passed
+
+
+def test_negotiate() -> bool:
+    print_section("Accept-Encoding Negotiation")
+    all_passed = True
+
+    cases = [
+        ("", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.1, gzip;q=0.5", "gzip"),
+        ("identity", None),
+        ("GZIP", "gzip"),
+        ("br;q=abc, gzip", "gzip"),
+    ]
+    for header, expected in cases:
+        result = negotiate(header)
+        passed = result == expected
+        print_test(f"negotiate({header!r}) == {expected!r}", passed, "" if passed else f"Got {result!r}")
+        all_passed &= passed
+
+    return all_passed
+
+
+async def test_seed_ids(db) -> bool:
+    print_section("Seed IDs")
+    all_passed = True
+
+    first = stable_object_id("milestone", "s1-responds-to-name")
+    passed = first == stable_object_id("milestone", "s1-responds-to-name")
+    print_test("stable_object_id is deterministic", passed, str(first))
+    all_passed &= passed
+
+    passed = len({first, stable_object_id("milestone", "s1-eye-contact"), stable_object_id("stage", "s1-responds-to-name")}) == 3
+    print_test("Different keys and namespaces give different ids", passed)
+    all_passed &= passed
+
+    milestones = [
+        {"_id": stable_object_id("milestone", "s1-responds-to-name"), "slug": "s1-responds-to-name"},
+        {"_id": stable_object_id("milestone", "s1-eye-contact"), "slug": "s1-eye-contact"},
+    ]
+    canonical = [str(milestone["_id"]) for milestone in milestones]
+    await db["users"].insert_many([
+        {"completed_milestones": [canonical[0], "S1-EYE-CONTACT", "m1-1"]},
+        {"completed_milestones": [canonical[1].upper(), "unknown-milestone"]},
+    ])
+    await db["journey_history"].insert_many([
+        {"milestone_id": "s1-responds-to-name"},
+        {"milestone_id": canonical[1]},
+    ])
+    id_map = await find_noncanonical_milestone_ids(db, milestones)
+    expected = {
+        "S1-EYE-CONTACT": canonical[1],
+        canonical[1].upper(): canonical[1],
+        "s1-responds-to-name": canonical[0],
+    }
+    passed = id_map == expected
+    print_test(
+        "Slugs and upper-case ids map to the milestone id; canonical, frontend and unknown ids are left alone",
+        passed, f"Map: {id_map}"
+    )
+    all_passed &= passed
+
+    return all_passed
+
+
+async def test_median_expression(db) -> bool:
+    print_section("Median Expression")
+    all_passed = True
+
+    cases = [([1.0], 1.0), ([1.0, 3.0], 2.0), ([1.0, 2.0, 10.0], 2.0), ([1.0, 2.0, 3.0, 10.0], 2.5)]
+    await db["medians"].insert_many([{"case": index, "values": values} for index, (values, _) in enumerate(cases)])
+    results = await db["medians"].aggregate([
+        {"$project": {"case": 1, "median": median_expression("$values")}},
+        {"$sort": {"case": 1}}
+    ]).to_list(length=None)
+    for (values, expected), result in zip(cases, results):
+        passed = result["median"] == expected
+        print_test(f"median of {values} == {expected}", passed, "" if passed else f"Got {result['median']}")
+        all_passed &= passed
+
+    return all_passed
+
+
+async def main():
+    """Run all tests."""
+    print("\n" + "=" * 80)
+    print("  HELPER LOGIC TEST SUITE")
+    print("=" * 80)
+
+    results = {
+        "Rate limits": await test_rate_limits(),
+        "Accept-Encoding negotiation": test_negotiate(),
+    }
+
+    client = AsyncIOMotorClient(settings.mongodb_uri, serverSelectionTimeoutMS=5000)
+    db = client[SCRATCH_DATABASE]
+    await client.drop_database(SCRATCH_DATABASE)
+    try:
+        results["Seed IDs"] = await test_seed_ids(db)
+        results["Median expression"] = await test_median_expression(db)
+    finally:
+        await client.drop_database(SCRATCH_DATABASE)
+        client.close()
+
+    # Summary
+    print_section("Test Summary")
+    for name, passed in results.items():
+        print(f"{'✓' if passed else '✗'} {name}")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
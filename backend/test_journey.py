@@ -26,7 +26,7 @@ async def test_journey_endpoints():
         # Step 1: Register a test user
         print("\n1. Registering test user...")
         register_response = await client.post(
-            f"{BASE_URL}/api/v1/auth/register",
+            f"{BASE_URL}/api/v1/auth/signup",
             json={
                 "email": TEST_EMAIL,
                 "password": TEST_PASSWORD
@@ -35,7 +35,7 @@ async def test_journey_endpoints():
         
         if register_response.status_code == 201:
             print(f"✓ User registered: {TEST_EMAIL}")
-            token = register_response.json()["access_token"]
+            token = register_response.json()["token"]
         else:
             print(f"✗ Registration failed: {register_response.status_code}")
             print(f"  Response: {register_response.text}")
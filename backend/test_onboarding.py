@@ -49,7 +49,7 @@ def register_and_login() -> str:
     }
     
     try:
-        response = requests.post(f"{API_BASE}/auth/register", json=register_data)
+        response = requests.post(f"{API_BASE}/auth/signup", json=register_data)
         if response.status_code == 201:
             print("✓ User registered successfully")
         elif response.status_code == 400:
@@ -67,7 +67,7 @@ def register_and_login() -> str:
     
     response = requests.post(f"{API_BASE}/auth/login", json=login_data)
     if response.status_code == 200:
-        token = response.json()["accessToken"]
+        token = response.json()["token"]
         print("✓ Login successful")
         return token
     else:
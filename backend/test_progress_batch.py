@@ -0,0 +1,256 @@
+"""
+Test script for batch progress updates, Idempotency-Key replays and milestone ids.
+
+This script tests:
+1. POST /api/v1/progress/milestones/batch (last operation wins, one snapshot per change)
+2. Idempotency-Key replays of toggle, onboarding and signup
+3. The milestone id forms accepted by GET /api/v1/milestones/{milestone_id}
+
+Run this script after starting the backend server and seeding the database:
+    python test_progress_batch.py
+"""
+
+import uuid
+from datetime import datetime
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000"
+API_BASE = f"{BASE_URL}/api/v1"
+
+TEST_PASSWORD = "TestPassword123!"
+
+
+def print_section(title: str):
+    """Print a formatted section header."""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_test(test_name: str, passed: bool, details: str = ""):
+    """Print test result."""
+    status = "✓ PASS" if passed else "✗ FAIL"
+    print(f"{status}: {test_name}")
+    if details:
+        print(f"  → {details}")
+
+
+def register() -> str:
+    """Register a fresh test user and return its token."""
+    print_section("Authentication Setup")
+
+    email = f"batch_test_{datetime.now().timestamp()}@example.com"
+    response = requests.post(f"{API_BASE}/auth/signup", json={"email": email, "password": TEST_PASSWORD})
+    if response.status_code == 201:
+        print(f"✓ User registered: {email}")
+        return response.json()["token"]
+
+    print(f"✗ Registration failed: {response.status_code} - {response.text}")
+    return None
+
+
+def get_milestones() -> list[dict]:
+    response = requests.get(f"{API_BASE}/milestones")
+    response.raise_for_status()
+    return response.json()
+
+
+def test_batch_updates(token: str, milestones: list[dict]) -> bool:
+    """Apply batches and check the changed list, stored progress and journey snapshots."""
+    print_section("Batch Progress Updates")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+    first, second, third = milestones[0]["id"], milestones[1]["id"], milestones[2]["id"]
+
+    # Last operation wins: `first` ends up complete, `second` ends up incomplete
+    response = requests.post(
+        f"{API_BASE}/progress/milestones/batch",
+        headers=headers,
+        json={"operations": [
+            {"milestone_id": first, "completed": False},
+            {"milestone_id": second, "completed": True},
+            {"milestone_id": first, "completed": True},
+            {"milestone_id": second, "completed": False},
+            {"milestone_id": third, "completed": True}
+        ]}
+    )
+    passed = response.status_code == 200
+    print_test("Batch request succeeds", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+    if not passed:
+        print(f"  Response: {response.text}")
+        return False
+
+    data = response.json()
+    changed = {entry["milestone_id"]: entry["isComplete"] for entry in data["changed"]}
+    passed = changed == {first: True, third: True}
+    print_test("Only milestones whose final state differs are reported", passed, f"Changed: {changed}")
+    all_passed &= passed
+
+    passed = data["progress"]["total_completed"] == 2
+    print_test("Progress summary reflects the batch", passed, f"Total completed: {data['progress']['total_completed']}")
+    all_passed &= passed
+
+    progress = requests.get(f"{API_BASE}/progress", headers=headers).json()
+    passed = progress["completed_milestone_ids"] == [first, third]
+    print_test("Stored progress matches, in completion order", passed, f"Completed: {progress['completed_milestone_ids']}")
+    all_passed &= passed
+
+    # One snapshot per change, each holding the progress as it was after that change
+    history = requests.get(f"{API_BASE}/progress/history", headers=headers).json()["history"]
+    snapshots = [(entry["milestone_id"], entry["action"], entry["completed_milestones"]) for entry in reversed(history)]
+    expected = [(first, "completed", [first]), (third, "completed", [first, third])]
+    passed = snapshots == expected
+    print_test("One journey snapshot per change, replayed in order", passed, f"Snapshots: {snapshots}")
+    all_passed &= passed
+
+    # A batch with an unknown milestone changes nothing
+    response = requests.post(
+        f"{API_BASE}/progress/milestones/batch",
+        headers=headers,
+        json={"operations": [
+            {"milestone_id": first, "completed": False},
+            {"milestone_id": "no-such-milestone", "completed": True}
+        ]}
+    )
+    progress = requests.get(f"{API_BASE}/progress", headers=headers).json()
+    passed = response.status_code == 404 and progress["completed_milestone_ids"] == [first, third]
+    print_test("Unknown milestone returns 404 and leaves progress unchanged", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    # Repeating the same batch changes nothing and adds no history
+    response = requests.post(
+        f"{API_BASE}/progress/milestones/batch",
+        headers=headers,
+        json={"operations": [{"milestone_id": first, "completed": True}]}
+    )
+    history_after = requests.get(f"{API_BASE}/progress/history", headers=headers).json()["history"]
+    passed = response.status_code == 200 and response.json()["changed"] == [] and len(history_after) == len(history)
+    print_test("A batch that changes nothing writes no snapshots", passed)
+    all_passed &= passed
+
+    return all_passed
+
+
+def test_idempotent_replays(token: str, milestones: list[dict]) -> bool:
+    """Retry toggle, onboarding and signup with the same Idempotency-Key."""
+    print_section("Idempotency-Key Replays")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+    milestone_id = milestones[3]["id"]
+
+    # Toggle: the retry replays the first response instead of toggling back
+    key_headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+    first = requests.post(f"{API_BASE}/progress/milestones/{milestone_id}/toggle", headers=key_headers)
+    retry = requests.post(f"{API_BASE}/progress/milestones/{milestone_id}/toggle", headers=key_headers)
+    progress = requests.get(f"{API_BASE}/progress", headers=headers).json()
+    passed = (
+        first.status_code == 200
+        and retry.status_code == 200
+        and retry.json() == first.json()
+        and retry.headers.get("Idempotent-Replayed") == "true"
+        and milestone_id in progress["completed_milestone_ids"]
+    )
+    print_test("Toggle retry replays the first response", passed, f"Replayed: {retry.headers.get('Idempotent-Replayed')}")
+    all_passed &= passed
+
+    # Onboarding: the same key with a different body is rejected
+    key_headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+    answers = {"childAgeRange": "0-18m", "diagnosisStatus": "none", "primaryConcern": "speech"}
+    first = requests.post(f"{API_BASE}/onboarding", headers=key_headers, json=answers)
+    retry = requests.post(f"{API_BASE}/onboarding", headers=key_headers, json=answers)
+    changed = requests.post(f"{API_BASE}/onboarding", headers=key_headers, json={**answers, "primaryConcern": "social"})
+    passed = (
+        first.status_code == 201
+        and retry.status_code == 201
+        and retry.json()["id"] == first.json()["id"]
+        and changed.status_code == 422
+    )
+    print_test(
+        "Onboarding retry replays; a different body with the same key gets 422", passed,
+        f"Statuses: {first.status_code}, {retry.status_code}, {changed.status_code}"
+    )
+    all_passed &= passed
+
+    # Signup: the retry returns the same user with a freshly issued token
+    key_headers = {"Idempotency-Key": str(uuid.uuid4())}
+    account = {"email": f"batch_signup_{datetime.now().timestamp()}@example.com", "password": TEST_PASSWORD}
+    first = requests.post(f"{API_BASE}/auth/signup", headers=key_headers, json=account)
+    retry = requests.post(f"{API_BASE}/auth/signup", headers=key_headers, json=account)
+    wrong_password = requests.post(
+        f"{API_BASE}/auth/signup", headers=key_headers, json={**account, "password": "SomethingElse123!"}
+    )
+    passed = (
+        first.status_code == 201
+        and retry.status_code == 201
+        and retry.json()["user"]["id"] == first.json()["user"]["id"]
+        and requests.get(f"{API_BASE}/auth/me", headers={"Authorization": f"Bearer {retry.json()['token']}"}).status_code == 200
+        and wrong_password.status_code == 422
+    )
+    print_test(
+        "Signup retry returns the same user with a working token", passed,
+        f"Statuses: {first.status_code}, {retry.status_code}, {wrong_password.status_code}"
+    )
+    all_passed &= passed
+
+    return all_passed
+
+
+def test_milestone_id_forms(milestones: list[dict]) -> bool:
+    """GET /milestones/{id} accepts ids, slugs and frontend ids in any case."""
+    print_section("Milestone ID Forms")
+    all_passed = True
+    milestone = milestones[0]
+
+    forms = [milestone["id"], milestone["id"].upper()]
+    if milestone.get("slug"):
+        forms.append(milestone["slug"])
+    for form in forms:
+        response = requests.get(f"{API_BASE}/milestones/{form}")
+        passed = response.status_code == 200 and response.json()["id"] == milestone["id"]
+        print_test(f"GET /milestones/{form}", passed, f"Status: {response.status_code}")
+        all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/milestones/M1-3")
+    passed = response.status_code == 200 and response.json()["id"] == "m1-3"
+    print_test("Frontend milestone id resolves", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/milestones/no-such-milestone")
+    passed = response.status_code == 404
+    print_test("Unknown milestone id returns 404", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 80)
+    print("  BATCH PROGRESS & IDEMPOTENCY TEST SUITE")
+    print("=" * 80)
+
+    token = register()
+    if not token:
+        print("\n✗ Cannot run tests without authentication")
+        return
+    milestones = get_milestones()
+
+    results = {
+        "Batch updates": test_batch_updates(token, milestones),
+        "Idempotent replays": test_idempotent_replays(token, milestones),
+        "Milestone ID forms": test_milestone_id_forms(milestones),
+    }
+
+    # Summary
+    print_section("Test Summary")
+    for name, passed in results.items():
+        print(f"{'✓' if passed else '✗'} {name}")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
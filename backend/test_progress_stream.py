@@ -0,0 +1,192 @@
+"""
+Test script for the journey bootstrap endpoint and the progress event stream.
+
+This script tests:
+1. GET /api/v1/journey/bootstrap (stages, milestones, progress and onboarding in one call)
+2. GET /api/v1/progress/stream (Server-Sent Events for toggles, batches and resets)
+
+Run this script after starting the backend server and seeding the database:
+    python test_progress_stream.py
+"""
+
+import json
+from datetime import datetime
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000"
+API_BASE = f"{BASE_URL}/api/v1"
+
+TEST_PASSWORD = "TestPassword123!"
+
+
+def print_section(title: str):
+    """Print a formatted section header."""
+    print("\n" + "=" * 80)
+    print(f"  {title}")
+    print("=" * 80)
+
+
+def print_test(test_name: str, passed: bool, details: str = ""):
+    """Print test result."""
+    status = "✓ PASS" if passed else "✗ FAIL"
+    print(f"{status}: {test_name}")
+    if details:
+        print(f"  → {details}")
+
+
+def register() -> str:
+    """Register a fresh test user and return its token."""
+    print_section("Authentication Setup")
+
+    email = f"stream_test_{datetime.now().timestamp()}@example.com"
+    response = requests.post(f"{API_BASE}/auth/signup", json={"email": email, "password": TEST_PASSWORD})
+    if response.status_code == 201:
+        print(f"✓ User registered: {email}")
+        return response.json()["token"]
+
+    print(f"✗ Registration failed: {response.status_code} - {response.text}")
+    return None
+
+
+def read_event(lines) -> tuple[str, dict]:
+    """The next SSE event (name, data) from a line iterator, skipping retry and heartbeat lines."""
+    event, data = None, None
+    for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+        elif line == "" and event is not None:
+            return event, data
+    return None, None
+
+
+def test_bootstrap(token: str) -> bool:
+    """The bootstrap response matches the separate catalog, progress and onboarding endpoints."""
+    print_section("Journey Bootstrap")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+
+    response = requests.get(f"{API_BASE}/journey/bootstrap", headers=headers)
+    passed = response.status_code == 200
+    print_test("Bootstrap request succeeds", passed, f"Status: {response.status_code}")
+    if not passed:
+        print(f"  Response: {response.text}")
+        return False
+    data = response.json()
+
+    passed = (
+        data["stages"] == requests.get(f"{API_BASE}/stages").json()
+        and data["milestones"] == requests.get(f"{API_BASE}/milestones").json()
+    )
+    print_test("Stages and milestones match the catalog endpoints", passed,
+               f"{len(data['stages'])} stages, {len(data['milestones'])} milestones")
+    all_passed &= passed
+
+    passed = data["progress"] == requests.get(f"{API_BASE}/progress", headers=headers).json()
+    print_test("Progress matches GET /progress", passed)
+    all_passed &= passed
+
+    passed = data["onboarding"] is None
+    print_test("Onboarding is null before the questionnaire is submitted", passed)
+    all_passed &= passed
+
+    requests.post(
+        f"{API_BASE}/onboarding",
+        headers=headers,
+        json={"childAgeRange": "18-36m", "diagnosisStatus": "waiting", "primaryConcern": "speech"}
+    )
+    data = requests.get(f"{API_BASE}/journey/bootstrap", headers=headers).json()
+    passed = data["onboarding"] == requests.get(f"{API_BASE}/onboarding", headers=headers).json()
+    print_test("Onboarding matches GET /onboarding once submitted", passed)
+    all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/journey/bootstrap")
+    passed = response.status_code in (401, 403)
+    print_test("Bootstrap requires authentication", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    return all_passed
+
+
+def test_progress_stream(token: str) -> bool:
+    """Open the stream and check the snapshot and the events of a toggle, a batch and a reset."""
+    print_section("Progress Event Stream")
+    headers = {"Authorization": f"Bearer {token}"}
+    all_passed = True
+    milestones = requests.get(f"{API_BASE}/milestones").json()
+
+    # EventSource can't send headers, so the token goes in the query string
+    with requests.get(f"{API_BASE}/progress/stream", params={"token": token}, stream=True, timeout=10) as stream:
+        passed = stream.status_code == 200 and stream.headers["content-type"].startswith("text/event-stream")
+        print_test("Stream opens as text/event-stream", passed, f"Status: {stream.status_code}")
+        if not passed:
+            return False
+        lines = stream.iter_lines(decode_unicode=True)
+
+        event, data = read_event(lines)
+        passed = event == "progress" and data["type"] == "snapshot" and "total_completed" in data["progress"]
+        print_test("First event is the current progress", passed, f"Event: {event}, type: {data and data.get('type')}")
+        all_passed &= passed
+
+        requests.post(f"{API_BASE}/progress/milestones/{milestones[0]['id']}/toggle", headers=headers)
+        event, data = read_event(lines)
+        passed = (
+            event == "progress" and data["type"] == "toggle"
+            and data["milestone_id"] == milestones[0]["id"] and data["isComplete"] is True
+        )
+        print_test("Toggle is pushed", passed, f"Event: {event}, type: {data and data.get('type')}")
+        all_passed &= passed
+
+        requests.post(
+            f"{API_BASE}/progress/milestones/batch",
+            headers=headers,
+            json={"operations": [{"milestone_id": milestones[1]["id"], "completed": True}]}
+        )
+        event, data = read_event(lines)
+        passed = event == "progress" and data["type"] == "batch" and data["progress"]["total_completed"] == 2
+        print_test("Batch update is pushed with the new progress", passed, f"Event: {event}, type: {data and data.get('type')}")
+        all_passed &= passed
+
+        requests.delete(f"{API_BASE}/progress", headers=headers)
+        event, data = read_event(lines)
+        passed = event == "progress" and data["type"] == "reset" and data["progress"]["total_completed"] == 0
+        print_test("Reset is pushed", passed, f"Event: {event}, type: {data and data.get('type')}")
+        all_passed &= passed
+
+    response = requests.get(f"{API_BASE}/progress/stream", params={"token": "not-a-token"})
+    passed = response.status_code == 401
+    print_test("Invalid token is rejected", passed, f"Status: {response.status_code}")
+    all_passed &= passed
+
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "=" * 80)
+    print("  JOURNEY BOOTSTRAP & PROGRESS STREAM TEST SUITE")
+    print("=" * 80)
+
+    token = register()
+    if not token:
+        print("\n✗ Cannot run tests without authentication")
+        return
+
+    results = {
+        "Journey bootstrap": test_bootstrap(token),
+        "Progress stream": test_progress_stream(token),
+    }
+
+    # Summary
+    print_section("Test Summary")
+    for name, passed in results.items():
+        print(f"{'✓' if passed else '✗'} {name}")
+
+    print("\n" + "=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
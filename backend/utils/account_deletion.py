@@ -0,0 +1,104 @@
+"""
+Account deletion: immediate soft delete, background purge.
+
+DELETE /api/v1/users/me only marks the user document (deleted_at) and
+replaces its email, which revokes access and frees the address at once.
+purge_deleted_accounts then removes everything stored about marked users in
+throttled batches, recording progress on the user document so a purge that
+is interrupted continues where it stopped. The user document goes last,
+and a PII-free record of the purge is kept in `account_deletions`.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from config import settings
+from database import get_database
+from utils.activity import DAILY_ACTIVITY
+from utils.analytics import COMPLETIONS
+from utils.archive import ARCHIVE
+
+
+JOB_NAME = "account_purge"
+DELETED_EMAIL_DOMAIN = "deleted.invalid"
+
+# Collections holding a user's data, purged in this order: (collection, user id field, id as string)
+DEPENDENTS = (
+    ("onboarding_responses", "user_id", False),
+    ("journey_history", "user_id", True),
+    (ARCHIVE, "user_id", True),
+    (DAILY_ACTIVITY, "user_id", True),
+    (COMPLETIONS, "_id.user_id", True),
+)
+
+
+async def mark_deleted(db, user_id: ObjectId) -> Optional[dict]:
+    """
+    Soft-delete the user. Returns the document as it was, or None if it was already deleted.
+    """
+    now = datetime.now(timezone.utc)
+    return await db["users"].find_one_and_update(
+        {"_id": user_id, "deleted_at": None},
+        {"$set": {
+            "deleted_at": now,
+            "email": f"{user_id}@{DELETED_EMAIL_DOMAIN}",
+            "deletion_progress": {},
+            "updated_at": now
+        }},
+        return_document=ReturnDocument.BEFORE
+    )
+
+
+async def purge_collection(db, user_id: ObjectId, collection: str, field: str, as_string: bool) -> int:
+    """Delete the user's documents from one collection in batches. Returns how many were deleted."""
+    value = str(user_id) if as_string else user_id
+    batch_size = settings.account_purge_batch_size
+    deleted = 0
+    while True:
+        batch = await db[collection].find({field: value}, {"_id": 1}).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return deleted
+        result = await db[collection].delete_many({"_id": {"$in": [document["_id"] for document in batch]}})
+        deleted += result.deleted_count
+        await db["users"].update_one({"_id": user_id}, {"$inc": {f"deletion_progress.{collection}": result.deleted_count}})
+        await asyncio.sleep(settings.account_purge_pause_ms / 1000)
+
+
+async def purge_account(db, user: dict) -> None:
+    """
+    Remove all of a soft-deleted user's data, then the user document.
+
+    A request that loaded the user before it was marked deleted can still
+    write a journey snapshot or onboarding response while the purge runs, so
+    the dependents are swept again until a pass finds nothing.
+    """
+    user_id = user["_id"]
+    while True:
+        deleted = 0
+        for collection, field, as_string in DEPENDENTS:
+            deleted += await purge_collection(db, user_id, collection, field, as_string)
+        if not deleted:
+            break
+
+    progress = (await db["users"].find_one({"_id": user_id}, {"deletion_progress": 1}) or {}).get("deletion_progress", {})
+    await db["account_deletions"].replace_one(
+        {"_id": user_id},
+        {"requested_at": user["deleted_at"], "completed_at": datetime.now(timezone.utc), "deleted": progress},
+        upsert=True
+    )
+    await db["users"].delete_one({"_id": user_id})
+    print(f"✓ Purged deleted account {user_id} ({sum(progress.values())} documents)")
+
+
+async def purge_deleted_accounts(db=None) -> int:
+    """Purge every soft-deleted account. Returns how many were purged."""
+    db = db if db is not None else get_database()
+    purged = 0
+    async for user in db["users"].find({"deleted_at": {"$type": "date"}}, {"deleted_at": 1}):
+        await purge_account(db, user)
+        purged += 1
+    return purged
@@ -0,0 +1,145 @@
+"""
+Daily journey activity rollups.
+
+analytics_daily_activity holds one small document per UTC day for all users
+(user_id null) and one per day for each user with activity that day:
+
+    {"_id": "2026-10-19:<user id>", "day": "2026-10-19", "user_id": "<user id>",
+     "completed": 3, "uncompleted": 1,
+     "stages": {"S1": {"completed": 2, "uncompleted": 1}, "S2": {"completed": 1, "uncompleted": 0}}}
+
+Each run finds the days that have journey_history snapshots after the stored
+high-water mark and recomputes those days in full, replacing their documents
+with `$merge`. Re-running over the same snapshots therefore rewrites the same
+counts instead of adding them twice. A full rebuild recomputes every day from
+the whole history, archived months included.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from database import get_database
+from utils.analytics import SETTLE_DELAY
+from utils.archive import full_history
+
+
+JOB_NAME = "daily_activity"
+DAILY_ACTIVITY = "analytics_daily_activity"
+ACTIONS = ("completed", "uncompleted")
+MAX_DAYS = 366
+
+
+def _action_counts(field: str = "$action") -> dict:
+    return {action: {"$sum": {"$cond": [{"$eq": [field, action]}, 1, 0]}} for action in ACTIONS}
+
+
+def daily_activity_pipeline(match: dict, by_user: bool, now: datetime) -> list[dict]:
+    """Aggregate the journey_history snapshots matching `match` into daily activity documents."""
+    day = {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}
+    user_id = "$user_id" if by_user else None
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"day": day, "user_id": user_id, "stage_id": {"$ifNull": ["$stage_id", "unknown"]}},
+            **_action_counts()
+        }},
+        {"$group": {
+            "_id": {"day": "$_id.day", "user_id": "$_id.user_id"},
+            "stages": {"$push": {"k": "$_id.stage_id", "v": {action: f"${action}" for action in ACTIONS}}},
+            **{action: {"$sum": f"${action}"} for action in ACTIONS}
+        }},
+        {"$project": {
+            "_id": {"$concat": ["$_id.day", ":", {"$ifNull": ["$_id.user_id", "all"]}]},
+            "day": "$_id.day",
+            "user_id": "$_id.user_id",
+            "stages": {"$arrayToObject": "$stages"},
+            **{action: 1 for action in ACTIONS},
+            "refreshed_at": now
+        }},
+        {"$merge": {"into": DAILY_ACTIVITY, "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]
+
+
+def day_range(day: str) -> dict:
+    """Timestamp range of a UTC day given as YYYY-MM-DD."""
+    start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return {"$gte": start, "$lt": start + timedelta(days=1)}
+
+
+async def refresh_daily_activity(db=None, full: bool = False) -> dict:
+    """
+    Bring the daily activity rollups up to date.
+
+    Args:
+        db: Database to use (defaults to the application database)
+        full: Rebuild every day from all journey history, archived included
+
+    Returns:
+        The job's analytics_meta document
+    """
+    db = db if db is not None else get_database()
+    now = datetime.now(timezone.utc)
+    meta = await db["analytics_meta"].find_one({"_id": JOB_NAME})
+
+    high_water_mark = now - SETTLE_DELAY
+    window = {"$lte": high_water_mark}
+    if meta and not full:
+        window["$gt"] = meta["high_water_mark"]
+
+    if full:
+        await db[DAILY_ACTIVITY].delete_many({})
+        async with full_history(db, JOB_NAME) as history:
+            for by_user in (False, True):
+                await history.aggregate(daily_activity_pipeline({"timestamp": window}, by_user, now)).to_list(length=None)
+        days_refreshed = "all"
+    else:
+        touched = await db["journey_history"].aggregate([
+            {"$match": {"timestamp": window}},
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}}}
+        ]).to_list(length=None)
+        days = sorted(day["_id"] for day in touched)
+        # Recompute whole days, including the snapshots counted by earlier runs
+        match = {"$or": [{"timestamp": day_range(day)} for day in days]}
+        days_refreshed = len(days)
+        if days:
+            for by_user in (False, True):
+                await db["journey_history"].aggregate(daily_activity_pipeline(match, by_user, now)).to_list(length=None)
+
+    meta = {
+        "high_water_mark": high_water_mark,
+        "refreshed_at": now,
+        "days_refreshed": days_refreshed,
+        "duration_ms": round((datetime.now(timezone.utc) - now).total_seconds() * 1000)
+    }
+    await db["analytics_meta"].update_one({"_id": JOB_NAME}, {"$set": meta}, upsert=True)
+    print(f"✓ Refreshed daily activity rollups ({days_refreshed} days, {meta['duration_ms']} ms)")
+    return meta
+
+
+async def get_daily_activity(db, user_id: Optional[str], days: int) -> list[dict]:
+    """
+    The last `days` UTC days of activity, oldest first, with zeros for days without any.
+
+    Args:
+        db: Database to read from
+        user_id: The user to chart, or None for all users
+        days: Number of days up to and including today
+    """
+    today = datetime.now(timezone.utc).date()
+    first_day = today - timedelta(days=days - 1)
+    documents = await db[DAILY_ACTIVITY].find(
+        {"user_id": user_id, "day": {"$gte": first_day.isoformat()}},
+        {"_id": 0, "day": 1, "stages": 1, **{action: 1 for action in ACTIONS}}
+    ).to_list(length=None)
+    by_day = {document.pop("day"): document for document in documents}
+
+    series = []
+    for offset in range(days):
+        day = (first_day + timedelta(days=offset)).isoformat()
+        counts = by_day.get(day, {})
+        series.append({
+            "day": day,
+            **{action: counts.get(action, 0) for action in ACTIONS},
+            "stages": counts.get("stages", {})
+        })
+    return series
@@ -0,0 +1,181 @@
+"""
+Materialized milestone completion analytics by onboarding cohort.
+
+A cohort is the set of users with the same recommended_stage_id. For each
+cohort and milestone, refresh_milestone_cohorts maintains how many users
+completed the milestone and the median days from signup to their first
+completion. Results are written with `$merge` so reads never scan users or
+journey history:
+
+- analytics_milestone_completions: one fact per (user, milestone) with the
+  first completion time and current status. It is folded forward from the
+  journey_history events after the stored high-water mark; a full rebuild
+  folds the archived history too.
+- analytics_cohort_milestones: the per-cohort, per-milestone rollup,
+  recomputed only for milestones that had new events.
+- analytics_cohorts: the number of users in each cohort.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from database import get_database
+from utils.archive import full_history
+
+
+JOB_NAME = "milestone_cohorts"
+COMPLETIONS = "analytics_milestone_completions"
+COHORT_MILESTONES = "analytics_cohort_milestones"
+COHORTS = "analytics_cohorts"
+
+# Events this recent are left for the next run, so snapshots still being
+# written with slightly older timestamps are not skipped by the high-water mark
+SETTLE_DELAY = timedelta(seconds=30)
+
+
+def median_expression(sorted_array: str) -> dict:
+    """Median of a sorted numeric array, as an aggregation expression."""
+    return {"$let": {
+        "vars": {"n": {"$size": sorted_array}},
+        "in": {"$cond": [
+            {"$eq": [{"$mod": ["$$n", 2]}, 1]},
+            {"$arrayElemAt": [sorted_array, {"$toInt": {"$floor": {"$divide": ["$$n", 2]}}}]},
+            {"$avg": [
+                {"$arrayElemAt": [sorted_array, {"$toInt": {"$subtract": [{"$divide": ["$$n", 2]}, 1]}}]},
+                {"$arrayElemAt": [sorted_array, {"$toInt": {"$divide": ["$$n", 2]}}]}
+            ]}
+        ]}
+    }}
+
+
+async def fold_completion_events(db, match: dict, history=None) -> None:
+    """Merge the events in `history` (default journey_history) matching `match` into the per-(user, milestone) facts."""
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"timestamp": 1}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "milestone_id": "$milestone_id"},
+            "first_completed_at": {"$min": {
+                "$cond": [{"$eq": ["$action", "completed"]}, "$timestamp", None]
+            }},
+            "last_action": {"$last": "$action"},
+            "last_event_at": {"$max": "$timestamp"}
+        }},
+        {"$project": {
+            "first_completed_at": 1,
+            "completed": {"$eq": ["$last_action", "completed"]},
+            "last_event_at": 1
+        }},
+        {"$merge": {
+            "into": COMPLETIONS,
+            "whenMatched": [{"$set": {
+                "first_completed_at": {"$min": ["$first_completed_at", "$$new.first_completed_at"]},
+                "completed": {"$cond": [
+                    {"$gte": ["$$new.last_event_at", "$last_event_at"]}, "$$new.completed", "$completed"
+                ]},
+                "last_event_at": {"$max": ["$last_event_at", "$$new.last_event_at"]}
+            }}],
+            "whenNotMatched": "insert"
+        }}
+    ]
+    history = history if history is not None else db["journey_history"]
+    await history.aggregate(pipeline).to_list(length=None)
+
+
+async def refresh_cohort_sizes(db, now: datetime) -> None:
+    """Count the users in each cohort."""
+    await db["users"].aggregate([
+        {"$match": {"recommended_stage_id": {"$type": "string"}, "deleted_at": None}},
+        {"$group": {"_id": "$recommended_stage_id", "users": {"$sum": 1}}},
+        {"$set": {"refreshed_at": now}},
+        {"$merge": {"into": COHORTS, "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]).to_list(length=None)
+
+
+async def rollup_cohort_milestones(db, milestone_ids: list[str] | None, now: datetime) -> None:
+    """
+    Recompute the cohort rollup rows of `milestone_ids` (all milestones when None).
+
+    Rows are replaced in place, so readers never see a milestone missing; rows
+    of those milestones that this run did not rewrite are deleted afterwards.
+    """
+    # MongoDB stores dates to the millisecond; rows stamped with `now` must not compare as older
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    match = {"first_completed_at": {"$ne": None}}
+    if milestone_ids is not None:
+        match["_id.milestone_id"] = {"$in": milestone_ids}
+
+    await db[COMPLETIONS].aggregate([
+        {"$match": match},
+        {"$set": {"user_oid": {"$convert": {"input": "$_id.user_id", "to": "objectId", "onError": None}}}},
+        {"$lookup": {"from": "users", "localField": "user_oid", "foreignField": "_id", "as": "user"}},
+        {"$unwind": "$user"},
+        {"$match": {"user.recommended_stage_id": {"$type": "string"}, "user.deleted_at": None}},
+        {"$set": {"days_to_complete": {
+            "$divide": [{"$subtract": ["$first_completed_at", "$user.created_at"]}, 86_400_000]
+        }}},
+        {"$sort": {"days_to_complete": 1}},
+        {"$group": {
+            "_id": {"stage_id": "$user.recommended_stage_id", "milestone_id": "$_id.milestone_id"},
+            "completed_users": {"$sum": 1},
+            "currently_completed_users": {"$sum": {"$cond": ["$completed", 1, 0]}},
+            "days": {"$push": "$days_to_complete"}
+        }},
+        {"$project": {
+            "completed_users": 1,
+            "currently_completed_users": 1,
+            "median_days_to_complete": {"$round": [median_expression("$days"), 1]},
+            "refreshed_at": now
+        }},
+        {"$merge": {"into": COHORT_MILESTONES, "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]).to_list(length=None)
+
+    # Rows whose last completer has left the cohort were not rewritten above
+    stale = {"refreshed_at": {"$lt": now}}
+    if milestone_ids is not None:
+        stale["_id.milestone_id"] = {"$in": milestone_ids}
+    await db[COHORT_MILESTONES].delete_many(stale)
+
+
+async def refresh_milestone_cohorts(db=None, full: bool = False) -> dict:
+    """
+    Bring the materialized cohort analytics up to date.
+
+    Args:
+        db: Database to use (defaults to the application database)
+        full: Rebuild from all journey history, archived included, instead of the events after the high-water mark
+
+    Returns:
+        The job's analytics_meta document
+    """
+    db = db if db is not None else get_database()
+    now = datetime.now(timezone.utc)
+    meta = await db["analytics_meta"].find_one({"_id": JOB_NAME})
+
+    high_water_mark = now - SETTLE_DELAY
+    window = {"$lte": high_water_mark}
+    if meta and not full:
+        window["$gt"] = meta["high_water_mark"]
+    match = {"timestamp": window}
+
+    if full:
+        await db[COMPLETIONS].delete_many({})
+        touched = None
+        async with full_history(db, JOB_NAME) as history:
+            await fold_completion_events(db, match, history)
+    else:
+        touched = await db["journey_history"].distinct("milestone_id", match)
+        await fold_completion_events(db, match)
+    await refresh_cohort_sizes(db, now)
+    if touched is None or touched:
+        await rollup_cohort_milestones(db, touched, now)
+
+    meta = {
+        "high_water_mark": high_water_mark,
+        "refreshed_at": now,
+        "milestones_refreshed": "all" if touched is None else len(touched),
+        "duration_ms": round((datetime.now(timezone.utc) - now).total_seconds() * 1000)
+    }
+    await db["analytics_meta"].update_one({"_id": JOB_NAME}, {"$set": meta}, upsert=True)
+    print(f"✓ Refreshed milestone cohort analytics ({meta['milestones_refreshed']} milestones, "
+          f"{meta['duration_ms']} ms)")
+    return meta
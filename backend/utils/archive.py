@@ -0,0 +1,214 @@
+"""
+Tiered archival of old journey history.
+
+Snapshots older than HISTORY_ARCHIVE_AFTER_DAYS (rounded down to the start
+of a month) move out of `journey_history` into `journey_history_archive`,
+one document per user and month:
+
+    {"_id": "<user id>:2026-03", "user_id": "<user id>", "month": "2026-03",
+     "count": 42, "first_timestamp": ..., "last_timestamp": ...,
+     "milestone_ids": [...], "codec": "zstd", "data": <compressed BSON snapshots>}
+
+A run walks old snapshots user by user (in the order of the user_id,
+timestamp index), so each user's month is gathered whole and its blob is
+written once per run. A month is written to the archive before its
+originals are deleted, and snapshots already in a blob are skipped when it
+is rewritten, so a run that stops half way is simply picked up by the next.
+
+The history endpoints read the hot collection first and only decompress
+archived months when a query reaches past it, and only blobs overlapping the
+requested time range (read_history). Full analytics
+rebuilds aggregate over a temporary copy of the whole history, hot and
+archived (full_history).
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import bson
+import zstandard
+from pymongo.errors import BulkWriteError
+
+from config import settings
+from database import get_database
+
+
+JOB_NAME = "history_archive"
+ARCHIVE = "journey_history_archive"
+ZSTD_LEVEL = 10
+DUPLICATE_KEY = 11000
+
+
+def compress(documents: list[dict]) -> bytes:
+    """Concatenated BSON of the documents, zstd-compressed."""
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(b"".join(bson.encode(document) for document in documents))
+
+
+def decompress(blob: dict) -> list[dict]:
+    """The snapshots of an archive blob, oldest first."""
+    if blob["codec"] != "zstd":
+        raise ValueError(f"Unknown archive codec {blob['codec']!r}")
+    return bson.decode_all(zstandard.ZstdDecompressor().decompress(bytes(blob["data"])))
+
+
+def archive_cutoff(now: datetime, after_days: int) -> datetime:
+    """Snapshots before this moment are archived: the start of the month `after_days` ago."""
+    cutoff = now - timedelta(days=after_days)
+    return cutoff.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _month(timestamp: datetime) -> str:
+    return timestamp.strftime("%Y-%m")
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """`moment` as a naive UTC datetime, the form decoded archive snapshots use."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _merge_into_blob(db, user_id: str, month: str, snapshots: list[dict]) -> None:
+    """Add snapshots to the user's blob for the month, skipping ones it already holds."""
+    archive = db[ARCHIVE]
+    blob_id = f"{user_id}:{month}"
+    existing = await archive.find_one({"_id": blob_id})
+    if existing is not None:
+        archived = decompress(existing)
+        archived_ids = {snapshot["_id"] for snapshot in archived}
+        snapshots = archived + [snapshot for snapshot in snapshots if snapshot["_id"] not in archived_ids]
+    snapshots.sort(key=lambda snapshot: snapshot["timestamp"])
+
+    await archive.replace_one(
+        {"_id": blob_id},
+        {
+            "user_id": user_id,
+            "month": month,
+            "count": len(snapshots),
+            "first_timestamp": snapshots[0]["timestamp"],
+            "last_timestamp": snapshots[-1]["timestamp"],
+            "milestone_ids": sorted({snapshot.get("milestone_id") for snapshot in snapshots} - {None}),
+            "codec": "zstd",
+            "data": bson.Binary(compress(snapshots))
+        },
+        upsert=True
+    )
+
+
+async def archive_history(db=None, after_days: Optional[int] = None, batch_size: Optional[int] = None) -> dict:
+    """
+    Move journey history older than the hot window into the archive.
+
+    Args:
+        db: Database to use (defaults to the application database)
+        after_days: Hot window in days (defaults to HISTORY_ARCHIVE_AFTER_DAYS)
+        batch_size: Snapshots moved per batch (defaults to HISTORY_ARCHIVE_BATCH_SIZE)
+
+    Returns:
+        Summary with the cutoff and the number of snapshots archived
+    """
+    db = db if db is not None else get_database()
+    after_days = settings.history_archive_after_days if after_days is None else after_days
+    batch_size = batch_size or settings.history_archive_batch_size
+    cutoff = archive_cutoff(datetime.now(timezone.utc), after_days)
+    history = db["journey_history"]
+
+    async def archive_month(user_id: str, month: str, snapshots: list[dict]) -> None:
+        await _merge_into_blob(db, user_id, month, snapshots)
+        # Only after every snapshot of the month is safely in its blob
+        await history.delete_many({"_id": {"$in": [snapshot["_id"] for snapshot in snapshots]}})
+
+    archived = 0
+    month_key, month_snapshots = None, []
+    cursor = history.find({"timestamp": {"$lt": cutoff}}).sort([("user_id", 1), ("timestamp", -1)]).batch_size(batch_size)
+    async for snapshot in cursor:
+        key = (snapshot["user_id"], _month(snapshot["timestamp"]))
+        if key != month_key and month_snapshots:
+            await archive_month(*month_key, month_snapshots)
+            archived += len(month_snapshots)
+            month_snapshots = []
+        month_key = key
+        month_snapshots.append(snapshot)
+    if month_snapshots:
+        await archive_month(*month_key, month_snapshots)
+        archived += len(month_snapshots)
+
+    summary = {"cutoff": cutoff, "archived": archived}
+    if archived:
+        print(f"✓ Archived {archived} journey history snapshots from before {cutoff:%Y-%m-%d}")
+    return summary
+
+
+async def read_history(
+    db,
+    query: dict,
+    limit: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> list[dict]:
+    """
+    Journey history matching `query` (user_id plus optionally milestone_id), most recent first.
+
+    Reads `journey_history` and decompresses archived months, newest first,
+    only while the hot collection has returned fewer than `limit` snapshots
+    (all of them when `limit` is None). Only blobs overlapping [since, until]
+    are read, so a range inside the hot window never touches the archive.
+    """
+    since, until = _naive_utc(since), _naive_utc(until)
+    window = {}
+    if since is not None:
+        window["$gte"] = since
+    if until is not None:
+        window["$lte"] = until
+    hot_query = {**query, "timestamp": window} if window else query
+    history = await db["journey_history"].find(hot_query).sort("timestamp", -1).to_list(length=limit)
+    if limit is not None and len(history) >= limit:
+        return history
+
+    archive_query = {"user_id": query["user_id"]}
+    if "milestone_id" in query:
+        archive_query["milestone_ids"] = query["milestone_id"]
+    if since is not None:
+        archive_query["last_timestamp"] = {"$gte": since}
+    if until is not None:
+        archive_query["first_timestamp"] = {"$lte": until}
+
+    # A snapshot can be in both places while an archive run is in progress
+    seen_ids = {snapshot["_id"] for snapshot in history}
+    async for blob in db[ARCHIVE].find(archive_query).sort("last_timestamp", -1):
+        for snapshot in decompress(blob):
+            if snapshot["_id"] in seen_ids:
+                continue
+            if "milestone_id" in query and snapshot.get("milestone_id") != query["milestone_id"]:
+                continue
+            if (since is not None and snapshot["timestamp"] < since) or (until is not None and snapshot["timestamp"] > until):
+                continue
+            history.append(snapshot)
+        if limit is not None and len(history) >= limit:
+            break
+
+    history.sort(key=lambda snapshot: snapshot["timestamp"], reverse=True)
+    return history[:limit]
+
+
+@asynccontextmanager
+async def full_history(db, name: str) -> AsyncIterator:
+    """
+    A scratch collection ("<name>_history") holding every journey snapshot,
+    hot and archived, for a full rebuild to aggregate over. Archived months are
+    copied one blob at a time; the collection is dropped afterwards.
+    """
+    scratch = db[f"{name}_history"]
+    await db["journey_history"].aggregate([{"$out": scratch.name}]).to_list(length=None)
+    async for blob in db[ARCHIVE].find({}, {"data": 1, "codec": 1}):
+        try:
+            await scratch.insert_many(decompress(blob), ordered=False)
+        except BulkWriteError as e:
+            # Snapshots still in the hot collection while an archive run is in progress
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+    try:
+        yield scratch
+    finally:
+        await scratch.drop()
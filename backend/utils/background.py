@@ -0,0 +1,75 @@
+"""
+Periodic background jobs run inside the API workers.
+
+Jobs are started from the app lifespan and cancelled at shutdown. With
+several workers (server.py) every worker schedules every job, so each run
+first takes a lease in the `job_leases` collection: only the worker holding
+the lease runs the job, and a crashed worker's lease simply expires.
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from pymongo.errors import DuplicateKeyError
+
+from database import get_database
+
+
+def worker_id() -> str:
+    """Identifies this worker process as a lease holder (evaluated after fork)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_lease(name: str, duration: timedelta) -> bool:
+    """Take or renew the named lease for `duration`. Returns False if another worker holds it."""
+    now = datetime.now(timezone.utc)
+    holder = worker_id()
+    try:
+        await get_database()["job_leases"].update_one(
+            {"_id": name, "$or": [{"expires_at": {"$lt": now}}, {"holder": holder}]},
+            {"$set": {"holder": holder, "expires_at": now + duration, "acquired_at": now}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The lease exists and is held by another worker, so the upsert tried to insert
+        return False
+    return True
+
+
+async def run_periodically(name: str, interval: float, job: Callable[[], Awaitable[object]]) -> None:
+    """Run `job` every `interval` seconds in whichever worker holds its lease."""
+    # Hold the lease for the whole interval so other workers skip this round
+    lease_duration = timedelta(seconds=interval)
+    while True:
+        try:
+            if await acquire_lease(name, lease_duration):
+                await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"✗ Background job {name} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+class BackgroundJobs:
+    """The periodic jobs of one worker."""
+
+    def __init__(self):
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def schedule(self, name: str, interval: float, job: Callable[[], Awaitable[object]]) -> None:
+        """Run `job` every `interval` seconds; an interval of 0 or less disables it."""
+        if interval <= 0:
+            return
+        self.tasks[name] = asyncio.create_task(run_periodically(name, interval, job), name=f"job:{name}")
+        print(f"✓ Scheduled background job {name} every {interval:g}s")
+
+    async def stop(self) -> None:
+        """Cancel all jobs and wait for them to finish."""
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
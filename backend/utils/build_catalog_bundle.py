@@ -0,0 +1,64 @@
+"""
+Build step that compiles the seed catalog into a compact, content-hashed JSON bundle.
+
+Workers load the bundle at startup and serve catalog reads from memory
+(see utils/catalog.py). Run it whenever the seed data changes, alongside
+the seed script that syncs the same content into MongoDB:
+
+    python3 -m utils.build_catalog_bundle
+    python3 -m utils.build_catalog_bundle --output /srv/catalog_bundle.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path so we can import from backend modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from models.resource import Resource
+from utils.catalog import BUNDLE_FORMAT
+from utils.projections import MILESTONE_FIELDS, STAGE_FIELDS, shape_document
+from utils.seed_data import build_catalog, catalog_hash
+
+
+def build_bundle() -> dict:
+    """Compile the seed data into the bundle structure read by utils.catalog."""
+    catalog = build_catalog()
+    return {
+        "format": BUNDLE_FORMAT,
+        "content_hash": catalog_hash(catalog),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "stages": [shape_document(stage, STAGE_FIELDS) for stage in catalog["stages"]],
+        "milestones": [shape_document(milestone, MILESTONE_FIELDS) for milestone in catalog["milestones"]],
+        "resources": [
+            Resource(**resource).model_dump(mode="json", by_alias=True)
+            for resource in catalog["resources"]
+        ],
+    }
+
+
+def write_bundle(bundle: dict, output: Path) -> None:
+    """Write the bundle atomically so a starting worker never reads a partial file."""
+    tmp_path = output.with_suffix(output.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(bundle, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the catalog bundle")
+    parser.add_argument("--output", type=Path, default=Path(settings.catalog_bundle_path))
+    args = parser.parse_args()
+
+    bundle = build_bundle()
+    write_bundle(bundle, args.output)
+    print(f"✓ Wrote catalog bundle {args.output} ({args.output.stat().st_size:,} bytes, "
+          f"content hash {bundle['content_hash'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+In-memory journey catalog (stages, milestones, resources) served without database reads.
+
+At startup the catalog is loaded from the bundle file written by
+utils/build_catalog_bundle.py. The bundle is used only if its content hash
+matches the one recorded in catalog_meta by the seed script; when it is
+missing or stale the catalog is loaded from MongoDB once instead. Documents
+are stored already in response shape, so routers return them as-is.
+
+Stages and milestones can be looked up by any id form clients send (see
+resolve_stage and resolve_milestone), so ids are validated without a
+database read.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import Request
+from fastapi.responses import Response
+
+from config import settings
+from database import get_database
+from models.resource import Resource
+from utils import invalidation
+from utils.compression import precompress, precompressed_response
+from utils.projections import MILESTONE_RESPONSE, STAGE_RESPONSE
+
+
+BUNDLE_FORMAT = 1
+CATALOG_META_ID = "catalog"
+
+# Milestones of the frontend's built-in journey data (frontend/lib/data.ts). The frontend
+# toggles and checks completion by these ids, so they are accepted and stored as they are.
+FRONTEND_MILESTONES = {
+    "m1-1": ("S1", "Observe Eye Contact"),
+    "m1-2": ("S1", "Track Gestures"),
+    "m1-3": ("S1", "Response to Name"),
+    "m2-1": ("S2", "Schedule Evaluation"),
+    "m2-2": ("S2", "Document Behaviors"),
+    "m2-3": ("S2", "Understand the Report"),
+    "m3-1": ("S3", "Contact Early Intervention"),
+    "m3-2": ("S3", "Set One Goal"),
+    "m3-3": ("S3", "Create a Routine"),
+    "m4-1": ("S4", "Request IEP Meeting"),
+    "m4-2": ("S4", "Visit the School"),
+    "m4-3": ("S4", "Practice Self-Help"),
+    "m5-1": ("S5", "Find a Community"),
+    "m5-2": ("S5", "Apply for Respite"),
+    "m5-3": ("S5", "Explore Financial Aid"),
+}
+
+
+def frontend_milestone(milestone_id: str) -> Optional[dict]:
+    """A frontend milestone id resolved like a catalog milestone (id, stage id, title), or None."""
+    if milestone_id not in FRONTEND_MILESTONES:
+        return None
+    stage_id, title = FRONTEND_MILESTONES[milestone_id]
+    return {"id": milestone_id, "stage_id": stage_id, "slug": None, "title": title}
+
+
+def stage_key(order: int) -> str:
+    """The canonical key of the stage at `order`: "S<order>", as milestones' stage_id."""
+    return f"S{order}"
+
+
+def parse_stage_key(value: str) -> Optional[dict]:
+    """
+    A stages query for a stage key ("S1", "s1") or stage id, or None if
+    `value` is neither. Used only when the catalog is not loaded.
+    """
+    value = value.strip()
+    if value[:1] in ("S", "s") and value[1:].isdigit():
+        return {"order": int(value[1:])}
+    if ObjectId.is_valid(value):
+        return {"_id": ObjectId(value)}
+    return None
+
+
+class Catalog:
+    """Response-shaped catalog documents with lookup indexes."""
+
+    def __init__(
+        self,
+        stages: list[dict],
+        milestones: list[dict],
+        resources: list[dict],
+        content_hash: Optional[str],
+        version: Optional[int],
+        source: str
+    ):
+        self.stages = sorted(stages, key=lambda stage: stage["order"])
+        self.milestones = milestones
+        self.resources = resources
+        self.content_hash = content_hash
+        self.version = version
+        self.source = source  # "bundle" or "database"
+
+        self.milestones_by_id = {milestone["id"]: milestone for milestone in self.milestones}
+        self.resources_by_id = {resource["_id"]: resource for resource in self.resources}
+        self.resources_by_category: dict[str, list[dict]] = {}
+        for resource in self.resources:
+            self.resources_by_category.setdefault(resource["category"], []).append(resource)
+
+        # Every accepted stage id form (key in either case, id) -> canonical key, and key -> stage
+        self.stages_by_key = {stage_key(stage["order"]): stage for stage in self.stages}
+        self.stage_keys = {}
+        for key, stage in self.stages_by_key.items():
+            self.stage_keys[key.lower()] = key
+            self.stage_keys[stage["id"]] = key
+
+        # Grouped by canonical stage key, whichever form a milestone's stage_id uses
+        self.milestones_by_stage: dict[str, list[dict]] = {}
+        for milestone in self.milestones:
+            stage_id = self.canonical_stage_key(milestone["stage_id"]) or milestone["stage_id"]
+            self.milestones_by_stage.setdefault(stage_id, []).append(milestone)
+        self.milestone_ids_by_stage = {
+            stage_id: [milestone["id"] for milestone in milestones]
+            for stage_id, milestones in self.milestones_by_stage.items()
+        }
+
+        # Every accepted milestone id form (id, slug, frontend id), lowercased
+        self.milestones_by_key = {milestone_id: frontend_milestone(milestone_id) for milestone_id in FRONTEND_MILESTONES}
+        for milestone in self.milestones:
+            self.milestones_by_key[milestone["id"]] = milestone
+            if milestone.get("slug"):
+                self.milestones_by_key[milestone["slug"].lower()] = milestone
+
+        # Rendered and compressed response bodies, by (key, encoding); dropped with this catalog
+        self.responses: dict[tuple[str, Optional[str]], bytes] = {}
+
+    def response_contents(self):
+        """(key, content) of every response the catalog endpoints serve through response()."""
+        yield "stages", self.stages
+        for key, stage in self.stages_by_key.items():
+            yield f"stage:{key}", stage
+        yield "milestones", self.milestones
+        for key, milestones in self.milestones_by_stage.items():
+            yield f"milestones:{key}", milestones
+        for milestone in self.milestones:
+            yield f"milestone:{milestone['id']}", milestone
+        yield "resources:", self.resources
+        for category, resources in self.resources_by_category.items():
+            yield f"resources:{category}", resources
+        for resource in self.resources:
+            yield f"resource:{resource['_id']}", resource
+
+    def precompress_responses(self) -> None:
+        """Render and compress every catalog response; CPU-bound, run off the event loop."""
+        for key, content in self.response_contents():
+            precompress(self.responses, key, content)
+
+    def response(self, request: Request, key: str, content) -> Response:
+        """
+        `content` (part of this catalog, named by `key`) as a JSON response,
+        from the bodies precompressed for this catalog version.
+        """
+        return precompressed_response(self.responses, key, content, request.headers.get("accept-encoding", ""))
+
+    def canonical_stage_key(self, key: str) -> Optional[str]:
+        """The canonical key ("S1") of the stage a key in any case or a stage id refers to, or None."""
+        return self.stage_keys.get(key.strip().lower())
+
+    def resolve_stage(self, key: str) -> Optional[dict]:
+        """The stage a stage key in any case or a stage id refers to, or None if it is unknown."""
+        return self.stages_by_key.get(self.canonical_stage_key(key))
+
+    def resolve_milestone(self, key: str) -> Optional[dict]:
+        """The milestone an id, slug or frontend id refers to, or None if it is unknown."""
+        return self.milestones_by_key.get(key.strip().lower())
+
+
+# Bundle read from disk (possibly before fork) and the catalog currently being served
+_bundle: Optional[dict] = None
+_catalog: Optional[Catalog] = None
+
+
+def load_bundle(path: Optional[str] = None) -> Optional[dict]:
+    """
+    Read the catalog bundle from disk, caching it for later init_catalog calls.
+
+    Returns None if the file is absent, unreadable or in an unknown format.
+    """
+    global _bundle
+
+    bundle_path = Path(path or settings.catalog_bundle_path)
+    if not bundle_path.exists():
+        return None
+    try:
+        bundle = json.loads(bundle_path.read_bytes())
+    except (OSError, ValueError) as e:
+        print(f"⚠ Could not read catalog bundle {bundle_path}: {e}")
+        return None
+    if bundle.get("format") != BUNDLE_FORMAT:
+        print(f"⚠ Ignoring catalog bundle {bundle_path} with unknown format {bundle.get('format')}")
+        return None
+
+    _bundle = bundle
+    return bundle
+
+
+async def load_from_database(db, meta: Optional[dict]) -> Catalog:
+    """Load the catalog from MongoDB, shaped by the same projections the read endpoints use."""
+    stages = await db["stages"].aggregate([STAGE_RESPONSE]).to_list(length=None)
+    milestones = await db["milestones"].aggregate([MILESTONE_RESPONSE]).to_list(length=None)
+    resources = [
+        Resource.from_mongo(resource).model_dump(mode="json", by_alias=True)
+        for resource in await db["resources"].find({}).to_list(length=None)
+    ]
+    return Catalog(
+        stages, milestones, resources,
+        content_hash=(meta or {}).get("content_hash"),
+        version=(meta or {}).get("version"),
+        source="database"
+    )
+
+
+async def init_catalog(db) -> Catalog:
+    """
+    Load the catalog to serve: the bundle when it matches the database's
+    catalog content hash, otherwise the database itself.
+    """
+    global _catalog
+
+    bundle = _bundle or load_bundle()
+    meta = await db["catalog_meta"].find_one({"_id": CATALOG_META_ID})
+
+    if bundle and meta and bundle["content_hash"] == meta.get("content_hash"):
+        catalog = Catalog(
+            bundle["stages"], bundle["milestones"], bundle["resources"],
+            content_hash=bundle["content_hash"],
+            version=meta.get("version"),
+            source="bundle"
+        )
+    else:
+        if bundle:
+            print("⚠ Catalog bundle does not match the database catalog; loading from MongoDB")
+        catalog = await load_from_database(db, meta)
+
+    # The previous catalog keeps serving until the new one's responses are compressed
+    await asyncio.to_thread(catalog.precompress_responses)
+    _catalog = catalog
+
+    print(f"✓ Loaded catalog from {_catalog.source} "
+          f"({len(_catalog.stages)} stages, {len(_catalog.milestones)} milestones, "
+          f"{len(_catalog.resources)} resources, {len(_catalog.responses)} precompressed bodies)")
+    return _catalog
+
+
+def get_catalog() -> Optional[Catalog]:
+    """Return the in-memory catalog, or None if it could not be loaded at startup."""
+    return _catalog
+
+
+async def _reload_catalog(key: str) -> None:
+    await init_catalog(get_database())
+
+
+# The seed script changed the catalog collections
+invalidation.on("catalog", _reload_catalog)
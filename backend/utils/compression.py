@@ -0,0 +1,90 @@
+"""
+Response compression: Accept-Encoding negotiation and gzip/brotli encoders.
+
+CompressionMiddleware (middleware/compression.py) compresses responses per
+request. Catalog responses are rendered and compressed ahead of time with
+precompress, once per catalog version, and served from memory by
+precompressed_response.
+"""
+
+import gzip
+from typing import Any, Optional
+
+import brotli
+from fastapi.responses import JSONResponse, Response
+
+from config import settings
+
+
+# Supported encodings, most preferred first
+ENCODINGS = ("br", "gzip")
+
+# Precompressed bodies are built once per catalog version, so they use the slowest settings
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = 11
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    The supported encoding the client prefers (by q-value, then server
+    preference), or None to send the response uncompressed.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress `body` with `encoding`; `best` trades CPU for the smallest output."""
+    if encoding == "br":
+        quality = PRECOMPRESSED_BROTLI_QUALITY if best else settings.compression_brotli_quality
+        return brotli.compress(body, quality=quality)
+    level = PRECOMPRESSED_GZIP_LEVEL if best else settings.compression_gzip_level
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def precompress(cache: dict, key: str, content: Any) -> bytes:
+    """
+    Render `content` as JSON into `cache` under `key`, with a compressed copy
+    per encoding when it reaches COMPRESSION_MIN_BYTES. Returns the JSON body.
+    """
+    body = cache[(key, None)] = JSONResponse(content).body
+    if settings.compression_enabled and len(body) >= settings.compression_min_bytes:
+        for encoding in ENCODINGS:
+            cache[(key, encoding)] = compress(body, encoding, best=True)
+    return body
+
+
+def precompressed_response(cache: dict, key: str, content: Any, accept_encoding: str) -> Response:
+    """
+    A JSON response for `content` from the bodies precompressed into `cache`.
+    `content` is only rendered here if it was not precompressed under `key`.
+    """
+    body = cache.get((key, None))
+    if body is None:
+        body = precompress(cache, key, content)
+
+    encoding = negotiate(accept_encoding) if settings.compression_enabled else None
+    compressed = cache.get((key, encoding)) if encoding else None
+    if compressed is None:
+        return Response(body, media_type="application/json")
+    return Response(
+        compressed,
+        media_type="application/json",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
@@ -0,0 +1,130 @@
+"""
+Streaming export of a parent's personal data.
+
+export_records walks the user's documents with Motor cursors of
+EXPORT_BATCH_SIZE and yields them one at a time, pausing between batches,
+so an export holds at most one batch (or one archived month) in memory and
+yields the event loop to interactive requests. The records are rendered
+as NDJSON or as a zip of JSON files, both written chunk by chunk.
+"""
+
+import asyncio
+import json
+import zipfile
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from bson import ObjectId
+
+from config import settings
+from utils.archive import ARCHIVE, decompress
+
+
+# Export sections in output order; each is one file in the zip format
+SECTIONS = ("user", "onboarding_responses", "journey_history")
+USER_PRIVATE_FIELDS = {"password_hash": 0}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def to_json(document: dict) -> str:
+    return json.dumps(document, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+async def _pause() -> None:
+    """Let interactive requests run between export batches."""
+    await asyncio.sleep(settings.export_batch_pause_ms / 1000)
+
+
+async def _batched(cursor) -> AsyncIterator[dict]:
+    batch_size = settings.export_batch_size
+    cursor.batch_size(batch_size)
+    count = 0
+    async for document in cursor:
+        yield document
+        count += 1
+        if count % batch_size == 0:
+            await _pause()
+
+
+async def export_records(db, user_id: ObjectId) -> AsyncIterator[tuple[str, dict]]:
+    """Yield (section, document) for everything stored about the user, section by section."""
+    user = await db["users"].find_one({"_id": user_id}, USER_PRIVATE_FIELDS)
+    if user is not None:
+        yield "user", user
+
+    async for response in _batched(db["onboarding_responses"].find({"user_id": user_id}).sort("created_at", 1)):
+        yield "onboarding_responses", response
+
+    # Archived months first (they are older), one decompressed blob at a time
+    async for blob in db[ARCHIVE].find({"user_id": str(user_id)}, {"data": 1, "codec": 1}).sort("last_timestamp", 1):
+        for snapshot in decompress(blob):
+            yield "journey_history", snapshot
+        await _pause()
+    async for snapshot in _batched(db["journey_history"].find({"user_id": str(user_id)}).sort("timestamp", 1)):
+        yield "journey_history", snapshot
+
+
+async def stream_ndjson(records: AsyncIterator[tuple[str, dict]]) -> AsyncIterator[bytes]:
+    """One {"type": section, "data": document} object per line."""
+    async for section, document in records:
+        yield (to_json({"type": section, "data": document}) + "\n").encode()
+
+
+class _ChunkWriter:
+    """Unseekable file object that collects what zipfile writes until it is drained."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def stream_zip(records: AsyncIterator[tuple[str, dict]]) -> AsyncIterator[bytes]:
+    """A zip with one JSON file per section: user.json holds an object, the others arrays."""
+    output = _ChunkWriter()
+    archive = zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED)
+    written = set()
+    member = None
+
+    async for section, document in records:
+        if section not in written:
+            if member is not None:
+                member.write(b"]")
+                member.close()
+            written.add(section)
+            if section == "user":
+                archive.writestr("user.json", to_json(document))
+                member = None
+                continue
+            member = archive.open(f"{section}.json", "w", force_zip64=True)
+            member.write(b"[" + to_json(document).encode())
+        else:
+            member.write(b"," + to_json(document).encode())
+        if output.chunks:
+            yield output.drain()
+
+    if member is not None:
+        member.write(b"]")
+        member.close()
+    for section in SECTIONS:
+        if section not in written and section != "user":
+            archive.writestr(f"{section}.json", "[]")
+    archive.close()
+    yield output.drain()
@@ -0,0 +1,230 @@
+"""
+Idempotency-Key support for mutating endpoints.
+
+A client that retries a request with the same Idempotency-Key header gets
+the stored response of the first attempt instead of the request running
+again. Responses are kept in the `idempotency_keys` collection (expired by a
+TTL index after IDEMPOTENCY_TTL_SECONDS) with a per-worker front cache, so a
+replay costs no writes, no hashing and usually no database read.
+
+    async with idempotent(idempotency_key, scope, payload) as idempotency:
+        if idempotency.replayed:
+            return idempotency.replay_response()
+        ...
+        return await idempotency.save(response, status_code=201)
+
+A key that is reused with a different request payload is rejected with 422,
+and a retry that arrives while the first attempt is still running gets 409.
+The running attempt renews its claim until it finishes, so a retry can only
+take the key over once that attempt's worker has stopped (crashed or been
+killed) for CLAIM_TIMEOUT. If the first attempt fails, its claim on the key
+is released so the client can retry.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pymongo.errors import DuplicateKeyError
+
+from config import settings
+from database import get_database
+
+
+# How long an in-progress claim blocks retries before another attempt may take it over,
+# and how often the attempt holding it renews it
+CLAIM_TIMEOUT = timedelta(seconds=60)
+CLAIM_RENEW_SECONDS = 20
+MAX_CACHED_RESPONSES = 10_000
+
+# Record id -> (expiry on the monotonic clock, fingerprint, status code, body)
+_responses: OrderedDict[str, tuple[float, str, int, Any]] = OrderedDict()
+
+
+def fingerprint(payload: Any) -> str:
+    """
+    Keyed hash of a request payload, to detect a key reused for a different request.
+
+    Keyed with the JWT secret because payloads can contain passwords.
+    """
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hmac.new(settings.jwt_secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+
+
+def _cache_get(record_id: str) -> Optional[tuple[float, str, int, Any]]:
+    cached = _responses.get(record_id)
+    if cached is None:
+        return None
+    if cached[0] < time.monotonic():
+        del _responses[record_id]
+        return None
+    _responses.move_to_end(record_id)
+    return cached
+
+
+def _cache_put(record_id: str, request_fingerprint: str, status_code: int, body: Any, expires_at: datetime) -> None:
+    ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    _responses[record_id] = (time.monotonic() + ttl, request_fingerprint, status_code, body)
+    _responses.move_to_end(record_id)
+    if len(_responses) > MAX_CACHED_RESPONSES:
+        _responses.popitem(last=False)
+
+
+def _key_reused() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key was already used for a different request"
+    )
+
+
+class IdempotentRequest:
+    """One request's claim on an idempotency key, or the stored response it replays."""
+
+    def __init__(self, key: Optional[str], scope: str, payload: Any):
+        self.key = key
+        self.record_id = hashlib.sha256(f"{scope}\n{key}".encode()).hexdigest() if key else None
+        self.fingerprint = fingerprint(payload) if key else None
+        self.replayed = False
+        self.status_code: Optional[int] = None
+        self.body: Any = None
+        self.claimed = False
+        # Identifies this attempt's claim, so an attempt that was taken over can't renew or settle it
+        self.claim_id = uuid.uuid4().hex
+
+    def _replay(self, request_fingerprint: str, status_code: int, body: Any) -> None:
+        if request_fingerprint != self.fingerprint:
+            raise _key_reused()
+        self.replayed = True
+        self.status_code = status_code
+        self.body = body
+
+    async def claim(self) -> None:
+        """Claim the key for this request, or load the response to replay."""
+        if self.record_id is None:
+            return
+
+        cached = _cache_get(self.record_id)
+        if cached is not None:
+            self._replay(*cached[1:])
+            return
+
+        collection = get_database()["idempotency_keys"]
+        now = datetime.now(timezone.utc)
+        try:
+            await collection.insert_one({
+                "_id": self.record_id,
+                "fingerprint": self.fingerprint,
+                "status": "in_progress",
+                "claim_id": self.claim_id,
+                "locked_until": now + CLAIM_TIMEOUT,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.idempotency_ttl_seconds)
+            })
+            self.claimed = True
+            return
+        except DuplicateKeyError:
+            pass
+
+        record = await collection.find_one({"_id": self.record_id})
+        if record is None:
+            # Expired between the insert and the read; treat it as new
+            await self.claim()
+            return
+        if record["fingerprint"] != self.fingerprint:
+            raise _key_reused()
+        if record["status"] == "completed":
+            expires_at = record["expires_at"].replace(tzinfo=timezone.utc)
+            _cache_put(self.record_id, record["fingerprint"], record["status_code"], record["body"], expires_at)
+            self._replay(record["fingerprint"], record["status_code"], record["body"])
+            return
+
+        # Still in progress: take over only if the first attempt has stopped renewing its claim
+        taken = await collection.find_one_and_update(
+            {"_id": self.record_id, "status": "in_progress", "locked_until": {"$lt": now}},
+            {"$set": {"claim_id": self.claim_id, "locked_until": now + CLAIM_TIMEOUT}}
+        )
+        if taken is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is already in progress"
+            )
+        self.claimed = True
+
+    async def renew(self) -> None:
+        """Extend this attempt's claim every CLAIM_RENEW_SECONDS; runs until cancelled."""
+        collection = get_database()["idempotency_keys"]
+        while True:
+            await asyncio.sleep(CLAIM_RENEW_SECONDS)
+            try:
+                await collection.update_one(
+                    {"_id": self.record_id, "status": "in_progress", "claim_id": self.claim_id},
+                    {"$set": {"locked_until": datetime.now(timezone.utc) + CLAIM_TIMEOUT}}
+                )
+            except Exception as e:
+                print(f"⚠ Could not renew idempotency claim: {e}")
+
+    async def save(self, response: Any, status_code: int = status.HTTP_200_OK) -> Any:
+        """Store the response for replays and return it unchanged."""
+        if not self.claimed:
+            return response
+
+        body = jsonable_encoder(response)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.idempotency_ttl_seconds)
+        await get_database()["idempotency_keys"].update_one(
+            {"_id": self.record_id, "claim_id": self.claim_id},
+            {
+                "$set": {"status": "completed", "status_code": status_code, "body": body, "expires_at": expires_at},
+                "$unset": {"locked_until": ""}
+            }
+        )
+        _cache_put(self.record_id, self.fingerprint, status_code, body, expires_at)
+        self.claimed = False
+        return response
+
+    async def release(self) -> None:
+        """Drop an unfinished claim so the request can be retried with the same key."""
+        if self.claimed:
+            await get_database()["idempotency_keys"].delete_one(
+                {"_id": self.record_id, "status": "in_progress", "claim_id": self.claim_id}
+            )
+            self.claimed = False
+
+    def replay_response(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=self.status_code,
+            content=self.body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+
+@asynccontextmanager
+async def idempotent(key: Optional[str], scope: str, payload: Any = None):
+    """
+    Run a request body at most once per (scope, key).
+
+    Args:
+        key: The Idempotency-Key header value; None disables idempotency
+        scope: Distinguishes endpoints and users, e.g. "<user id>:onboarding"
+        payload: The request data a retry must match
+    """
+    request = IdempotentRequest(key, scope, payload)
+    await request.claim()
+    renewal = asyncio.create_task(request.renew()) if request.claimed else None
+    try:
+        yield request
+    except BaseException:
+        await request.release()
+        raise
+    finally:
+        if renewal is not None:
+            renewal.cancel()
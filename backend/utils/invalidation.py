@@ -0,0 +1,206 @@
+"""
+Cross-worker cache invalidation.
+
+Per-worker caches register a handler for a key prefix ("catalog",
+"user:<id>", "email:<address>"), and write paths publish the keys they make
+stale. Publishing runs the local handlers at once, then bumps each key's
+version in the `cache_versions` collection. Every worker follows that
+collection and runs its handlers for keys changed elsewhere:
+
+- with a MongoDB change stream when the deployment supports one (replica
+  sets, including Atlas)
+- otherwise by polling for versions updated since the last poll, every
+  INVALIDATION_POLL_SECONDS
+
+Each worker records how long invalidations took to reach it (metrics()).
+The seed script publishes too, so running it against a live deployment
+reloads every worker's catalog.
+"""
+
+import asyncio
+import inspect
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Union
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from config import settings
+from database import get_database
+from utils.background import worker_id
+
+
+VERSIONS = "cache_versions"
+# Polls re-read this far back, so versions committed just after a poll aren't missed
+POLL_OVERLAP = timedelta(seconds=2)
+# "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+Handler = Callable[[str], Union[None, Awaitable[None]]]
+_handlers: dict[str, list[Handler]] = {}
+
+
+def on(prefix: str, handler: Handler) -> None:
+    """Call `handler(key)` whenever a key "<prefix>" or "<prefix>:..." is invalidated."""
+    _handlers.setdefault(prefix, []).append(handler)
+
+
+def _prefix(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def _published(key: str) -> bool:
+    # User documents are only cached when USER_CACHE_SECONDS is set; skip the write otherwise
+    return _prefix(key) != "user" or settings.user_cache_seconds > 0
+
+
+class InvalidationMetrics:
+    """Propagation delay of the invalidations this worker received from others."""
+
+    def __init__(self, window: int = 1000):
+        self.delays_ms: deque[float] = deque(maxlen=window)
+        self.published = 0
+        self.received = 0
+        self.mode = "off"
+
+    def record(self, changed_at: datetime) -> None:
+        delay = (datetime.now(timezone.utc) - changed_at.replace(tzinfo=timezone.utc)).total_seconds() * 1000
+        self.delays_ms.append(max(delay, 0.0))
+        self.received += 1
+
+    def snapshot(self) -> dict:
+        delays = sorted(self.delays_ms)
+
+        def percentile(fraction: float) -> Optional[float]:
+            return round(delays[min(int(len(delays) * fraction), len(delays) - 1)], 1) if delays else None
+
+        return {
+            "worker": worker_id(),
+            "mode": self.mode,
+            "published": self.published,
+            "received": self.received,
+            "delay_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)}
+        }
+
+
+_metrics = InvalidationMetrics()
+
+
+def metrics() -> dict:
+    return _metrics.snapshot()
+
+
+async def invalidate_local(key: str) -> None:
+    """Run this worker's handlers for `key`."""
+    for handler in _handlers.get(_prefix(key), ()):
+        try:
+            result = handler(key)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"⚠ Cache invalidation handler failed for {key}: {e}")
+
+
+async def publish(*keys: str, local: bool = True) -> None:
+    """
+    Invalidate `keys` in this worker now and in every other worker shortly.
+
+    Args:
+        keys: Cache keys, e.g. "catalog" or "user:<id>"
+        local: Also run this process's handlers (off for scripts that serve nothing)
+    """
+    keys = [key for key in keys if _published(key)]
+    if not keys:
+        return
+    if local:
+        for key in keys:
+            await invalidate_local(key)
+    try:
+        await get_database()[VERSIONS].bulk_write([
+            UpdateOne(
+                {"_id": key},
+                [{"$set": {
+                    "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+                    "updated_at": "$$NOW",
+                    "origin": worker_id()
+                }}],
+                upsert=True
+            )
+            for key in keys
+        ], ordered=False)
+        _metrics.published += len(keys)
+    except Exception as e:
+        # Other workers catch up when their cache entries expire
+        print(f"⚠ Failed to publish cache invalidation for {keys}: {e}")
+
+
+async def _apply(change: dict, versions: dict[str, int]) -> None:
+    key = change["_id"]
+    if change.get("version", 0) <= versions.get(key, 0):
+        return
+    versions[key] = change.get("version", 0)
+    if change.get("origin") == worker_id():
+        return
+    _metrics.record(change["updated_at"])
+    await invalidate_local(key)
+
+
+async def _watch(collection, versions: dict[str, int]) -> None:
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    async with collection.watch(pipeline, full_document="updateLookup") as stream:
+        _metrics.mode = "change_stream"
+        print("✓ Following cache invalidations with a change stream")
+        async for change in stream:
+            if change.get("fullDocument"):
+                await _apply(change["fullDocument"], versions)
+
+
+async def _poll(collection, versions: dict[str, int], since: datetime) -> None:
+    _metrics.mode = "poll"
+    print(f"✓ Polling cache invalidations every {settings.invalidation_poll_seconds:g}s")
+    while True:
+        await asyncio.sleep(settings.invalidation_poll_seconds)
+        async for change in collection.find({"updated_at": {"$gte": since - POLL_OVERLAP}}):
+            since = max(since, change["updated_at"].replace(tzinfo=timezone.utc))
+            await _apply(change, versions)
+
+
+async def follow_invalidations() -> None:
+    """Apply other workers' invalidations until cancelled."""
+    collection = get_database()[VERSIONS]
+    versions = {}
+    since = datetime.now(timezone.utc)
+    async for change in collection.find({}, {"version": 1, "updated_at": 1}):
+        versions[change["_id"]] = change.get("version", 0)
+
+    while settings.invalidation_mode in ("auto", "change_stream"):
+        try:
+            await _watch(collection, versions)
+        except OperationFailure as e:
+            if e.code == CHANGE_STREAMS_UNSUPPORTED and settings.invalidation_mode == "auto":
+                print("⚠ Change streams need a replica set, falling back to polling")
+                break
+            print(f"⚠ Cache invalidation change stream failed, reopening: {e}")
+            await asyncio.sleep(1)
+        except Exception as e:
+            # Invalidations published while reconnecting are missed; cache TTLs bound the staleness
+            print(f"⚠ Cache invalidation change stream failed, reopening: {e}")
+            await asyncio.sleep(1)
+    await _poll(collection, versions, since)
+
+
+_follower: Optional[asyncio.Task] = None
+
+
+def start_invalidation_listener() -> None:
+    global _follower
+
+    if settings.invalidation_mode != "off":
+        _follower = asyncio.create_task(follow_invalidations(), name="invalidation")
+
+
+async def stop_invalidation_listener() -> None:
+    if _follower is not None:
+        _follower.cancel()
+        await asyncio.gather(_follower, return_exceptions=True)
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
 from config import settings
 
 
@@ -15,6 +14,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
+    from jose import jwt
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -47,6 +48,8 @@ def decode_access_token(token: str) -> dict:
     Raises:
         JWTError: If token is invalid or expired
     """
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(
             token,
@@ -0,0 +1,42 @@
+"""
+Per-worker cache of emails known to belong to an account.
+
+Signup consults it before hashing the password: a repeat signup for a
+registered email (a double-submitted form, or someone probing for accounts)
+is then rejected after one indexed lookup instead of an Argon2 hash and a
+failed insert. The cache only ever lets signup skip work; the unique email
+index remains the source of truth.
+"""
+
+from collections import OrderedDict
+
+from models.user import normalize_email
+from utils import invalidation
+
+
+MAX_KNOWN_EMAILS = 50_000
+
+_known: OrderedDict[str, None] = OrderedDict()
+
+
+def remember(email: str) -> None:
+    """Record that `email` is registered."""
+    key = normalize_email(email)
+    _known[key] = None
+    _known.move_to_end(key)
+    if len(_known) > MAX_KNOWN_EMAILS:
+        _known.popitem(last=False)
+
+
+def forget(email: str) -> None:
+    """Drop `email`, e.g. after the account changes its address."""
+    _known.pop(normalize_email(email), None)
+
+
+def is_known(email: str) -> bool:
+    """True if `email` was registered when last seen by this worker."""
+    return normalize_email(email) in _known
+
+
+# Another worker changed or deleted the account using this address
+invalidation.on("email", lambda key: forget(key.split(":", 1)[1]))
@@ -0,0 +1,147 @@
+"""
+Progress calculations shared by the progress and journey routers.
+
+Each user document keeps `stage_completed_counts` (stage id -> number of
+completed catalog milestones), updated in the same atomic write as
+`completed_milestones`. Totals come from the catalog, so a progress summary
+needs no per-milestone work. Documents written before the counters existed
+have no such field; they are backfilled on first write and by
+repair_stage_counters.
+"""
+
+from bson import ObjectId
+
+from utils.catalog import FRONTEND_MILESTONES, frontend_milestone, get_catalog
+from utils.projections import shape_document
+
+
+async def get_milestone_ids_by_stage(db) -> dict[str, list[str]]:
+    """
+    Milestone ids grouped by stage id, from the in-memory catalog when loaded,
+    otherwise from the milestones collection (ids and stage ids only).
+    """
+    catalog = get_catalog()
+    if catalog is not None:
+        return catalog.milestone_ids_by_stage
+
+    milestone_ids_by_stage: dict[str, list[str]] = {}
+    async for milestone in db["milestones"].find({}, {"stage_id": 1}):
+        milestone_ids_by_stage.setdefault(milestone["stage_id"], []).append(str(milestone["_id"]))
+    return milestone_ids_by_stage
+
+
+async def resolve_milestones(db, milestone_ids: list[str]) -> dict[str, dict]:
+    """
+    The milestone (id, stage id and title) each of `milestone_ids` refers to,
+    keyed by the id as given. Ids may be milestone ids, slugs or frontend
+    ids (which resolve to themselves); ids that don't match a milestone are
+    left out.
+    """
+    catalog = get_catalog()
+    if catalog is not None:
+        resolved = {milestone_id: catalog.resolve_milestone(milestone_id) for milestone_id in milestone_ids}
+        return {milestone_id: milestone for milestone_id, milestone in resolved.items() if milestone is not None}
+
+    keys = {milestone_id: milestone_id.strip().lower() for milestone_id in milestone_ids}
+    object_ids = [ObjectId(key) for key in keys.values() if ObjectId.is_valid(key)]
+    cursor = db["milestones"].find(
+        {"$or": [{"_id": {"$in": object_ids}}, {"slug": {"$in": list(keys.values())}}]},
+        {"slug": 1, "title": 1, "stage_id": 1}
+    )
+    milestones_by_key = {key: frontend_milestone(key) for key in keys.values() if key in FRONTEND_MILESTONES}
+    async for milestone in cursor:
+        milestone = shape_document(milestone, ["stage_id", "slug", "title"])
+        milestones_by_key[milestone["id"]] = milestone
+        if milestone["slug"]:
+            milestones_by_key[milestone["slug"]] = milestone
+    return {milestone_id: milestones_by_key[key] for milestone_id, key in keys.items() if key in milestones_by_key}
+
+
+def stage_counts_expression(milestone_ids_by_stage: dict[str, list[str]], completed: str = "$completed_milestones") -> dict:
+    """
+    Aggregation expression computing stage_completed_counts from a user's
+    completed milestone list, for pipeline updates.
+    """
+    return {
+        stage_id: {"$size": {"$filter": {
+            "input": {"$ifNull": [completed, []]},
+            "cond": {"$in": ["$$this", milestone_ids]}
+        }}}
+        for stage_id, milestone_ids in milestone_ids_by_stage.items()
+    }
+
+
+async def backfill_stage_counters(db, user_id, milestone_ids_by_stage: dict[str, list[str]]) -> None:
+    """Initialise the counters of a user document that predates them, from its completed list."""
+    await db["users"].update_one(
+        {"_id": user_id, "stage_completed_counts": {"$exists": False}},
+        [{"$set": {"stage_completed_counts": stage_counts_expression(milestone_ids_by_stage)}}]
+    )
+
+
+async def repair_stage_counters(db, milestone_ids_by_stage: dict[str, list[str]]) -> int:
+    """
+    Recompute every user's counters from their completed list, rewriting only
+    documents whose counters are missing or have drifted. Returns the number
+    of documents repaired.
+
+    Counters are compared stage by stage, with an absent stage counting as 0:
+    the toggle's $inc adds stage keys in whatever order milestones are first
+    checked, so comparing the whole sub-document would flag nearly every user.
+    """
+    expected = stage_counts_expression(milestone_ids_by_stage)
+    drifted = [{"stage_completed_counts": None}]
+    if expected:
+        drifted.append({"$expr": {"$or": [
+            {"$ne": [{"$ifNull": [f"$stage_completed_counts.{stage_id}", 0]}, count]}
+            for stage_id, count in expected.items()
+        ]}})
+    result = await db["users"].update_many(
+        {"$or": drifted},
+        [{"$set": {"stage_completed_counts": expected}}]
+    )
+    return result.modified_count
+
+
+def calculate_stage_progress(
+    completed_milestone_ids: list[str],
+    milestone_ids_by_stage: dict[str, list[str]],
+    stage_counts: dict[str, int] | None = None
+) -> dict:
+    """
+    Completed count, total and percentage for each stage.
+
+    Uses the stored `stage_counts` when given, otherwise counts
+    `completed_milestone_ids` against the catalog.
+    """
+    if stage_counts is None:
+        completed = set(completed_milestone_ids)
+        stage_counts = {
+            stage_id: sum(1 for milestone_id in milestone_ids if milestone_id in completed)
+            for stage_id, milestone_ids in milestone_ids_by_stage.items()
+        }
+
+    stage_progress = {}
+    for stage_id, milestone_ids in milestone_ids_by_stage.items():
+        total = len(milestone_ids)
+        done = stage_counts.get(stage_id, 0)
+        stage_progress[stage_id] = {
+            "total_milestones": total,
+            "completed_milestones": done,
+            "percentage": round((done / total * 100) if total > 0 else 0, 1)
+        }
+    return stage_progress
+
+
+def calculate_progress(
+    completed_milestone_ids: list[str],
+    milestone_ids_by_stage: dict[str, list[str]],
+    stage_counts: dict[str, int] | None = None
+) -> dict:
+    """The GET /api/v1/progress response for a user's completed milestones."""
+    return {
+        "completed_milestone_ids": completed_milestone_ids,
+        "stage_progress": calculate_stage_progress(completed_milestone_ids, milestone_ids_by_stage, stage_counts),
+        "total_completed": len(completed_milestone_ids),
+        "total_milestones": sum(len(milestone_ids) for milestone_ids in milestone_ids_by_stage.values())
+    }
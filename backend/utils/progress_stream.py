@@ -0,0 +1,50 @@
+"""
+Progress change events for GET /api/v1/progress/stream.
+
+Every write to a user's progress publishes an event on the user's channel;
+the stream endpoint relays them as Server-Sent Events. Each event carries
+the new progress summary (as GET /progress), so a client can render it
+directly instead of refetching.
+"""
+
+import json
+from typing import AsyncIterator
+
+from config import settings
+from utils.pubsub import Subscription, get_pubsub
+
+
+# Client reconnect delay sent to EventSource
+RETRY_MS = 3000
+
+
+def progress_channel(user_id) -> str:
+    return f"progress:{user_id}"
+
+
+async def publish_progress_event(user_id, event: dict) -> None:
+    """Notify the user's open progress streams, in this and other workers."""
+    await get_pubsub().publish(progress_channel(user_id), event)
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def progress_events(subscription: Subscription, progress: dict) -> AsyncIterator[str]:
+    """The SSE body: the current progress, then each change, with heartbeats while idle."""
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        yield format_event("progress", {"type": "snapshot", "progress": progress})
+        while True:
+            event = await subscription.get(timeout=settings.progress_stream_heartbeat_seconds)
+            if event is None:
+                # Keeps proxies from closing an idle connection and surfaces dead clients
+                yield ": heartbeat\n\n"
+                continue
+            if event.get("type") == "account_deleted":
+                yield format_event("account_deleted", {})
+                return
+            yield format_event("progress", event)
+    finally:
+        get_pubsub().unsubscribe(subscription)
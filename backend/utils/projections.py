@@ -0,0 +1,35 @@
+"""
+Aggregation stages that shape catalog documents into API responses on the server.
+
+Read endpoints append these to their pipelines so MongoDB returns documents
+already in response form: `_id` renamed to a string `id` and only the fields
+the API exposes. Documents can then be returned without per-document
+model validation or reshaping in Python.
+"""
+
+
+def response_projection(fields: list[str], optional: tuple[str, ...] = ()) -> dict:
+    """
+    Build a `$project` stage emitting a string `id` plus `fields`.
+
+    Fields listed in `optional` are always emitted, as null when the document
+    does not have them, matching the model's `None` default.
+    """
+    projection = {"_id": 0, "id": {"$toString": "$_id"}}
+    for field in fields:
+        projection[field] = {"$ifNull": [f"${field}", None]} if field in optional else 1
+    return {"$project": projection}
+
+
+STAGE_FIELDS = ["title", "description", "age_range", "color", "icon", "order", "next_step_prompt"]
+STAGE_OPTIONAL_FIELDS = ("next_step_prompt",)
+STAGE_RESPONSE = response_projection(STAGE_FIELDS, optional=STAGE_OPTIONAL_FIELDS)
+
+MILESTONE_FIELDS = ["stage_id", "slug", "title", "behavior", "why_it_matters", "if_not_yet", "reassurance"]
+MILESTONE_OPTIONAL_FIELDS = ("slug",)
+MILESTONE_RESPONSE = response_projection(MILESTONE_FIELDS, optional=MILESTONE_OPTIONAL_FIELDS)
+
+
+def shape_document(document: dict, fields: list[str]) -> dict:
+    """Apply the same shaping as response_projection to a document in Python."""
+    return {"id": str(document["_id"]), **{field: document.get(field) for field in fields}}
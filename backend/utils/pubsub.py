@@ -0,0 +1,171 @@
+"""
+In-process publish/subscribe with a pluggable cross-worker backend.
+
+Subscribers get a bounded queue per subscription; publish delivers to the
+local subscribers of a channel directly and hands the message to the backend
+for the other workers:
+
+- memory: nothing leaves the process (a single worker, or development)
+- mongo: messages go through the capped `pubsub_events` collection, which
+  every worker follows with a tailable cursor
+
+Publishing never fails the request that publishes: backend errors are
+logged and local subscribers still get the message.
+"""
+
+import asyncio
+import weakref
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+from config import settings
+from database import get_database
+from utils.background import worker_id
+
+
+EVENTS = "pubsub_events"
+
+
+class Subscription:
+    """One subscriber's queue on a channel. When it is full the oldest message is dropped."""
+
+    def __init__(self, channel: str, max_pending: int):
+        self.channel = channel
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+
+    def deliver(self, message: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """The next message, or None if none arrives within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoryBackend:
+    """Keeps messages in this process."""
+
+    async def start(self, deliver: Callable[[str, dict], None]) -> None:
+        pass
+
+    async def publish(self, channel: str, message: dict) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class MongoBackend:
+    """Shares messages between workers through a capped collection."""
+
+    def __init__(self):
+        self.origin = worker_id()
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Callable[[str, dict], None]) -> None:
+        db = get_database()
+        try:
+            await db.create_collection(EVENTS, capped=True, size=settings.pubsub_capped_bytes)
+        except CollectionInvalid:
+            pass
+        # A tailable cursor on an empty capped collection dies immediately
+        latest = await db[EVENTS].find_one({}, sort=[("$natural", -1)])
+        if latest is None:
+            await self.publish("", {})
+            latest = await db[EVENTS].find_one({}, sort=[("$natural", -1)])
+        self.task = asyncio.create_task(self._follow(latest["_id"], deliver), name="pubsub")
+
+    async def _follow(self, last_id, deliver: Callable[[str, dict], None]) -> None:
+        collection = get_database()[EVENTS]
+        while True:
+            try:
+                cursor = collection.find({"_id": {"$gt": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                async for event in cursor:
+                    last_id = event["_id"]
+                    if event["origin"] != self.origin and event["channel"]:
+                        deliver(event["channel"], event["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠ Pub/sub cursor failed, reopening: {e}")
+            await asyncio.sleep(1)
+
+    async def publish(self, channel: str, message: dict) -> None:
+        await get_database()[EVENTS].insert_one({
+            "channel": channel,
+            "message": message,
+            "origin": self.origin,
+            "published_at": datetime.now(timezone.utc)
+        })
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+
+class PubSub:
+    """Channel fan-out to this worker's subscribers, and to other workers through the backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        # Subscriptions are dropped once their consumer goes away, even if it never unsubscribed
+        self.channels: dict[str, weakref.WeakSet] = {}
+
+    def subscribe(self, channel: str, max_pending: int = 100) -> Subscription:
+        subscription = Subscription(channel, max_pending)
+        self.channels.setdefault(channel, weakref.WeakSet()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self.channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.channels[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self.channels.get(channel, ()))
+
+    def deliver(self, channel: str, message: dict) -> None:
+        """Hand a message to this worker's subscribers of the channel."""
+        for subscription in list(self.channels.get(channel, ())):
+            subscription.deliver(message)
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self.deliver(channel, message)
+        try:
+            await self.backend.publish(channel, message)
+        except Exception as e:
+            print(f"⚠ Failed to publish to other workers on {channel}: {e}")
+
+
+_pubsub: Optional[PubSub] = None
+
+
+def get_pubsub() -> PubSub:
+    """The worker's pub/sub, built from settings on first use."""
+    global _pubsub
+
+    if _pubsub is None:
+        _pubsub = PubSub(MongoBackend() if settings.pubsub_backend == "mongo" else MemoryBackend())
+    return _pubsub
+
+
+async def start_pubsub() -> None:
+    pubsub = get_pubsub()
+    try:
+        await pubsub.backend.start(pubsub.deliver)
+    except Exception as e:
+        print(f"⚠ Pub/sub backend unavailable, delivering within this worker only: {e}")
+
+
+async def stop_pubsub() -> None:
+    await get_pubsub().backend.stop()
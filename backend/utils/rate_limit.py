@@ -0,0 +1,186 @@
+"""
+Token-bucket rate limiting for the authentication endpoints.
+
+Login and signup each run an Argon2 hash or verify, so they are checked
+against per-client-IP and per-email buckets before any password work.
+Limits are configured per route and key in RATE_LIMITS, e.g.
+"login.ip=20/minute,login.email=5/minute".
+
+Buckets live in process memory by default. With several workers (server.py)
+each worker would otherwise hand out its own allowance, so
+RATE_LIMIT_BACKEND=mongo keeps the buckets in a shared MongoDB collection.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+
+from config import settings
+from database import get_database
+
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit:
+    """A bucket of `capacity` tokens refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.refill_rate = capacity / period  # tokens per second
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "<count>/<second|minute|hour|day>", e.g. "5/minute"."""
+        count, _, period = value.strip().partition("/")
+        if period not in PERIODS:
+            raise ValueError(f"Unknown rate limit period in {value!r}")
+        return cls(int(count), PERIODS[period])
+
+    def __repr__(self) -> str:
+        return f"RateLimit({self.capacity}/{self.period:g}s)"
+
+
+class MemoryBackend:
+    """Per-process buckets, bounded to the `max_keys` most recently used keys."""
+
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # key -> (tokens, updated)
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take one token. Returns 0 if allowed, otherwise seconds until a token is available."""
+        now = self.clock()
+        tokens, updated = self.buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_rate
+
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+
+class MongoBackend:
+    """
+    Buckets shared by all workers in the `rate_limits` collection.
+
+    Each check is one atomic pipeline update, so concurrent workers can't
+    both spend the last token. Idle buckets expire through a TTL index.
+    """
+
+    def __init__(self):
+        self.index_ready = False
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        collection = get_database()["rate_limits"]
+        if not self.index_ready:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+            self.index_ready = True
+
+        now = datetime.now(timezone.utc)
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [
+            limit.capacity,
+            {"$add": [{"$ifNull": ["$tokens", limit.capacity]}, {"$multiply": [elapsed, limit.refill_rate]}]}
+        ]}
+        bucket = await collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": now + timedelta(seconds=limit.period)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / limit.refill_rate
+
+
+class RateLimiter:
+    """Checks requests against the configured limits for a route."""
+
+    def __init__(self, backend, limits: dict[str, RateLimit]):
+        self.backend = backend
+        self.limits = limits  # "<route>.<key type>" -> RateLimit
+
+    async def check(self, route: str, keys: dict[str, str]) -> None:
+        """
+        Take a token from every configured bucket for `route`.
+
+        Args:
+            route: Route name, e.g. "login"
+            keys: Key type -> key value, e.g. {"ip": "203.0.113.7", "email": "a@b.com"}
+
+        Raises:
+            HTTPException: 429 with Retry-After if any bucket is empty
+        """
+        retry_after = 0.0
+        for key_type, value in keys.items():
+            limit = self.limits.get(f"{route}.{key_type}")
+            if limit is None or not value:
+                continue
+            try:
+                wait = await self.backend.take(f"{route}:{key_type}:{value}", limit)
+            except Exception as e:
+                # A shared backend outage shouldn't lock everyone out of their accounts
+                print(f"⚠ Rate limit check failed, allowing request: {e}")
+                continue
+            retry_after = max(retry_after, wait)
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(int(retry_after) + 1)}
+            )
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client address, taken from X-Forwarded-For when behind
+    RATE_LIMIT_TRUSTED_PROXIES proxies (each appends the address it saw).
+    """
+    hops = settings.rate_limit_trusted_proxies
+    if hops > 0:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else ""
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Build the limiter from settings on first use."""
+    global _limiter
+
+    if _limiter is None:
+        backend = MongoBackend() if settings.rate_limit_backend == "mongo" else MemoryBackend()
+        limits = {name: RateLimit.parse(value) for name, value in settings.rate_limits_map.items()}
+        _limiter = RateLimiter(backend, limits)
+    return _limiter
+
+
+async def check_auth_rate_limit(route: str, request: Request, email: str) -> None:
+    """Rate limit an authentication attempt by client IP and email. Call before hashing."""
+    if not settings.rate_limit_enabled:
+        return
+    await get_rate_limiter().check(route, {"ip": client_ip(request), "email": email})
@@ -0,0 +1,34 @@
+"""
+Reconcile users' stored per-stage progress counters with their completed milestones.
+
+The counters are kept in step with every progress write, but can drift if
+documents are edited by hand or written by an older deployment. This
+recomputes them server-side and only rewrites documents that differ:
+
+    python3 -m utils.repair_progress
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from backend modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import connect_to_mongodb, close_mongodb_connection, get_database
+from utils.progress import get_milestone_ids_by_stage, repair_stage_counters
+
+
+async def main() -> None:
+    await connect_to_mongodb()
+    try:
+        db = get_database()
+        milestone_ids_by_stage = await get_milestone_ids_by_stage(db)
+        repaired = await repair_stage_counters(db, milestone_ids_by_stage)
+        print(f"✓ Repaired stage progress counters for {repaired} users")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
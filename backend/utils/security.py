@@ -1,7 +1,17 @@
-from passlib.context import CryptContext
+from functools import lru_cache
 
-# Configure password hashing context with Argon2
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    Get the password hashing context configured with Argon2.
+    
+    passlib and argon2 are imported on first use rather than at startup;
+    warm_up() loads them in the background once the server is running.
+    """
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["argon2"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
@@ -14,7 +24,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,4 +38,4 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return get_pwd_context().verify(plain_password, hashed_password)
\ No newline at end of file
@@ -4,9 +4,15 @@ Based on PRD Section 5.3 - Real, production-quality content.
 """
 
 import asyncio
+import hashlib
+import json
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
+from bson import ObjectId
+from pymongo import DeleteMany, ReplaceOne, ReturnDocument
+
 # Add parent directory to path so we can import from backend modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -14,6 +20,9 @@ from database import connect_to_mongodb, get_database
 from models.stage import Stage
 from models.milestone import Milestone
 from models.resource import Resource
+from utils import invalidation
+from utils.catalog import CATALOG_META_ID, FRONTEND_MILESTONES
+from utils.progress import repair_stage_counters
 
 
 # Stage data - 5 journey stages with next_step_prompt
@@ -71,6 +80,7 @@ MILESTONES_DATA = [
     # Stage 1: Early Signs (S1)
     {
         "stage_id": "S1",
+        "slug": "s1-responds-to-name",
         "title": "My child responds to their name sometimes",
         "behavior": "You've noticed your child occasionally turns or looks when you call their name.",
         "why_it_matters": "Name response is one way children show they're tuned into the world around them. Noticing patterns in when they respond helps you understand what gets their attention.",
@@ -79,6 +89,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S1",
+        "slug": "s1-questions-for-pediatrician",
         "title": "I've written down questions for our pediatrician",
         "behavior": "You've made a list of specific behaviors or concerns to discuss at your next doctor's visit.",
         "why_it_matters": "Writing things down helps you remember what you want to ask and shows your doctor you're observing carefully. It's the first step toward getting answers.",
@@ -87,6 +98,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S1",
+        "slug": "s1-simple-notes",
         "title": "I'm keeping simple notes about what I notice",
         "behavior": "You're tracking patterns in your child's behavior without obsessing over every detail.",
         "why_it_matters": "Your observations from home are valuable. Simple notes help doctors and specialists understand your child's day-to-day experiences.",
@@ -95,6 +107,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S1",
+        "slug": "s1-milestone-checklists",
         "title": "I've looked at developmental milestone checklists",
         "behavior": "You've reviewed age-appropriate milestones to understand what's typical for your child's age.",
         "why_it_matters": "Understanding milestones gives you context, not a scorecard. It helps you see patterns and have informed conversations with your doctor.",
@@ -103,6 +116,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S1",
+        "slug": "s1-trusted-resource",
         "title": "I've found one trusted resource that feels helpful",
         "behavior": "You've identified one reliable source of information that doesn't overwhelm you.",
         "why_it_matters": "Having one good resource reduces anxiety and gives you a place to turn when you have questions. Quality over quantity.",
@@ -111,6 +125,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S1",
+        "slug": "s1-self-care",
         "title": "I'm taking care of myself during this uncertain time",
         "behavior": "You're finding small ways to manage your own stress and emotions.",
         "why_it_matters": "Your wellbeing matters. When you're calmer, you can be more present for your child and make clearer decisions.",
@@ -121,6 +136,7 @@ MILESTONES_DATA = [
     # Stage 2: Diagnosis (S2)
     {
         "stage_id": "S2",
+        "slug": "s2-evaluation-scheduled",
         "title": "I've scheduled a developmental evaluation",
         "behavior": "You've made an appointment with a specialist or early intervention program.",
         "why_it_matters": "Getting on the waitlist is progress, even if the appointment is months away. Early evaluations lead to earlier support.",
@@ -129,6 +145,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S2",
+        "slug": "s2-evaluation-process",
         "title": "I understand what happens during evaluations",
         "behavior": "You've learned what to expect so you can prepare yourself and your child.",
         "why_it_matters": "Knowing what's coming reduces anxiety and helps you feel more in control. Most evaluations are play-based and gentle.",
@@ -137,6 +154,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S2",
+        "slug": "s2-appointment-notes",
         "title": "I've gathered notes and videos for the appointment",
         "behavior": "You've prepared examples of behaviors to share with the evaluation team.",
         "why_it_matters": "Your observations from home help evaluators see the full picture. Videos and notes make evaluations more accurate.",
@@ -145,6 +163,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S2",
+        "slug": "s2-evaluation-results",
         "title": "I've received evaluation results",
         "behavior": "You've gotten feedback from the evaluation and are processing what it means.",
         "why_it_matters": "A diagnosis is a roadmap, not a limitation. It opens doors to services and helps you understand your child better.",
@@ -153,6 +172,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S2",
+        "slug": "s2-questions-answered",
         "title": "I've asked questions until I understand",
         "behavior": "You've made sure you understand the diagnosis and what it means for your family.",
         "why_it_matters": "Medical jargon can be confusing. Asking questions ensures you fully understand so you can make informed decisions.",
@@ -161,6 +181,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S2",
+        "slug": "s2-parent-connection",
         "title": "I've connected with another parent who's been through this",
         "behavior": "You've found at least one parent who can offer perspective and support.",
         "why_it_matters": "Other parents understand what you're going through in ways others may not. Their experiences can light the way forward.",
@@ -171,6 +192,7 @@ MILESTONES_DATA = [
     # Stage 3: Early Intervention (S3)
     {
         "stage_id": "S3",
+        "slug": "s3-enrolled-in-ei",
         "title": "I've enrolled in early intervention services",
         "behavior": "You've contacted your state's program or school district to start services.",
         "why_it_matters": "Early intervention services are often free or low-cost and provide therapies tailored to your child's needs. Starting now makes a difference.",
@@ -179,6 +201,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S3",
+        "slug": "s3-therapy-needs",
         "title": "I understand which therapies my child needs",
         "behavior": "You've learned about different therapy types and what each one addresses.",
         "why_it_matters": "Understanding options helps you make informed decisions. Not every child needs every therapy—focus on your child's specific needs.",
@@ -187,6 +210,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S3",
+        "slug": "s3-support-team",
         "title": "I've identified key people on our support team",
         "behavior": "You know who your child's main therapists and doctors are and how to reach them.",
         "why_it_matters": "A support team makes the journey less overwhelming. Having trusted people to lean on reduces your stress.",
@@ -195,6 +219,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S3",
+        "slug": "s3-insurance-coverage",
         "title": "I understand what my insurance covers",
         "behavior": "You've contacted your insurance to learn about therapy coverage and costs.",
         "why_it_matters": "Understanding coverage reduces financial stress and ensures your child gets consistent services.",
@@ -203,6 +228,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S3",
+        "slug": "s3-daily-routines",
         "title": "We have consistent daily routines",
         "behavior": "You've built predictable routines that help your child feel secure.",
         "why_it_matters": "Consistent routines reduce anxiety and create natural opportunities to practice skills. Small, consistent changes amplify therapy progress.",
@@ -211,6 +237,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S3",
+        "slug": "s3-small-wins",
         "title": "I'm celebrating small wins",
         "behavior": "You're noticing and celebrating your child's progress, no matter how small.",
         "why_it_matters": "Progress isn't always linear. Celebrating small wins builds momentum and reminds you that your efforts are working.",
@@ -221,6 +248,7 @@ MILESTONES_DATA = [
     # Stage 4: School Readiness (S4)
     {
         "stage_id": "S4",
+        "slug": "s4-educational-rights",
         "title": "I understand my child has educational rights",
         "behavior": "You've learned about IDEA, IEPs, and that your child has legal rights to appropriate education.",
         "why_it_matters": "Federal law guarantees your child the right to free, appropriate education with necessary supports. Knowing this empowers you to advocate.",
@@ -229,6 +257,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S4",
+        "slug": "s4-iep-request",
         "title": "I've requested an IEP evaluation in writing",
         "behavior": "You've formally asked your school district to evaluate your child for special education services.",
         "why_it_matters": "Schools must respond to written requests within specific timeframes. Starting this process early ensures services are ready.",
@@ -237,6 +266,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S4",
+        "slug": "s4-iep-meeting-prep",
         "title": "I'm prepared for the IEP meeting",
         "behavior": "You've gathered information about your child's needs and know what accommodations to request.",
         "why_it_matters": "Preparation helps you advocate confidently. Coming with specific requests ensures your child's needs are clearly addressed.",
@@ -245,6 +275,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S4",
+        "slug": "s4-classroom-visits",
         "title": "I've visited potential classrooms",
         "behavior": "You've toured schools or classrooms to see what might be the best fit.",
         "why_it_matters": "Seeing classrooms helps you understand what supports are available and whether a school feels right for your child.",
@@ -253,6 +284,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S4",
+        "slug": "s4-teacher-introduction",
         "title": "I've introduced myself to my child's teacher",
         "behavior": "You've shared key information about your child's needs and established open communication.",
         "why_it_matters": "Teachers are your partners. A strong relationship ensures consistent support and quick problem-solving.",
@@ -261,6 +293,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S4",
+        "slug": "s4-school-transitions",
         "title": "We're preparing for school transitions",
         "behavior": "You're using visual supports, social stories, or practice visits to prepare your child.",
         "why_it_matters": "Preparing in advance reduces anxiety and helps your child adjust more smoothly to new environments.",
@@ -271,6 +304,7 @@ MILESTONES_DATA = [
     # Stage 5: Support Resources (S5)
     {
         "stage_id": "S5",
+        "slug": "s5-parent-community",
         "title": "I've found my parent community",
         "behavior": "You've connected with other parents of autistic children and feel less alone.",
         "why_it_matters": "Parent communities provide emotional support and practical advice. Shared experiences reduce isolation and build resilience.",
@@ -279,6 +313,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S5",
+        "slug": "s5-own-wellbeing",
         "title": "I'm making time for my own wellbeing",
         "behavior": "You're prioritizing your physical and mental health, recognizing you can't pour from an empty cup.",
         "why_it_matters": "Taking care of yourself isn't selfish—it's essential. Your wellbeing directly impacts your ability to support your child long-term.",
@@ -287,6 +322,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S5",
+        "slug": "s5-respite-care",
         "title": "I've arranged regular respite care",
         "behavior": "You've identified resources that give you regular breaks to recharge.",
         "why_it_matters": "Respite care prevents burnout and makes you more patient and present. It's not a luxury—it's necessary for sustainable caregiving.",
@@ -295,6 +331,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S5",
+        "slug": "s5-stay-informed",
         "title": "I stay informed without getting overwhelmed",
         "behavior": "You're keeping up with new resources and research without falling into information overload.",
         "why_it_matters": "Staying informed helps you make good decisions, but balance is key. You don't need to know everything.",
@@ -303,6 +340,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S5",
+        "slug": "s5-advocacy",
         "title": "I speak up for my child's needs",
         "behavior": "You're advocating in medical, educational, and community settings to ensure your child's needs are met.",
         "why_it_matters": "Your child needs an advocate, and you're the best person for the job. Your voice makes a real difference.",
@@ -311,6 +349,7 @@ MILESTONES_DATA = [
     },
     {
         "stage_id": "S5",
+        "slug": "s5-unique-strengths",
         "title": "I celebrate my child's unique strengths",
         "behavior": "You're embracing your child's strengths, interests, and unique way of experiencing the world.",
         "why_it_matters": "Your child is more than their diagnosis. Celebrating their strengths builds their confidence and reminds you why this journey matters.",
@@ -405,104 +444,224 @@ RESOURCES_DATA = [
 ]
 
 
-async def seed_stages():
-    """Seed the stages collection with initial data."""
-    db = get_database()
-    stages_collection = db["stages"]
-    
-    # Check if stages already exist
-    existing_count = await stages_collection.count_documents({})
-    if existing_count > 0:
-        print(f"⚠ Stages collection already has {existing_count} documents. Skipping seed.")
-        return
+# Fields that are bookkeeping rather than content, excluded from the content hash
+NON_CONTENT_FIELDS = {"_id", "created_at", "content_hash"}
+
+
+def stable_object_id(namespace: str, key: str) -> ObjectId:
+    """
+    Derive a deterministic ObjectId from a namespaced key (e.g. "milestone", "s1-self-care").
     
-    # Insert stages
-    stages = []
-    for stage_data in STAGES_DATA:
-        stage = Stage(**stage_data)
-        stages.append(stage.to_dict())
+    Reseeding always produces the same ids, so ids stored in
+    users.completed_milestones and journey history stay valid.
+    """
+    return ObjectId(hashlib.sha1(f"{namespace}:{key}".encode()).digest()[:12])
+
+
+def content_hash(document: dict) -> str:
+    """Hash a document's content fields in a key-order independent way."""
+    content = {key: value for key, value in document.items() if key not in NON_CONTENT_FIELDS}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def catalog_hash(collections: dict[str, list[dict]]) -> str:
+    """
+    Hash a whole catalog (collection name -> documents) from its documents' content hashes.
     
-    result = await stages_collection.insert_many(stages)
-    print(f"✓ Seeded {len(result.inserted_ids)} stages")
+    The same value is stored in catalog_meta by seed_all and embedded in the
+    catalog bundle, so a bundle can be checked against the database cheaply.
+    """
+    entries = sorted(
+        f"{name}:{document['_id']}:{content_hash(document)}"
+        for name, documents in collections.items()
+        for document in documents
+    )
+    return hashlib.sha256("\n".join(entries).encode()).hexdigest()
 
 
-async def seed_milestones():
-    """Seed the milestones collection with initial data."""
-    db = get_database()
-    milestones_collection = db["milestones"]
+def build_catalog() -> dict[str, list[dict]]:
+    """All catalog documents keyed by collection name."""
+    return {
+        "stages": build_stage_documents(),
+        "milestones": build_milestone_documents(),
+        "resources": build_resource_documents(),
+    }
+
+
+def build_stage_documents() -> list[dict]:
+    """Stage documents keyed by their "S<order>" identifier."""
+    return [
+        Stage(_id=stable_object_id("stage", f"S{stage_data['order']}"), **stage_data).to_dict()
+        for stage_data in STAGES_DATA
+    ]
+
+
+def build_milestone_documents() -> list[dict]:
+    """Milestone documents keyed by their slug."""
+    return [
+        Milestone(_id=stable_object_id("milestone", milestone_data["slug"]), **milestone_data).to_dict()
+        for milestone_data in MILESTONES_DATA
+    ]
+
+
+def build_resource_documents() -> list[dict]:
+    """Resource documents, which already carry stable string ids."""
+    return [Resource(**resource_data).to_dict() for resource_data in RESOURCES_DATA]
+
+
+async def sync_collection(collection, documents: list[dict]) -> int:
+    """
+    Bring a catalog collection in line with `documents` in one ordered bulk_write.
     
-    # Check if milestones already exist
-    existing_count = await milestones_collection.count_documents({})
-    if existing_count > 0:
-        print(f"⚠ Milestones collection already has {existing_count} documents. Skipping seed.")
-        return
+    Documents whose content hash matches the stored one are left untouched,
+    changed or new documents are upserted (keeping their original created_at),
+    and documents no longer in the catalog are deleted. The collection is never
+    emptied, so readers see either the old or the new version of each document.
     
-    # Insert milestones
-    milestones = []
-    for milestone_data in MILESTONES_DATA:
-        milestone = Milestone(**milestone_data)
-        milestones.append(milestone.to_dict())
+    Returns:
+        Number of documents written or deleted
+    """
+    existing = {
+        doc["_id"]: doc
+        async for doc in collection.find({}, {"content_hash": 1, "created_at": 1})
+    }
     
-    result = await milestones_collection.insert_many(milestones)
-    print(f"✓ Seeded {len(result.inserted_ids)} milestones")
-
-
-async def seed_resources():
-    """Seed the resources collection with initial data."""
-    db = get_database()
-    resources_collection = db["resources"]
+    operations = []
+    upserts = 0
+    for document in documents:
+        document = {**document, "content_hash": content_hash(document)}
+        stored = existing.get(document["_id"])
+        if stored and stored.get("content_hash") == document["content_hash"]:
+            continue
+        if stored and stored.get("created_at"):
+            document["created_at"] = stored["created_at"]
+        operations.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        upserts += 1
     
-    # Check if resources already exist
-    existing_count = await resources_collection.count_documents({})
-    if existing_count > 0:
-        print(f"⚠ Resources collection already has {existing_count} documents. Skipping seed.")
-        return
+    desired_ids = {document["_id"] for document in documents}
+    stale_ids = [document_id for document_id in existing if document_id not in desired_ids]
+    if stale_ids:
+        operations.append(DeleteMany({"_id": {"$in": stale_ids}}))
     
-    # Insert resources
-    resources = []
-    for resource_data in RESOURCES_DATA:
-        resource = Resource(**resource_data)
-        resources.append(resource.to_dict())
+    if operations:
+        await collection.bulk_write(operations, ordered=True)
     
-    result = await resources_collection.insert_many(resources)
-    print(f"✓ Seeded {len(result.inserted_ids)} resources")
+    print(f"✓ {collection.name}: {upserts} upserted, {len(stale_ids)} deleted, "
+          f"{len(documents) - upserts} unchanged")
+    return upserts + len(stale_ids)
 
 
-async def clear_collections():
-    """Clear all collections before re-seeding."""
-    db = get_database()
+async def find_legacy_milestone_ids(db, milestone_documents: list[dict]) -> dict[str, str]:
+    """
+    Map ids of milestones seeded before stable ids existed to their new ids.
     
-    # Clear stages
-    stages_result = await db["stages"].delete_many({})
-    print(f"✓ Cleared {stages_result.deleted_count} stages")
+    Legacy documents have random ObjectIds and no slug; they are matched to
+    the current catalog by stage and title.
+    """
+    new_ids = {(doc["stage_id"], doc["title"]): doc["_id"] for doc in milestone_documents}
+    legacy_ids = {}
+    async for doc in db["milestones"].find({"slug": {"$exists": False}}, {"stage_id": 1, "title": 1}):
+        new_id = new_ids.get((doc.get("stage_id"), doc.get("title")))
+        if new_id is not None and new_id != doc["_id"]:
+            legacy_ids[str(doc["_id"])] = str(new_id)
+    return legacy_ids
+
+
+async def find_noncanonical_milestone_ids(db, milestone_documents: list[dict]) -> dict[str, str]:
+    """
+    Map milestone ids stored in another form than the milestone's id to that id.
     
-    # Clear milestones
-    milestones_result = await db["milestones"].delete_many({})
-    print(f"✓ Cleared {milestones_result.deleted_count} milestones")
+    Before toggles were validated, any string was stored as sent, so progress
+    and history can hold slugs or ids in upper case. Frontend milestone ids
+    (utils/catalog.FRONTEND_MILESTONES) are canonical as they are.
+    """
+    ids = {str(doc["_id"]) for doc in milestone_documents}
+    ids_by_slug = {doc["slug"]: str(doc["_id"]) for doc in milestone_documents}
+    stored = set(await db["users"].distinct("completed_milestones"))
+    stored |= set(await db["journey_history"].distinct("milestone_id"))
     
-    # Clear resources
-    resources_result = await db["resources"].delete_many({})
-    print(f"✓ Cleared {resources_result.deleted_count} resources")
+    id_map = {}
+    for stored_id in stored:
+        if not isinstance(stored_id, str) or stored_id in ids or stored_id in FRONTEND_MILESTONES:
+            continue
+        key = stored_id.strip().lower()
+        new_id = ids_by_slug.get(key) or (key if key in ids else None)
+        if new_id is not None:
+            id_map[stored_id] = new_id
+    return id_map
+
+
+async def remap_milestone_references(db, id_map: dict[str, str]) -> None:
+    """Rewrite stored milestone ids in user progress and journey history."""
+    for old_id, new_id in id_map.items():
+        # Users who also have the new id just lose the old one, so it isn't listed twice
+        await db["users"].update_many(
+            {"completed_milestones": {"$all": [old_id, new_id]}},
+            {"$pull": {"completed_milestones": old_id}}
+        )
+        users_result = await db["users"].update_many(
+            {"completed_milestones": old_id},
+            {"$set": {"completed_milestones.$": new_id}}
+        )
+        history_result = await db["journey_history"].update_many(
+            {"milestone_id": old_id},
+            {"$set": {"milestone_id": new_id}}
+        )
+        print(f"✓ Remapped milestone {old_id} -> {new_id} "
+              f"({users_result.modified_count} users, {history_result.modified_count} history entries)")
+
+
+async def bump_catalog_version(db, new_hash: str) -> int:
+    """Atomically increment the catalog version, record its content hash and return the new version."""
+    meta = await db["catalog_meta"].find_one_and_update(
+        {"_id": CATALOG_META_ID},
+        {
+            "$inc": {"version": 1},
+            "$set": {"content_hash": new_hash, "updated_at": datetime.now(timezone.utc)}
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return meta["version"]
 
 
 async def seed_all():
-    """Seed all collections."""
-    print("Starting database seeding...")
+    """Sync all catalog collections with the seed data."""
+    print("Starting catalog sync...")
     
     await connect_to_mongodb()
+    db = get_database()
+    
+    catalog = build_catalog()
+    legacy_ids = await find_legacy_milestone_ids(db, catalog["milestones"])
+    legacy_ids.update(await find_noncanonical_milestone_ids(db, catalog["milestones"]))
+    
+    changes = 0
+    for name, documents in catalog.items():
+        changes += await sync_collection(db[name], documents)
     
-    # Clear existing data
-    print("\nClearing existing collections...")
-    await clear_collections()
+    if legacy_ids:
+        print(f"\nRemapping {len(legacy_ids)} legacy milestone ids...")
+        await remap_milestone_references(db, legacy_ids)
     
-    # Seed new data
-    print("\nSeeding new data...")
-    await seed_stages()
-    await seed_milestones()
-    await seed_resources()
+    # Milestones added to or removed from a stage change users' per-stage counts
+    if changes or legacy_ids:
+        milestone_ids_by_stage = {}
+        for milestone in catalog["milestones"]:
+            milestone_ids_by_stage.setdefault(milestone["stage_id"], []).append(str(milestone["_id"]))
+        repaired = await repair_stage_counters(db, milestone_ids_by_stage)
+        print(f"✓ Recounted stage progress for {repaired} users")
     
-    print("\n✓ Database seeding complete!")
+    new_hash = catalog_hash(catalog)
+    meta = await db["catalog_meta"].find_one({"_id": CATALOG_META_ID})
+    if changes or not meta or meta.get("content_hash") != new_hash:
+        version = await bump_catalog_version(db, new_hash)
+        # Running API workers reload their in-memory catalog
+        await invalidation.publish("catalog", local=False)
+        print(f"\n✓ Catalog sync complete - now at version {version}")
+    else:
+        print("\n✓ Catalog already up to date")
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_all())
\ No newline at end of file
+    asyncio.run(seed_all())
@@ -0,0 +1,53 @@
+"""
+Per-worker cache of authenticated users' documents (USER_CACHE_SECONDS).
+
+get_current_user serves repeat requests from it instead of reading the user
+document every time. Every write to a user document publishes "user:<id>"
+on the invalidation bus, which evicts the entry in all workers; the TTL
+bounds staleness if an invalidation is lost. Disabled by default.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+from models.user import User
+from utils import invalidation
+
+
+MAX_CACHED_USERS = 10_000
+
+# User id -> (expiry on the monotonic clock, user)
+_users: OrderedDict[str, tuple[float, User]] = OrderedDict()
+
+
+def user_key(user_id) -> str:
+    """Invalidation key for a user's document."""
+    return f"user:{user_id}"
+
+
+def get(user_id) -> Optional[User]:
+    cached = _users.get(str(user_id))
+    if cached is None:
+        return None
+    if cached[0] < time.monotonic():
+        del _users[str(user_id)]
+        return None
+    return cached[1]
+
+
+def put(user: User) -> None:
+    if settings.user_cache_seconds <= 0:
+        return
+    _users[str(user.id)] = (time.monotonic() + settings.user_cache_seconds, user)
+    _users.move_to_end(str(user.id))
+    if len(_users) > MAX_CACHED_USERS:
+        _users.popitem(last=False)
+
+
+def evict(key: str) -> None:
+    _users.pop(key.split(":", 1)[1], None)
+
+
+invalidation.on("user", evict)
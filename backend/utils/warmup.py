@@ -0,0 +1,16 @@
+"""
+Background warm-up of dependencies that are imported lazily to speed up cold starts.
+"""
+
+
+def warm_up() -> None:
+    """
+    Import and initialize the JWT and Argon2 backends.
+    
+    Runs in a worker thread after startup so the server can accept requests
+    first; the first login or authenticated request then finds them loaded.
+    """
+    from jose import jwt  # noqa: F401
+    from utils.security import get_pwd_context
+    
+    get_pwd_context().handler("argon2").get_backend()